@@ -0,0 +1,52 @@
+'''Benchmarks for raising events with different numbers of handlers.'''
+from harness import Benchmark
+
+from mvvm_py import Event, WeakEvent
+
+
+class Handler(object):
+    def handle(self, sender, args):
+        pass
+    #
+#
+
+
+def event_benchmark(event_type, handler_count, operations = 10000):
+    def setup():
+        event = event_type()
+        handlers = [Handler() for _ in range(handler_count)]
+        for handler in handlers:
+            event += handler.handle
+        # The handlers must stay alive for weak events:
+        return event, handlers
+    #
+    
+    def raise_event(state):
+        event = state[0]
+        for _ in range(operations):
+            event(None, None)
+    #
+    return Benchmark('{0}, {1} handler(s)'.format(event_type.__name__, handler_count), raise_event, operations, setup)
+#
+
+def subscription_benchmark(event_type, handler_count):
+    def setup():
+        return [Handler().handle for _ in range(handler_count)]
+    #
+    
+    def subscribe_and_unsubscribe(handlers):
+        event = event_type()
+        for handler in handlers:
+            event += handler
+        for handler in handlers:
+            event -= handler
+    #
+    return Benchmark('{0} subscribe and unsubscribe, {1} handler(s)'.format(event_type.__name__, handler_count), subscribe_and_unsubscribe, handler_count * 2, setup)
+#
+
+
+def get_benchmarks(quick = False):
+    benchmarks = [event_benchmark(event_type, count) for event_type in (Event, WeakEvent) for count in (0, 1, 10, 100)]
+    benchmarks += [subscription_benchmark(event_type, 1000) for event_type in (Event, WeakEvent)]
+    return benchmarks
+#
@@ -0,0 +1,97 @@
+'''Benchmarks for ObservableList mutations and lookups, at different list sizes.'''
+import random
+from harness import Benchmark
+
+from mvvm_py import ObservableList
+
+
+def list_benchmark(name, size, operation, operations = 1000, indexed = False):
+    def setup():
+        items = ObservableList(range(size), indexed = indexed)
+        items.CollectionChanged += lambda sender, args: None
+        return items
+    #
+    
+    def run(items):
+        for index in range(operations):
+            operation(items, index)
+    #
+    suffix = ', indexed' if indexed else ''
+    return Benchmark('ObservableList {0}, {1} items{2}'.format(name, size, suffix), run, operations, setup)
+#
+
+def append(items, index):
+    items.append(index)
+#
+
+def insert_front(items, index):
+    items.insert(0, index)
+#
+
+def pop_middle(items, index):
+    items.pop(len(items) // 2)
+#
+
+def replace(items, index):
+    items[index] = -index
+#
+
+def index_of_last(items, index):
+    items.index(len(items) - 1 - index)
+#
+
+def contains_last(items, index):
+    (len(items) - 1 - index) in items
+#
+
+
+def bulk_benchmark(name, size, operation):
+    def setup():
+        items = ObservableList(range(size))
+        items.CollectionChanged += lambda sender, args: None
+        return items
+    #
+    return Benchmark('ObservableList {0}, {1} items'.format(name, size), operation, size, setup)
+#
+
+def add_range(items):
+    items.add_range(range(len(items)))
+#
+
+def remove_all(items):
+    items.remove_all(lambda item: item % 2 == 0)
+#
+
+def reconcile_shuffled(items):
+    shuffled = list(items)
+    for _ in range(10):
+        index = random.randrange(len(shuffled))
+        shuffled.insert(random.randrange(len(shuffled)), shuffled.pop(index))
+    items.reconcile(shuffled)
+#
+
+def reconcile_reversed(items):
+    items.reconcile(list(reversed(items)))
+#
+
+
+def get_benchmarks(quick = False):
+    sizes = (10 ** 3, 10 ** 4, 10 ** 5) if quick else (10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6)
+    benchmarks = []
+    for size in sizes:
+        benchmarks += [
+            list_benchmark('append', size, append),
+            list_benchmark('insert at front', size, insert_front),
+            list_benchmark('pop from middle', size, pop_middle),
+            list_benchmark('replace', size, replace),
+            list_benchmark('index', size, index_of_last, operations = 100),
+            list_benchmark('index', size, index_of_last, indexed = True),
+            list_benchmark('in', size, contains_last, operations = 100),
+            list_benchmark('in', size, contains_last, indexed = True),
+            bulk_benchmark('add_range', size, add_range),
+            bulk_benchmark('remove_all', size, remove_all),
+            bulk_benchmark('reconcile 10 moves', size, reconcile_shuffled),
+            bulk_benchmark('reconcile reversed', size, reconcile_reversed),
+        ]
+    return benchmarks
+#
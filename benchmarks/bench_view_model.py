@@ -0,0 +1,78 @@
+'''Benchmarks for bindable property setters and ViewModelMetaClass class creation.'''
+from harness import Benchmark
+
+from mvvm_py import ViewModel, bindable_property, relay_command
+
+
+def create_chain_class(depth, cached = False):
+    '''Creates a view model with a chain of derived properties: p1 depends on p0, p2 depends on p1, and so on.
+Every derived property also depends on p0 directly, so the dependency graph contains many redundant paths.'''
+    dct = {'p0': bindable_property(default = 0)}
+    for index in range(1, depth + 1):
+        dependencies = ['p{0}'.format(index - 1)] if index == 1 else ['p{0}'.format(index - 1), 'p0']
+        dct['p{0}'.format(index)] = bindable_property(lambda self, index = index: index, None, depends_on = dependencies, cached = cached)
+    dct['command'] = relay_command(lambda self: None, lambda self: True, depends_on = 'p{0}'.format(depth))
+    return type(ViewModel)('Chain{0}'.format(depth), (ViewModel,), dct)
+#
+
+def create_wide_class(property_count):
+    '''Creates a view model with many independent properties, each with a few derived properties.'''
+    dct = {}
+    for index in range(property_count):
+        dct['value{0}'.format(index)] = bindable_property(default = index)
+        dct['double{0}'.format(index)] = bindable_property(lambda self: 0, None, depends_on = 'value{0}'.format(index))
+        dct['text{0}'.format(index)] = bindable_property(lambda self: '', None, depends_on = ['value{0}'.format(index), 'double{0}'.format(index)])
+    return type(ViewModel)('Wide{0}'.format(property_count), (ViewModel,), dct)
+#
+
+
+def setter_benchmark(depth, handlers, operations = 10000):
+    cls = create_chain_class(depth)
+    
+    def setup():
+        view_model = cls()
+        for _ in range(handlers):
+            view_model.PropertyChanged += lambda sender, args: None
+        return view_model
+    #
+    
+    def set_values(view_model):
+        for value in range(operations):
+            view_model.p0 = value
+    #
+    return Benchmark('setter, depends_on depth {0}, {1} handler(s)'.format(depth, handlers), set_values, operations, setup)
+#
+
+def getter_benchmark(cached, operations = 100000):
+    cls = create_chain_class(5, cached)
+    
+    def get_values(view_model):
+        for _ in range(operations):
+            view_model.p5
+    #
+    return Benchmark('computed getter, cached = {0}'.format(cached), get_values, operations, cls)
+#
+
+def class_creation_benchmark(property_count, number = 10):
+    return Benchmark('class creation, {0} properties'.format(property_count * 3), lambda: create_wide_class(property_count), number = number)
+#
+
+
+def subclass_creation_benchmark(property_count, number = 100):
+    base = create_wide_class(property_count)
+    
+    def create_subclasses():
+        type(ViewModel)('Empty', (base,), {'helper': lambda self: None})
+        type(ViewModel)('Extended', (base,), {'extra': bindable_property(lambda self: 0, None, depends_on = 'value0')})
+    #
+    return Benchmark('subclass creation, {0} base properties'.format(property_count * 3), create_subclasses, number = number)
+#
+
+
+def get_benchmarks(quick = False):
+    benchmarks = [setter_benchmark(depth, handlers) for depth in (0, 5, 20) for handlers in (0, 1)]
+    benchmarks += [getter_benchmark(False), getter_benchmark(True)]
+    benchmarks += [class_creation_benchmark(count) for count in ((10, 100) if quick else (10, 100, 300))]
+    benchmarks += [subclass_creation_benchmark(count) for count in (10, 100)]
+    return benchmarks
+#
@@ -0,0 +1,56 @@
+'''A small benchmark harness. Benchmarks are functions that take no arguments; each one is timed over a number of
+repetitions and the best time is reported, which is the least affected by other activity on the machine.'''
+import os
+import sys
+import timeit
+
+# The benchmarks use the package from the source tree, on the headless backend:
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+
+class Benchmark(object):
+    '''Times a function. operations is the number of operations that one call performs, so results can be
+reported per operation. setup, if given, is called before every repetition and its result is passed to function.'''
+    
+    def __init__(self, name, function, operations = 1, setup = None, number = 1):
+        super(Benchmark, self).__init__()
+        
+        self.name = name
+        self.function = function
+        self.operations = operations
+        self.setup = setup
+        self.number = number
+    #
+    
+    def run(self, repeat):
+        best = None
+        for _ in range(repeat):
+            if self.setup is not None:
+                state = self.setup()
+                function = lambda: self.function(state)
+            else:
+                function = self.function
+            duration = timeit.timeit(function, number = self.number) / self.number
+            best = duration if best is None else min(best, duration)
+        return best
+    #
+#
+
+
+def run_benchmarks(benchmarks, repeat = 5, name_filter = None, output = sys.stdout):
+    '''Runs the given benchmarks and prints the best time per call and per operation for each of them.'''
+    output.write('{0:<60} {1:>14} {2:>14}\n'.format('benchmark', 'per call', 'per operation'))
+    for benchmark in benchmarks:
+        if name_filter is not None and name_filter not in benchmark.name:
+            continue
+        duration = benchmark.run(repeat)
+        output.write('{0:<60} {1:>14} {2:>14}\n'.format(benchmark.name, format_duration(duration), format_duration(duration / benchmark.operations)))
+        output.flush()
+#
+
+def format_duration(seconds):
+    for unit, scale in (('s', 1.0), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return '{0:.3f} {1}'.format(seconds / scale, unit)
+    return '{0:.1f} ns'.format(seconds / 1e-9)
+#
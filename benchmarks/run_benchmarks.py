@@ -0,0 +1,27 @@
+'''Runs the benchmark suite on the headless backend. Usage:
+
+    python benchmarks/run_benchmarks.py [--quick] [--repeat N] [--filter TEXT]
+'''
+import argparse
+
+from harness import run_benchmarks
+import bench_event
+import bench_observable_list
+import bench_view_model
+
+
+def main():
+    parser = argparse.ArgumentParser(description = 'Runs the mvvm_py benchmarks.')
+    parser.add_argument('--quick', action = 'store_true', help = 'skip the largest sizes')
+    parser.add_argument('--repeat', type = int, default = 5, help = 'the number of times each benchmark is repeated')
+    parser.add_argument('--filter', help = 'only run benchmarks whose name contains this text')
+    args = parser.parse_args()
+    
+    benchmarks = []
+    for module in (bench_view_model, bench_event, bench_observable_list):
+        benchmarks += module.get_benchmarks(args.quick)
+    run_benchmarks(benchmarks, args.repeat, args.filter)
+#
+
+if __name__ == '__main__':
+    main()
@@ -7,6 +7,7 @@ clr.AddReferenceByPartialName("PresentationCore")
 clr.AddReferenceByPartialName("PresentationFramework")
 clr.AddReferenceByPartialName("WindowsBase")
 
+from System import Action
 from System.Windows import Application, Window
 
 
@@ -39,7 +40,7 @@ class Item(ViewModel):
         self.surname = '' if len(parts) < 2 else parts[1]
     full_name = bindable_property(_get_full_name, _set_full_name, depends_on = ['name', 'surname'])
     
-    description = bindable_property(lambda self: '{}, {} years old'.format(self.full_name, self.age), None, depends_on = ['full_name', 'age'])
+    description = bindable_property(lambda self: '{}, {} years old'.format(self.full_name, self.age), None, depends_on = ['full_name', 'age'], cached = True)
     
     wrapped_name = bindable_property(backing_field = 'wrapped_item.name')
     wrapped_cost = bindable_property(backing_field = 'wrapped_item.cost')
@@ -51,7 +52,7 @@ class MyWindowViewModel(ViewModel):
     def __init__(self):
         super(MyWindowViewModel, self).__init__()
 
-        self.items = ObservableList()
+        self.items = ObservableList(indexed = True)
         self.selected_item = None
         self.message = 'Hello'
     #
@@ -80,11 +81,13 @@ class MyWindowViewModel(ViewModel):
         if self.selected_item is not None:
             item_index = self.items.index(self.selected_item)
         
-        return '{0}! ({1})'.format(self.message, item_index)
+        item_name = self.selected_item.name if self.selected_item is not None else ''
+        return '{0}! ({1}: {2})'.format(self.message, item_index, item_name)
     #
     
-    message = bindable_property()
-    related_message = bindable_property(_get_related_message, depends_on = ['message', 'selected_item'])
+    # message is set on every keystroke, so its (and related_message's) notifications are debounced:
+    message = bindable_property(debounce = 0.2)
+    related_message = bindable_property(_get_related_message, depends_on = ['message', 'selected_item.name'])
     selected_item = bindable_property()
 #
 
@@ -93,6 +96,10 @@ class MyWindow(Window):
     def __init__(self):
         super(MyWindow, self).__init__()
         
+        # Debounced notifications are raised by a background timer, so they must be passed on to the UI thread:
+        dispatcher = QueuedDispatcher(schedule_flush = lambda: self.Dispatcher.BeginInvoke(Action(dispatcher.flush)))
+        set_dispatcher(dispatcher)
+        
         self.DataContext = MyWindowViewModel()
         self.DataContext.items.extend([Item('A'), Item('B'), Item('C'), Item('D'), Item('E')])
         self.DataContext.selected_item = self.DataContext.items[0]
@@ -1,4 +1,15 @@
-from view_model import ViewModel, bindable_property
-from relay_command import RelayCommand, relay_command
-from observable_list import ObservableList
-from event import Event, event
\ No newline at end of file
+from .view_model import ViewModel, bindable_property, deferred_notifications, defer_notifications
+from .relay_command import RelayCommand, relay_command
+from .async_relay_command import AsyncRelayCommand, CancellationToken, async_relay_command
+from .observable_list import ObservableList
+from .live_view import LiveView
+from .observable_dict import ObservableDict, CollectionDeltaEventArgs
+from .observable_set import ObservableSet
+from .collection_list_view import CollectionListView
+from .virtual_observable_list import VirtualObservableList
+from .event import Event, WeakEvent, event
+from .dispatcher import Dispatcher, QueuedDispatcher, get_dispatcher, set_dispatcher
+from .timers import ThreadingTimerSource, FakeTimerSource, get_timer_source, set_timer_source
+from .backend import is_headless
+from .instrumentation import MemorySink, LoggingSink, enable_instrumentation, disable_instrumentation, is_instrumentation_enabled, instrumented
+from .change_journal import ChangeJournal
@@ -0,0 +1,204 @@
+'''Data structures for positional lookups in large lists, shared by the indexed ObservableList, LiveView and CollectionListView.'''
+from .compat import xrange
+
+
+class FenwickTree(object):
+    '''A binary indexed tree, for prefix sums that can be updated in O(log n).'''
+    
+    def __init__(self, values):
+        self._tree = [0] + list(values)
+        for index in range(1, len(self._tree)):
+            parent = index + (index & -index)
+            if parent < len(self._tree):
+                self._tree[parent] += self._tree[index]
+    #
+    
+    def add(self, index, value):
+        index += 1
+        while index < len(self._tree):
+            self._tree[index] += value
+            index += index & -index
+    #
+    
+    def prefix_sum(self, end):
+        '''Returns the sum of all values before the given index.'''
+        total = 0
+        while end > 0:
+            total += self._tree[end]
+            end -= end & -end
+        return total
+    #
+    
+    def find(self, position):
+        '''Returns the index of the value that contains the given position, counting from the start of the first value,
+and the offset within that value. Positions beyond the total sum give the number of values as index.'''
+        index = 0
+        bit = 1
+        while bit * 2 < len(self._tree):
+            bit *= 2
+        while bit:
+            next_index = index + bit
+            if next_index < len(self._tree) and self._tree[next_index] <= position:
+                index = next_index
+                position -= self._tree[next_index]
+            bit //= 2
+        return index, position
+    #
+#
+
+
+class Block(object):
+    '''A run of consecutive values of a BlockList, with their weights if the list has weights.'''
+    __slots__ = ('values', 'weights', 'position')
+    
+    def __init__(self, values, weights):
+        self.values = values
+        self.weights = weights
+        self.position = 0
+    #
+#
+
+class BlockList(object):
+    '''A list of values that is divided into blocks of consecutive positions. A Fenwick tree over the sizes of the blocks
+finds the block that contains a position in O(log n), so inserting or removing values only affects the blocks at that
+position. Values can have numeric weights, whose sums up to a position are found the same way.
+
+Subclasses can keep track of which blocks contain a value, so its positions can be found by searching only those blocks,
+by overriding _add_locations and _remove_locations.'''
+    
+    # Blocks are split when they grow beyond twice this size:
+    block_size = 256
+    
+    def __init__(self, values, weights = None):
+        self.reset(values, weights)
+    #
+    
+    def reset(self, values, weights = None):
+        self._has_weights = weights is not None
+        self.blocks = []
+        for start in xrange(0, len(values), self.block_size):
+            block = Block(values[start:start + self.block_size], weights[start:start + self.block_size] if self._has_weights else None)
+            self.blocks.append(block)
+            self._add_locations(block.values, block)
+        self._update_blocks()
+    #
+    
+    def __len__(self):
+        return self._length
+    #
+    
+    def find(self, position):
+        '''Returns the block that contains the given position, and the offset within that block. Positions at or beyond
+the end of the list give the last block, and the offset just after its last value.'''
+        if position >= self._length:
+            block = self.blocks[-1]
+            return block, len(block.values)
+        block_index, offset = self._sizes.find(position)
+        return self.blocks[block_index], offset
+    #
+    
+    def block_start(self, block):
+        '''Returns the position of the first value of the given block.'''
+        return self._sizes.prefix_sum(block.position)
+    #
+    
+    def block_weight_start(self, block):
+        '''Returns the total weight of all values before the given block.'''
+        return self._weights.prefix_sum(block.position)
+    #
+    
+    def weight_before(self, position):
+        '''Returns the total weight of all values before the given position.'''
+        if not self.blocks:
+            return 0
+        block, offset = self.find(position)
+        return self._weights.prefix_sum(block.position) + sum(block.weights[:offset])
+    #
+    
+    def set_weight(self, block, offset, weight):
+        self._weights.add(block.position, weight - block.weights[offset])
+        block.weights[offset] = weight
+    #
+    
+    def insert(self, position, values, weights = None):
+        '''Inserts the given values (and their weights, if the list has weights) at the given position.'''
+        if not self.blocks:
+            self.blocks.append(Block([], [] if self._has_weights else None))
+            self._update_blocks()
+        
+        block, offset = self.find(position)
+        block.values[offset:offset] = values
+        self._add_locations(values, block)
+        self._sizes.add(block.position, len(values))
+        if self._has_weights:
+            block.weights[offset:offset] = weights
+            self._weights.add(block.position, sum(weights))
+        self._length += len(values)
+        
+        if len(block.values) > 2 * self.block_size:
+            self._split(block)
+    #
+    
+    def remove(self, position, count):
+        '''Removes count values, starting at the given position. Returns the weights of the removed values, if the list has weights.'''
+        removed_count = 0
+        removed_weights = [] if self._has_weights else None
+        has_empty_blocks = False
+        while removed_count < count:
+            # Positions after the removed values move forward, so the next block always starts at the same position:
+            block, offset = self.find(position)
+            end = min(len(block.values), offset + count - removed_count)
+            self._remove_locations(block.values[offset:end], block)
+            del block.values[offset:end]
+            self._sizes.add(block.position, offset - end)
+            if self._has_weights:
+                weights = block.weights[offset:end]
+                del block.weights[offset:end]
+                self._weights.add(block.position, -sum(weights))
+                removed_weights.extend(weights)
+            removed_count += end - offset
+            has_empty_blocks = has_empty_blocks or not block.values
+        
+        self._length -= count
+        if has_empty_blocks:
+            self.blocks = [block for block in self.blocks if block.values]
+            self._update_blocks()
+        return removed_weights
+    #
+    
+    
+    def _split(self, block):
+        new_blocks = []
+        for start in xrange(self.block_size, len(block.values), self.block_size):
+            end = start + self.block_size
+            new_block = Block(block.values[start:end], block.weights[start:end] if self._has_weights else None)
+            self._remove_locations(new_block.values, block)
+            self._add_locations(new_block.values, new_block)
+            new_blocks.append(new_block)
+        del block.values[self.block_size:]
+        if self._has_weights:
+            del block.weights[self.block_size:]
+        
+        self.blocks[block.position + 1:block.position + 1] = new_blocks
+        self._update_blocks()
+    #
+    
+    def _update_blocks(self):
+        for position, block in enumerate(self.blocks):
+            block.position = position
+        self._sizes = FenwickTree(len(block.values) for block in self.blocks)
+        if self._has_weights:
+            self._weights = FenwickTree(sum(block.weights) for block in self.blocks)
+        self._length = sum(len(block.values) for block in self.blocks)
+    #
+    
+    def _add_locations(self, values, block):
+        '''Called when the given values have been added to the given block.'''
+        pass
+    #
+    
+    def _remove_locations(self, values, block):
+        '''Called when the given values are removed from the given block.'''
+        pass
+    #
+#
@@ -0,0 +1,312 @@
+import logging
+import threading
+import types
+from .compat import get_argument_names
+from .dispatcher import get_dispatcher
+from .relay_command import *
+
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    ThreadPoolExecutor = None
+
+_logger = logging.getLogger(__name__)
+
+
+class async_relay_command(relay_command):
+    '''Creates a property that 'holds' an AsyncRelayCommand.
+If result_property is given, the result of each execution is assigned to that property of the view model.'''
+    
+    def __init__(self, execute, can_execute = None, depends_on = None, executor = None, loop = None, max_concurrency = 1, result_property = None, cache_can_execute = False):
+        super(async_relay_command, self).__init__(execute, can_execute, depends_on, cache_can_execute)
+        
+        self.executor = executor
+        self.loop = loop
+        self.max_concurrency = max_concurrency
+        self.result_property = result_property
+    #
+    
+    def _create_command(self, slf):
+        on_completed = None
+        if self.result_property is not None:
+            on_completed = lambda result: setattr(slf, self.result_property, result)
+        
+        return AsyncRelayCommand(types.MethodType(self._execute, slf),
+                                 types.MethodType(self._can_execute, slf) if self._can_execute is not None else None,
+                                 executor = self.executor, loop = self.loop, max_concurrency = self.max_concurrency, on_completed = on_completed,
+                                 cacheCanExecute = self.cache_can_execute, name = self.name)
+    #
+#
+
+
+class CancellationToken(object):
+    '''Tells a running command whether it has been cancelled. Commands receive a token if
+their execute function takes an argument named 'cancellation_token'.'''
+    
+    def __init__(self):
+        super(CancellationToken, self).__init__()
+        
+        self._event = threading.Event()
+    #
+    
+    @property
+    def is_cancelled(self):
+        return self._event.is_set()
+    #
+    
+    def cancel(self):
+        self._event.set()
+    #
+    
+    def wait(self, timeout = None):
+        '''Waits until the token is cancelled, or until the timeout expires. Returns True if the token was cancelled.'''
+        self._event.wait(timeout)
+        return self._event.is_set()
+    #
+#
+
+
+class AsyncRelayCommand(RelayCommand):
+    '''A command that runs its execute function in the background, either as a coroutine on an asyncio loop,
+or as a plain function on an executor (a thread pool by default). While max_concurrency executions are running,
+CanExecute returns False. CanExecuteChanged is raised when an execution starts and when it ends.
+
+Coroutine functions run on the given loop, or on the running loop of the thread that executes the command.
+Without either, Execute raises a RuntimeError, because the coroutine would never be run.
+
+on_completed and on_error are called with the result or the exception of each execution, through the invoke method
+of the current dispatcher. Without on_error, exceptions are re-raised there: with a QueuedDispatcher, by flush on its
+target thread. A dispatcher that calls back immediately does so on the worker thread (or loop), where there is no
+caller to raise to, so the exception is logged instead. Cancelled executions call neither.'''
+    
+    def __init__(self, execute, canExecute = None, executor = None, loop = None, max_concurrency = 1, on_completed = None, on_error = None, cacheCanExecute = False,
+                 name = None):
+        super(AsyncRelayCommand, self).__init__(execute, canExecute, cacheCanExecute, takes_argument(execute, ['cancellation_token']), name)
+        
+        self.executor = executor
+        self.loop = loop
+        self.max_concurrency = max_concurrency
+        self.on_completed = on_completed
+        self.on_error = on_error
+        
+        function = getattr(execute, '__wrapped__', execute)
+        self._takesCancellationToken = 'cancellation_token' in get_argument_names(function)
+        self._isCoroutine = asyncio is not None and asyncio.iscoroutinefunction(function)
+        
+        # Maps the futures of running executions to their cancellation tokens:
+        self._running = {}
+        self._lock = threading.Lock()
+    #
+    
+    @property
+    def is_running(self):
+        return len(self._running) > 0
+    #
+    
+    def CanExecute(self, parameter):
+        if self.max_concurrency is not None and len(self._running) >= self.max_concurrency:
+            return False
+        return super(AsyncRelayCommand, self).CanExecute(parameter)
+    #
+    
+    def Execute(self, parameter):
+        '''Starts an execution and returns its future, or None if the maximum number of executions is already running.'''
+        with self._lock:
+            if self.max_concurrency is not None and len(self._running) >= self.max_concurrency:
+                return None
+            
+            token = CancellationToken()
+            args = (parameter,) if self._takesArgument else ()
+            kwargs = {'cancellation_token': token} if self._takesCancellationToken else {}
+            
+            if self._isCoroutine:
+                loop = self.loop if self.loop is not None else _get_running_loop()
+                if loop is None:
+                    raise RuntimeError('No asyncio loop to run {0!r} on: pass a loop, or execute the command on the thread of a running loop.'.format(self._execute))
+                future = asyncio.run_coroutine_threadsafe(self._execute(*args, **kwargs), loop)
+            else:
+                executor = self.executor if self.executor is not None else _get_default_executor()
+                future = executor.submit(self._execute, *args, **kwargs)
+            self._running[future] = token
+        
+        self.OnCanExecuteChanged()
+        future.add_done_callback(self._on_execution_done)
+        return future
+    #
+    
+    def cancel(self):
+        '''Cancels all running executions. Executions that have already started
+can check their cancellation token to see whether they should stop.'''
+        with self._lock:
+            running = list(self._running.items())
+        for future, token in running:
+            token.cancel()
+            future.cancel()
+    #
+    
+    
+    def _on_execution_done(self, future):
+        # Called on the worker thread or loop, where exceptions would be swallowed by the future:
+        try:
+            get_dispatcher().invoke(self._on_execution_finished, future)
+        except Exception:
+            _logger.exception('Unhandled exception in the execution of %r', self._execute)
+    #
+    
+    def _on_execution_finished(self, future):
+        with self._lock:
+            token = self._running.pop(future, None)
+        self.OnCanExecuteChanged()
+        
+        if future.cancelled() or token is not None and token.is_cancelled:
+            return
+        
+        exception = future.exception()
+        if exception is None:
+            if self.on_completed is not None:
+                self.on_completed(future.result())
+        elif self.on_error is not None:
+            self.on_error(exception)
+        else:
+            raise exception
+    #
+#
+
+
+class _ThreadFuture(object):
+    '''A minimal stand-in for concurrent.futures.Future, for when that module is not available.'''
+    
+    def __init__(self):
+        super(_ThreadFuture, self).__init__()
+        
+        self._condition = threading.Condition()
+        self._state = 'pending'
+        self._result = None
+        self._exception = None
+        self._callbacks = []
+    #
+    
+    def cancel(self):
+        with self._condition:
+            if self._state != 'pending':
+                return self._state == 'cancelled'
+            self._state = 'cancelled'
+        self._call_callbacks()
+        return True
+    #
+    
+    def cancelled(self):
+        return self._state == 'cancelled'
+    #
+    
+    def done(self):
+        return self._state in ('cancelled', 'finished')
+    #
+    
+    def result(self, timeout = None):
+        self._wait(timeout)
+        if self._exception is not None:
+            raise self._exception
+        return self._result
+    #
+    
+    def exception(self, timeout = None):
+        self._wait(timeout)
+        return self._exception
+    #
+    
+    def add_done_callback(self, callback):
+        with self._condition:
+            if not self.done():
+                self._callbacks.append(callback)
+                return
+        callback(self)
+    #
+    
+    
+    def _run(self, function, args, kwargs):
+        with self._condition:
+            if self._state != 'pending':
+                return
+            self._state = 'running'
+        
+        try:
+            self._result = function(*args, **kwargs)
+        except Exception as exception:
+            self._exception = exception
+        
+        with self._condition:
+            self._state = 'finished'
+            self._condition.notify_all()
+        self._call_callbacks()
+    #
+    
+    def _wait(self, timeout):
+        with self._condition:
+            if not self.done():
+                self._condition.wait(timeout)
+            if self._state == 'cancelled':
+                raise RuntimeError('The execution was cancelled')
+            elif self._state != 'finished':
+                raise RuntimeError('The execution did not finish in time')
+    #
+    
+    def _call_callbacks(self):
+        for callback in self._callbacks:
+            callback(self)
+    #
+#
+
+class _ThreadExecutor(object):
+    '''Runs every submitted function on a new thread, limited to max_workers concurrent threads.'''
+    
+    def __init__(self, max_workers):
+        super(_ThreadExecutor, self).__init__()
+        
+        self._semaphore = threading.BoundedSemaphore(max_workers)
+    #
+    
+    def submit(self, function, *args, **kwargs):
+        future = _ThreadFuture()
+        
+        def run():
+            with self._semaphore:
+                future._run(function, args, kwargs)
+        #
+        thread = threading.Thread(target = run)
+        thread.daemon = True
+        thread.start()
+        return future
+    #
+#
+
+
+def _get_running_loop():
+    '''Returns the running asyncio loop of the current thread, or None.'''
+    if hasattr(asyncio, 'get_running_loop'):
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+    
+    # Before Python 3.7, the current loop may not be running:
+    loop = asyncio.get_event_loop()
+    return loop if loop.is_running() else None
+#
+
+
+_default_executor = None
+_default_executor_lock = threading.Lock()
+
+def _get_default_executor():
+    global _default_executor
+    with _default_executor_lock:
+        if _default_executor is None:
+            _default_executor = ThreadPoolExecutor(4) if ThreadPoolExecutor is not None else _ThreadExecutor(4)
+        return _default_executor
+#
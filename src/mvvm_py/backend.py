@@ -0,0 +1,98 @@
+'''Provides the .NET interfaces and event argument types that mvvm_py implements and raises.
+Under IronPython, these are the actual WPF types. Elsewhere, such as on CPython, pure-Python stand-ins
+with the same names and members are used instead, so view models can be used and tested without WPF.'''
+
+try:
+    import clr
+except ImportError:
+    clr = None
+
+
+if clr is not None:
+    from System import EventArgs
+    from System.Collections import IList
+    from System.ComponentModel import INotifyPropertyChanged, PropertyChangedEventArgs
+    from System.Collections.Specialized import INotifyCollectionChanged, NotifyCollectionChangedAction, NotifyCollectionChangedEventArgs
+    from System.Windows.Input import ICommand
+    
+    is_headless = False
+else:
+    is_headless = True
+    
+    
+    class EventArgs(object):
+        __slots__ = ()
+    #
+    EventArgs.Empty = EventArgs()
+    
+    
+    class INotifyPropertyChanged(object):
+        __slots__ = ()
+    #
+    
+    class PropertyChangedEventArgs(EventArgs):
+        __slots__ = ('PropertyName',)
+        
+        def __init__(self, propertyName):
+            self.PropertyName = propertyName
+        #
+        
+        def __repr__(self):
+            return 'PropertyChangedEventArgs({0!r})'.format(self.PropertyName)
+        #
+    #
+    
+    
+    class IList(object):
+        __slots__ = ()
+    #
+    
+    class INotifyCollectionChanged(object):
+        __slots__ = ()
+    #
+    
+    class NotifyCollectionChangedAction(object):
+        Add = 0
+        Remove = 1
+        Replace = 2
+        Move = 3
+        Reset = 4
+    #
+    
+    class NotifyCollectionChangedEventArgs(EventArgs):
+        '''Supports the constructor overloads that take lists of items:
+(Reset), (Add or Remove, items, index), (Replace, new items, old items, index) and (Move, items, index, old index).'''
+        
+        __slots__ = ('Action', 'NewItems', 'OldItems', 'NewStartingIndex', 'OldStartingIndex')
+        
+        def __init__(self, action, *args):
+            self.Action = action
+            self.NewItems = None
+            self.OldItems = None
+            self.NewStartingIndex = -1
+            self.OldStartingIndex = -1
+            
+            if action == NotifyCollectionChangedAction.Add:
+                self.NewItems, self.NewStartingIndex = args
+            elif action == NotifyCollectionChangedAction.Remove:
+                self.OldItems, self.OldStartingIndex = args
+            elif action == NotifyCollectionChangedAction.Replace:
+                self.NewItems, self.OldItems, self.NewStartingIndex = args
+                self.OldStartingIndex = self.NewStartingIndex
+            elif action == NotifyCollectionChangedAction.Move:
+                self.NewItems, self.NewStartingIndex, self.OldStartingIndex = args
+                self.OldItems = self.NewItems
+            elif action != NotifyCollectionChangedAction.Reset or args:
+                raise ValueError('Invalid arguments for collection change action {0!r}'.format(action))
+        #
+        
+        def __repr__(self):
+            return 'NotifyCollectionChangedEventArgs({0!r}, new = {1!r} at {2}, old = {3!r} at {4})'.format(
+                self.Action, self.NewItems, self.NewStartingIndex, self.OldItems, self.OldStartingIndex)
+        #
+    #
+    
+    
+    class ICommand(object):
+        __slots__ = ()
+    #
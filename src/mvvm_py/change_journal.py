@@ -0,0 +1,218 @@
+from collections import deque, namedtuple
+from contextlib import contextmanager
+from .compat import perf_counter
+
+
+def _splice(items, index, removed_count, new_items):
+    '''Replaces removed_count items at the given index with new_items, raising the most specific notification.'''
+    if removed_count and removed_count == len(items) and index == 0:
+        items.replace_all(new_items)
+    elif removed_count and new_items:
+        items[index:index + removed_count] = new_items
+    elif removed_count:
+        items.remove_range(index, removed_count)
+    elif new_items:
+        items.insert_range(index, new_items)
+#
+
+
+class _PropertyChange(namedtuple('_PropertyChange', 'view_model name old_value new_value')):
+    __slots__ = ()
+    
+    def undo(self):
+        setattr(self.view_model, self.name, self.old_value)
+    #
+    
+    def redo(self):
+        setattr(self.view_model, self.name, self.new_value)
+    #
+#
+
+class _ListChange(namedtuple('_ListChange', 'items index old_items new_items')):
+    __slots__ = ()
+    
+    def undo(self):
+        _splice(self.items, self.index, len(self.new_items), self.old_items)
+    #
+    
+    def redo(self):
+        _splice(self.items, self.index, len(self.old_items), self.new_items)
+    #
+#
+
+class _ListMove(namedtuple('_ListMove', 'items old_index new_index')):
+    __slots__ = ()
+    
+    def undo(self):
+        self.items.move(self.new_index, self.old_index)
+    #
+    
+    def redo(self):
+        self.items.move(self.old_index, self.new_index)
+    #
+#
+
+
+class ChangeJournal(object):
+    '''Records the changes that are made to tracked view models and observable lists, so they can be undone and redone.
+Only deltas are recorded: the old and new value of a property, or the items that were added to or removed from a list.
+
+Changes that are made within a transaction are undone and redone together. Other changes form a group on their own,
+except that consecutive changes to the same property, within merge_interval seconds of each other, are merged into a
+single change, so typing a word does not produce an undo step per keystroke. At most max_history groups are kept.
+
+Properties without a getter are not recorded. Changes that are made by a setter while another (recorded) setter is
+active are not recorded either, because undoing the outer setter is expected to undo them as well.'''
+    
+    def __init__(self, max_history = 100, merge_interval = 1.0, clock = None):
+        super(ChangeJournal, self).__init__()
+        
+        self.max_history = max_history
+        self.merge_interval = merge_interval
+        self.clock = clock if clock is not None else perf_counter
+        
+        self._undo_groups = deque(maxlen = max_history)
+        self._redo_groups = []
+        
+        self._transaction = None
+        self._transaction_depth = 0
+        self._setter_depth = 0
+        self._replaying = False
+        
+        # The (view model, property name) of the last recorded change and when it was made, while it can still be merged with:
+        self._merge_key = None
+        self._merge_time = None
+    #
+    
+    @property
+    def can_undo(self):
+        return len(self._undo_groups) > 0
+    #
+    
+    @property
+    def can_redo(self):
+        return len(self._redo_groups) > 0
+    #
+    
+    def track(self, *objects):
+        '''Starts recording the changes of the given view models and observable lists.'''
+        for obj in objects:
+            obj._journal = self
+    #
+    
+    def untrack(self, *objects):
+        '''Stops recording the changes of the given view models and observable lists. Recorded changes are kept.'''
+        for obj in objects:
+            if obj._journal is self:
+                obj._journal = None
+    #
+    
+    @contextmanager
+    def transaction(self):
+        '''Groups all changes that are made while the context is active into a single undo step. Transactions can be nested.'''
+        if self._transaction_depth == 0:
+            self._transaction = []
+        self._transaction_depth += 1
+        try:
+            yield
+        finally:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                group, self._transaction = self._transaction, None
+                self._add_group(group)
+    #
+    
+    def undo(self):
+        '''Undoes the most recent group of changes. Returns False if there was nothing to undo.'''
+        if not self._undo_groups or self._transaction_depth:
+            return False
+        
+        group = self._undo_groups.pop()
+        self._replay(reversed(group), 'undo')
+        self._redo_groups.append(group)
+        return True
+    #
+    
+    def redo(self):
+        '''Redoes the most recently undone group of changes. Returns False if there was nothing to redo.'''
+        if not self._redo_groups or self._transaction_depth:
+            return False
+        
+        group = self._redo_groups.pop()
+        self._replay(group, 'redo')
+        self._undo_groups.append(group)
+        return True
+    #
+    
+    def clear(self):
+        self._undo_groups.clear()
+        self._redo_groups = []
+        self._merge_key = None
+    #
+    
+    
+    # Called by tracked view models and lists:
+    @contextmanager
+    def recording_property_change(self, view_model, name, old_value, new_value):
+        '''Records a property change if the body of the context completes, and if it is not part of another change.'''
+        self._setter_depth += 1
+        try:
+            yield
+        finally:
+            self._setter_depth -= 1
+        
+        if self._setter_depth == 0 and not self._replaying:
+            self._add_change(_PropertyChange(view_model, name, old_value, new_value), (view_model, name))
+    #
+    
+    def record_list_change(self, items, index, old_items, new_items):
+        '''Records that old_items, at the given index, have been replaced by new_items.'''
+        if self._setter_depth == 0 and not self._replaying:
+            self._add_change(_ListChange(items, index, old_items, new_items))
+    #
+    
+    def record_list_move(self, items, old_index, new_index):
+        if self._setter_depth == 0 and not self._replaying:
+            self._add_change(_ListMove(items, old_index, new_index))
+    #
+    
+    
+    def _add_change(self, change, merge_key = None):
+        if self._transaction is not None:
+            self._transaction.append(change)
+            return
+        
+        now = self.clock()
+        if (merge_key is not None and self.merge_interval is not None and self._merge_key is not None and
+                self._merge_key[0] is merge_key[0] and self._merge_key[1] == merge_key[1] and now - self._merge_time <= self.merge_interval):
+            # The merged change keeps the oldest value, so undoing it reverts all merged changes at once:
+            group = self._undo_groups[-1]
+            group[0] = change._replace(old_value = group[0].old_value)
+            self._merge_time = now
+            return
+        
+        self._add_group([change])
+        self._merge_key = merge_key
+        self._merge_time = now
+    #
+    
+    def _add_group(self, group):
+        if not group:
+            return
+        
+        # The oldest group is evicted automatically when the history is full:
+        self._undo_groups.append(group)
+        self._redo_groups = []
+        self._merge_key = None
+    #
+    
+    def _replay(self, changes, method_name):
+        self._merge_key = None
+        self._replaying = True
+        try:
+            for change in changes:
+                getattr(change, method_name)()
+        finally:
+            self._replaying = False
+    #
+#
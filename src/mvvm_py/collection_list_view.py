@@ -0,0 +1,142 @@
+from ._blocks import FenwickTree
+from .backend import INotifyCollectionChanged, NotifyCollectionChangedAction, NotifyCollectionChangedEventArgs, is_headless
+from .dispatcher import raise_event
+from .event import *
+
+
+# Marks slots whose key has been removed:
+_empty = object()
+
+
+class CollectionListView(INotifyCollectionChanged):
+    '''A read-only list of the values of an ObservableDict, or of the items of an ObservableSet, that raises
+CollectionChanged notifications, so keyed collections can be bound to views that expect a list.
+Added items are appended to the end of the list, removed and replaced items keep their position.
+Call detach when the view is no longer needed, to stop listening to the source.
+
+Every key (or set item) occupies a slot, in list order. Slots of removed keys stay empty until the slots are compacted,
+and a Fenwick tree over the occupied slots gives the list index of a key in O(log n).'''
+    
+    CollectionChanged = event('CollectionChanged')
+    
+    # Adding more than this number of items at once raises a Reset notification instead,
+    # because WPF's collection views do not support notifications for multiple items (see ObservableList.reset_threshold):
+    reset_threshold = None if is_headless else 1
+    
+    def __init__(self, source):
+        super(CollectionListView, self).__init__()
+        
+        self.source = source
+        self._is_dictionary = isinstance(source, dict)
+        
+        # The items of the list, and the slots of their keys (see _assign_slots):
+        keys = list(source)
+        self._items = [source[key] for key in keys] if self._is_dictionary else list(keys)
+        self._assign_slots(keys, 2 * len(keys))
+        
+        self.source.Changed += self._on_source_changed
+    #
+    
+    def detach(self):
+        '''Stops listening to changes of the source.'''
+        self.source.Changed -= self._on_source_changed
+    #
+    
+    def add_CollectionChanged(self, value):
+        self.CollectionChanged += value
+    #
+    
+    def remove_CollectionChanged(self, value):
+        self.CollectionChanged -= value
+    #
+    
+    def OnCollectionChanged(self, action, added_index = None, added_items = None, removed_index = None, removed_items = None):
+        if action == NotifyCollectionChangedAction.Reset:
+            raise_event(self.CollectionChanged, self, NotifyCollectionChangedEventArgs(action))
+        elif action == NotifyCollectionChangedAction.Add:
+            raise_event(self.CollectionChanged, self, NotifyCollectionChangedEventArgs(action, added_items, added_index))
+        elif action == NotifyCollectionChangedAction.Remove:
+            raise_event(self.CollectionChanged, self, NotifyCollectionChangedEventArgs(action, removed_items, removed_index))
+        elif action == NotifyCollectionChangedAction.Replace:
+            raise_event(self.CollectionChanged, self, NotifyCollectionChangedEventArgs(action, added_items, removed_items, added_index))
+    #
+    
+    
+    # Read-only list methods:
+    def __len__(self):
+        return len(self._items)
+    #
+    
+    def __getitem__(self, index):
+        return self._items[index]
+    #
+    
+    def __iter__(self):
+        return iter(self._items)
+    #
+    
+    def __contains__(self, item):
+        if self._is_dictionary:
+            return item in self._items
+        return item in self.source
+    #
+    
+    def index(self, item):
+        if not self._is_dictionary and item in self._slots:
+            return self._get_index(item)
+        return self._items.index(item)
+    #
+    
+    
+    def _on_source_changed(self, sender, args):
+        if args.removed:
+            if len(args.removed) == len(self._items) and not args.added:
+                self._items = []
+                self._assign_slots([], 0)
+                self.OnCollectionChanged(NotifyCollectionChangedAction.Reset)
+            else:
+                # Removing items from back to front keeps the indexes of the other removed items valid:
+                for index, key in sorted(((self._get_index(key), key) for key in args.removed), reverse = True):
+                    slot = self._slots.pop(key)
+                    self._slot_keys[slot] = _empty
+                    self._occupied.add(slot, -1)
+                    item = self._items.pop(index)
+                    self.OnCollectionChanged(NotifyCollectionChangedAction.Remove, removed_index = index, removed_items = [item])
+        
+        for key, (old_value, new_value) in args.replaced.items():
+            index = self._get_index(key)
+            self._items[index] = new_value
+            self.OnCollectionChanged(NotifyCollectionChangedAction.Replace, added_index = index, added_items = [new_value], removed_index = index, removed_items = [old_value])
+        
+        if args.added:
+            index = len(self._items)
+            keys = list(args.added)
+            items = [args.added[key] for key in keys] if self._is_dictionary else keys
+            self._items.extend(items)
+            
+            if len(self._slot_keys) + len(keys) > self._capacity:
+                self._assign_slots([key for key in self._slot_keys if key is not _empty] + keys, 2 * len(self._items))
+            else:
+                for key in keys:
+                    slot = self._slots[key] = len(self._slot_keys)
+                    self._slot_keys.append(key)
+                    self._occupied.add(slot, 1)
+            if self.reset_threshold is not None and len(items) > self.reset_threshold:
+                self.OnCollectionChanged(NotifyCollectionChangedAction.Reset)
+            else:
+                self.OnCollectionChanged(NotifyCollectionChangedAction.Add, added_index = index, added_items = items)
+    #
+    
+    def _get_index(self, key):
+        return self._occupied.prefix_sum(self._slots[key])
+    #
+    
+    def _assign_slots(self, keys, capacity):
+        '''Gives the given keys consecutive slots, leaving room for new keys up to the given capacity. _slots maps keys
+to slots, _slot_keys contains the key in each slot (or _empty), and _occupied tells which slots are in use.'''
+        self._capacity = max(capacity, 16)
+        self._slots = dict((key, slot) for slot, key in enumerate(keys))
+        self._slot_keys = list(keys)
+        self._occupied = FenwickTree([1] * len(keys) + [0] * (self._capacity - len(keys)))
+    #
+#
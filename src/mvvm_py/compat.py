@@ -0,0 +1,46 @@
+'''Helpers that allow mvvm_py to run on both IronPython 2.7 and CPython 2 and 3.'''
+import functools
+import inspect
+import time
+import types
+
+try:
+    xrange = xrange
+except NameError:
+    xrange = range
+
+# A read-only view of a dictionary. Python 2 has no such type, so there a plain dictionary is used:
+mapping_proxy = getattr(types, 'MappingProxyType', dict)
+
+# A high-resolution clock for measuring durations:
+perf_counter = getattr(time, 'perf_counter', time.time)
+
+
+def with_metaclass(metaclass, *bases):
+    '''Creates a base class with the given metaclass, that can be used with both Python 2 and 3 syntax.
+The temporary base class replaces itself with the actual class when it is subclassed.'''
+    class temporary_metaclass(metaclass):
+        def __new__(mcs, name, this_bases, dct):
+            return metaclass(name, bases, dct)
+        #
+    #
+    return type.__new__(temporary_metaclass, 'temporary_class', (), {})
+#
+
+def get_argument_names(function):
+    '''Returns the names of the positional arguments of the given function (including self, for methods).'''
+    if hasattr(inspect, 'getfullargspec'):
+        return inspect.getfullargspec(function).args
+    return inspect.getargspec(function).args
+#
+
+def cmp_key(comp, key):
+    '''Combines a Python 2 style comparison function and a key function into a single key function.'''
+    if comp is None:
+        return key
+    elif key is None:
+        return functools.cmp_to_key(comp)
+    
+    compare_key = functools.cmp_to_key(comp)
+    return lambda item: compare_key(key(item))
+#
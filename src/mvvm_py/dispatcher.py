@@ -0,0 +1,146 @@
+from collections import OrderedDict
+import itertools
+import threading
+
+
+class Dispatcher(object):
+    '''Raises events on behalf of view models, observable lists and commands.
+This dispatcher calls event handlers immediately, on the current thread.'''
+    
+    # Whether events and functions from other threads are passed on to a single target thread:
+    has_target_thread = False
+    
+    def raise_event(self, event, sender, args, coalesce_key = None):
+        '''Calls the handlers of the given event. Events with the same coalesce_key may be merged
+if they have not been raised yet, in which case only the last one is raised.'''
+        event(sender, args)
+    #
+    
+    def invoke(self, function, *args):
+        '''Calls the given function on the thread that this dispatcher raises events on.'''
+        function(*args)
+    #
+#
+
+class QueuedDispatcher(Dispatcher):
+    '''Raises events on a single target thread. On the target thread itself, events are raised immediately,
+but events from other threads are queued. The target thread must call flush or process to raise them, in batches
+of at most batch_size events. Queued events with the same coalesce key, such as PropertyChanged events for the
+same property of the same object, are merged.
+
+schedule_flush, if given, is called whenever the queue needs to be flushed. It can be called from any thread,
+and should arrange for flush to be called on the target thread, for example with WPF's Dispatcher.BeginInvoke.'''
+    
+    has_target_thread = True
+    
+    def __init__(self, schedule_flush = None, batch_size = 100, thread = None):
+        super(QueuedDispatcher, self).__init__()
+        
+        self.schedule_flush = schedule_flush
+        self.batch_size = batch_size
+        self.thread = thread if thread is not None else threading.current_thread()
+        
+        self.coalesced_count = 0
+        
+        self._condition = threading.Condition(threading.Lock())
+        self._queue = OrderedDict()
+        self._flush_scheduled = False
+        self._ids = itertools.count()
+    #
+    
+    def raise_event(self, event, sender, args, coalesce_key = None):
+        if threading.current_thread() is self.thread:
+            event(sender, args)
+        else:
+            self._enqueue(coalesce_key, event, (sender, args))
+    #
+    
+    def invoke(self, function, *args):
+        if threading.current_thread() is self.thread:
+            function(*args)
+        else:
+            self._enqueue(None, function, args)
+    #
+    
+    def flush(self):
+        '''Calls up to batch_size queued functions and event handlers. Must be called on the target thread.
+Returns True if there are more queued items, in which case another flush is scheduled. If a handler raises an
+exception, the rest of the batch stays queued, another flush is scheduled and the exception is propagated.'''
+        with self._condition:
+            batch = [self._queue.popitem(last = False) for _ in range(min(self.batch_size, len(self._queue)))]
+            self._flush_scheduled = bool(self._queue)
+        
+        processed_count = 0
+        try:
+            for key, (function, args) in batch:
+                processed_count += 1
+                function(*args)
+        finally:
+            with self._condition:
+                # Unprocessed items go back to the front of the queue, unless a newer item with the same coalesce key has been queued:
+                unprocessed_items = batch[processed_count:]
+                if unprocessed_items:
+                    queue = OrderedDict((key, item) for key, item in unprocessed_items if key not in self._queue)
+                    queue.update(self._queue)
+                    self._queue = queue
+                has_remaining_items = bool(self._queue)
+                self._flush_scheduled = has_remaining_items
+            
+            # Flushing in batches keeps the target thread responsive:
+            if has_remaining_items and self.schedule_flush is not None:
+                self.schedule_flush()
+        return has_remaining_items
+    #
+    
+    def flush_all(self):
+        '''Calls all queued functions and event handlers. Must be called on the target thread.'''
+        while self.flush():
+            pass
+    #
+    
+    def process(self, timeout = None):
+        '''Waits until items have been queued, or until the timeout expires, and then flushes one batch.
+This can be used to drive a target thread that has no event loop of its own.'''
+        with self._condition:
+            if not self._queue:
+                self._condition.wait(timeout)
+        return self.flush()
+    #
+    
+    
+    def _enqueue(self, coalesce_key, function, args):
+        with self._condition:
+            if coalesce_key is None:
+                key = next(self._ids)
+            else:
+                key = ('coalesced', coalesce_key)
+                # The merged item moves to the end of the queue, because it reflects the latest state:
+                if self._queue.pop(key, None) is not None:
+                    self.coalesced_count += 1
+            self._queue[key] = (function, args)
+            
+            must_schedule = not self._flush_scheduled
+            self._flush_scheduled = True
+            self._condition.notify()
+        
+        if must_schedule and self.schedule_flush is not None:
+            self.schedule_flush()
+    #
+#
+
+
+_dispatcher = Dispatcher()
+
+def get_dispatcher():
+    return _dispatcher
+#
+
+def set_dispatcher(dispatcher):
+    '''Sets the dispatcher that is used for raising all PropertyChanged, CollectionChanged and CanExecuteChanged events.'''
+    global _dispatcher
+    _dispatcher = dispatcher if dispatcher is not None else Dispatcher()
+#
+
+def raise_event(event, sender, args, coalesce_key = None):
+    _dispatcher.raise_event(event, sender, args, coalesce_key)
+#
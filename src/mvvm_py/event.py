@@ -1,15 +1,21 @@
+from collections import OrderedDict
+import inspect
+import weakref
+from .compat import xrange
 
 
 class event(property):
     '''Creates a property that 'holds' an event.
-The actual Event is created on demand.'''
+The actual Event is created on demand. With weak set to True, a WeakEvent is created instead.'''
     
-    def __init__(self, backing_field):
+    def __init__(self, backing_field, weak = False):
+        self.name = backing_field
         self.backing_field = '_{0}'.format(backing_field)
+        self.event_type = WeakEvent if weak else Event
         
         def getter(slf):
             if not hasattr(slf, self.backing_field):
-                setattr(slf, self.backing_field, Event())
+                setattr(slf, self.backing_field, self.event_type(self.name))
             return getattr(slf, self.backing_field)
         
         def setter(slf, value):
@@ -25,11 +31,12 @@ The actual Event is created on demand.'''
 class Event(object):
     '''Creates an event. Event handlers can be added and removed using += and -=
 operators. Calling the event will call all registered handlers. Calling an
-event that has no handlers simply does nothing.'''
+event that has no handlers simply does nothing. The optional name is used by instrumentation.'''
     
-    def __init__(self):
+    def __init__(self, name = None):
         super(Event, self).__init__()
         
+        self.name = name
         self._handlers = []
     #
     
@@ -41,8 +48,10 @@ event that has no handlers simply does nothing.'''
     #
     
     def __isub__(self, handler):
-        if handler in self._handlers:
+        try:
             self._handlers.remove(handler)
+        except ValueError:
+            pass
         return self
     #
     
@@ -50,4 +59,100 @@ event that has no handlers simply does nothing.'''
         for handler in self._handlers:
             handler(*args)
     #
-#
\ No newline at end of file
+#
+
+class WeakEvent(Event):
+    '''An event that only keeps weak references to the objects of bound-method handlers, so subscribing
+does not keep those objects alive. Handlers of collected objects are removed lazily. Other handlers are
+referenced strongly. Handlers are called from an immutable snapshot that is only rebuilt after handlers
+have been added or removed, so (un)subscribing from within a handler does not affect the current call.'''
+    
+    def __init__(self, name = None):
+        super(WeakEvent, self).__init__(name)
+        
+        # Maps handler keys to [object reference or None, function, subscription count]:
+        self._handlers = OrderedDict()
+        self._snapshot = ()
+    #
+    
+    def __iadd__(self, handler):
+        if not callable(handler):
+            raise TypeError('Cannot register a non-callable as event handler')
+        
+        key, reference, function = self._get_handler_info(handler)
+        entry = self._handlers.get(key)
+        if entry is not None and self._is_alive(entry, handler):
+            entry[2] += 1
+        else:
+            # A dead entry may have the same key as a new object, because object ids can be reused:
+            self._handlers.pop(key, None)
+            self._handlers[key] = [reference, function, 1]
+        self._snapshot = None
+        return self
+    #
+    
+    def __isub__(self, handler):
+        key = self._get_handler_info(handler)[0]
+        entry = self._handlers.get(key)
+        if entry is not None and self._is_alive(entry, handler):
+            entry[2] -= 1
+            if entry[2] == 0:
+                del self._handlers[key]
+            self._snapshot = None
+        return self
+    #
+    
+    def __call__(self, *args):
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self._snapshot = tuple((entry[0], entry[1]) for entry in self._handlers.values() for _ in xrange(entry[2]))
+        
+        has_dead_handlers = False
+        for reference, function in snapshot:
+            if reference is None:
+                function(*args)
+            else:
+                obj = reference()
+                if obj is not None:
+                    function(obj, *args)
+                else:
+                    has_dead_handlers = True
+        
+        if has_dead_handlers:
+            self._remove_dead_handlers()
+    #
+    
+    def __len__(self):
+        return sum(entry[2] for entry in self._handlers.values() if entry[0] is None or entry[0]() is not None)
+    #
+    
+    
+    def _get_handler_info(self, handler):
+        '''Returns a (key, object reference, function) tuple for the given handler.
+The reference is None for handlers that are referenced strongly.'''
+        if inspect.ismethod(handler) and handler.__self__ is not None:
+            try:
+                return (id(handler.__self__), handler.__func__), weakref.ref(handler.__self__), handler.__func__
+            except TypeError:
+                # Not all objects support weak references:
+                pass
+        
+        try:
+            hash(handler)
+            return handler, None, handler
+        except TypeError:
+            return id(handler), None, handler
+    #
+    
+    def _is_alive(self, entry, handler):
+        reference = entry[0]
+        return reference is None or reference() is getattr(handler, '__self__', None)
+    #
+    
+    def _remove_dead_handlers(self):
+        for key, entry in list(self._handlers.items()):
+            if entry[0] is not None and entry[0]() is None:
+                del self._handlers[key]
+        self._snapshot = None
+    #
+#
@@ -0,0 +1,263 @@
+'''Opt-in instrumentation of notifications and event handlers.
+
+While instrumentation is enabled, the following records are passed to a sink, as (kind, owner, name, value) calls,
+where owner is the name of the class that raised the notification:
+
+- 'PropertyChanged': name is the property name and value is 1
+- 'CanExecuteChanged': name is the command name (None for commands that are not created by a relay_command) and value is 1.
+  For commands of a view model, owner is the view model class
+- 'CollectionChanged': name is the action ('Add', 'Remove', 'Replace', 'Move' or 'Reset') and value is 1
+- 'FanOut': name is the property that was set, value is the number of dependent property and command notifications
+  that the setter raised (or deferred)
+- 'HandlerTime': name is the event name, value is the time in seconds that the handlers of one event call took
+
+Instrumentation is enabled by replacing a few methods of ViewModel, RelayCommand, ObservableList, VirtualObservableList, LiveView,
+CollectionListView, Event and WeakEvent with instrumented versions, and disabled by restoring the original methods, so it has no overhead when disabled.'''
+from contextlib import contextmanager
+import logging
+import threading
+from .backend import NotifyCollectionChangedAction
+from .collection_list_view import CollectionListView
+from .compat import perf_counter
+from .event import Event, WeakEvent
+from .live_view import LiveView
+from .observable_list import ObservableList
+from .relay_command import RelayCommand
+from .view_model import ViewModel
+from .virtual_observable_list import VirtualObservableList
+
+
+class MemorySink(object):
+    '''Collects instrumentation records in memory. Counters are dictionaries that map (class name, name) tuples to counts.
+Fan-out histograms map (class name, property name) tuples to dictionaries that map fan-out sizes to counts.
+Handler times map (class name, event name) tuples to [call count, total time, maximum time] lists.'''
+    
+    def __init__(self):
+        super(MemorySink, self).__init__()
+        
+        self._lock = threading.Lock()
+        self.clear()
+    #
+    
+    def clear(self):
+        with self._lock:
+            self.property_changed_counts = {}
+            self.can_execute_changed_counts = {}
+            self.collection_changed_counts = {}
+            self.fan_out_histograms = {}
+            self.handler_times = {}
+    #
+    
+    def __call__(self, kind, owner, name, value):
+        key = (owner, name)
+        with self._lock:
+            if kind == 'FanOut':
+                histogram = self.fan_out_histograms.setdefault(key, {})
+                histogram[value] = histogram.get(value, 0) + 1
+            elif kind == 'HandlerTime':
+                times = self.handler_times.get(key)
+                if times is None:
+                    self.handler_times[key] = [1, value, value]
+                else:
+                    times[0] += 1
+                    times[1] += value
+                    times[2] = max(times[2], value)
+            else:
+                counts = self._get_counts(kind)
+                counts[key] = counts.get(key, 0) + value
+    #
+    
+    def get_class_counts(self, kind):
+        '''Returns a dictionary that maps class names to the total number of notifications of the given kind.'''
+        class_counts = {}
+        with self._lock:
+            for (owner, name), count in self._get_counts(kind).items():
+                class_counts[owner] = class_counts.get(owner, 0) + count
+        return class_counts
+    #
+    
+    def report(self):
+        '''Returns a text summary of all collected records, with the most frequent notifications first.'''
+        lines = []
+        with self._lock:
+            for kind in ('PropertyChanged', 'CanExecuteChanged', 'CollectionChanged'):
+                for (owner, name), count in sorted(self._get_counts(kind).items(), key = lambda item: (-item[1], item[0])):
+                    lines.append('{0} {1}.{2}: {3}'.format(kind, owner, name, count))
+            for (owner, name), histogram in sorted(self.fan_out_histograms.items()):
+                lines.append('FanOut {0}.{1}: {2}'.format(owner, name, ', '.join('{0} x{1}'.format(size, count) for size, count in sorted(histogram.items()))))
+            for (owner, name), (calls, total, maximum) in sorted(self.handler_times.items(), key = lambda item: (-item[1][1], item[0])):
+                lines.append('HandlerTime {0}.{1}: {2} calls, {3:.6f}s total, {4:.6f}s max'.format(owner, name, calls, total, maximum))
+        return '\n'.join(lines)
+    #
+    
+    
+    def _get_counts(self, kind):
+        if kind == 'PropertyChanged':
+            return self.property_changed_counts
+        elif kind == 'CanExecuteChanged':
+            return self.can_execute_changed_counts
+        elif kind == 'CollectionChanged':
+            return self.collection_changed_counts
+        raise ValueError('Unknown instrumentation record kind: {!r}'.format(kind))
+    #
+#
+
+class LoggingSink(object):
+    '''Writes every instrumentation record to a logger.'''
+    
+    def __init__(self, logger = None, level = logging.DEBUG):
+        super(LoggingSink, self).__init__()
+        
+        self.logger = logger if logger is not None else logging.getLogger('mvvm_py.instrumentation')
+        self.level = level
+    #
+    
+    def __call__(self, kind, owner, name, value):
+        self.logger.log(self.level, '%s %s.%s: %r', kind, owner, name, value)
+    #
+#
+
+
+# The sink that receives records, or None while instrumentation is disabled:
+_sink = None
+
+# The original methods, by (class, method name), while instrumentation is enabled:
+_original_methods = {}
+
+# Setters that are being handled on the current thread, as [view model, fan-out] lists:
+_thread_state = threading.local()
+
+_action_names = dict((getattr(NotifyCollectionChangedAction, name), name) for name in ('Add', 'Remove', 'Replace', 'Move', 'Reset'))
+
+
+def enable_instrumentation(sink):
+    '''Starts passing instrumentation records to the given sink, which can be a MemorySink, a LoggingSink,
+or any function that takes (kind, owner, name, value) arguments. Calling this again replaces the sink.'''
+    global _sink
+    if not callable(sink):
+        raise TypeError('An instrumentation sink must be callable')
+    
+    _sink = sink
+    if not _original_methods:
+        for cls, method_name, create_method in _instrumented_methods:
+            original_method = cls.__dict__[method_name]
+            _original_methods[(cls, method_name)] = original_method
+            setattr(cls, method_name, create_method(original_method))
+#
+
+def disable_instrumentation():
+    '''Stops instrumentation and restores the original, uninstrumented methods.'''
+    global _sink
+    for (cls, method_name), original_method in _original_methods.items():
+        setattr(cls, method_name, original_method)
+    _original_methods.clear()
+    _sink = None
+#
+
+def is_instrumentation_enabled():
+    return _sink is not None
+#
+
+@contextmanager
+def instrumented(sink = None):
+    '''Enables instrumentation while the context is active, and yields the sink. A MemorySink is used by default.'''
+    if sink is None:
+        sink = MemorySink()
+    enable_instrumentation(sink)
+    try:
+        yield sink
+    finally:
+        disable_instrumentation()
+#
+
+
+def _count_fan_out(view_model, count):
+    setters = getattr(_thread_state, 'setters', None)
+    if setters and setters[-1][0] is view_model:
+        setters[-1][1] += count
+#
+
+def _instrument_on_property_changed(original_method):
+    def OnPropertyChanged(self, propertyName):
+        _count_fan_out(self, 1)
+        if not self._deferral_depth:
+            _sink('PropertyChanged', type(self).__name__, propertyName, 1)
+        original_method(self, propertyName)
+    #
+    return OnPropertyChanged
+#
+
+def _instrument_notify_commands(original_method):
+    def _notify_commands(self, command_names):
+        _count_fan_out(self, len(command_names))
+        original_method(self, command_names)
+    #
+    return _notify_commands
+#
+
+def _instrument_on_can_execute_changed(original_method):
+    def OnCanExecuteChanged(self):
+        # Commands are counted where they raise their notification, which includes commands that are notified directly,
+        # such as async commands that start or finish. The view model of a command is its owner or that of its method:
+        owner = getattr(self, '_owner', None)
+        if owner is None:
+            owner = getattr(self._execute, '__self__', None)
+        _sink('CanExecuteChanged', type(owner if owner is not None else self).__name__, self.name, 1)
+        original_method(self)
+    #
+    return OnCanExecuteChanged
+#
+
+def _instrument_handle_related_properties_and_commands(original_method):
+    def _handle_related_properties_and_commands(self, property):
+        setters = getattr(_thread_state, 'setters', None)
+        if setters is None:
+            setters = _thread_state.setters = []
+        setter = [self, 0]
+        setters.append(setter)
+        try:
+            original_method(self, property)
+        finally:
+            setters.pop()
+        _sink('FanOut', type(self).__name__, property.name, setter[1])
+    #
+    return _handle_related_properties_and_commands
+#
+
+def _instrument_on_collection_changed(original_method):
+    def OnCollectionChanged(self, action, *args, **kwargs):
+        _sink('CollectionChanged', type(self).__name__, _action_names.get(action, action), 1)
+        original_method(self, action, *args, **kwargs)
+    #
+    return OnCollectionChanged
+#
+
+def _instrument_event_call(original_method):
+    def __call__(self, *args):
+        # Events without handlers are not worth timing:
+        if not self._handlers:
+            return
+        
+        start = perf_counter()
+        try:
+            original_method(self, *args)
+        finally:
+            # Events are normally raised with a sender and event arguments:
+            owner = type(args[0]).__name__ if args else None
+            _sink('HandlerTime', owner, self.name, perf_counter() - start)
+    #
+    return __call__
+#
+
+_instrumented_methods = (
+    (ViewModel, 'OnPropertyChanged', _instrument_on_property_changed),
+    (ViewModel, '_notify_commands', _instrument_notify_commands),
+    (ViewModel, '_handle_related_properties_and_commands', _instrument_handle_related_properties_and_commands),
+    (RelayCommand, 'OnCanExecuteChanged', _instrument_on_can_execute_changed),
+    (ObservableList, 'OnCollectionChanged', _instrument_on_collection_changed),
+    (VirtualObservableList, 'OnCollectionChanged', _instrument_on_collection_changed),
+    (LiveView, 'OnCollectionChanged', _instrument_on_collection_changed),
+    (CollectionListView, 'OnCollectionChanged', _instrument_on_collection_changed),
+    (Event, '__call__', _instrument_event_call),
+    (WeakEvent, '__call__', _instrument_event_call),
+)
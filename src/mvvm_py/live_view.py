@@ -0,0 +1,377 @@
+import bisect
+from ._blocks import BlockList
+from .backend import INotifyCollectionChanged, NotifyCollectionChangedAction, NotifyCollectionChangedEventArgs, is_headless
+from .dispatcher import raise_event
+from .event import *
+
+
+class _ItemState(object):
+    '''Tracks an item of the source list: how often it occurs there, and whether it passed the filter and with which key.
+For unsorted views, blocks maps the Blocks of _SourcePositions that contain the item to the number of occurrences in each.'''
+    __slots__ = ('item', 'count', 'included', 'key', 'blocks')
+    
+    def __init__(self, item, included, key):
+        self.item = item
+        self.count = 0
+        self.included = included
+        self.key = key
+        self.blocks = None
+    #
+#
+
+class _SourcePositions(BlockList):
+    '''Maps positions in the source list of an unsorted view to positions in the view. Each source position holds the state
+of the item at that position, weighted by whether it was included in the view, so the view index of a source position is the
+total weight before it. Item states know which blocks their item occurs in, so the occurrences of an item are found without
+scanning the whole source list.'''
+    
+    def __init__(self, states):
+        super(_SourcePositions, self).__init__(states, [state.included for state in states])
+    #
+    
+    def view_index(self, position):
+        '''Returns the number of included positions before the given source position.'''
+        return self.weight_before(position)
+    #
+    
+    def insert(self, position, states):
+        '''Inserts the given item states at the given source position. Returns the view index of that position.'''
+        view_index = self.view_index(position)
+        super(_SourcePositions, self).insert(position, states, [state.included for state in states])
+        return view_index
+    #
+    
+    def remove(self, position, count):
+        '''Removes count source positions. Returns the view index of the given position, and the included flags of the removed positions.'''
+        view_index = self.view_index(position)
+        return view_index, super(_SourcePositions, self).remove(position, count)
+    #
+    
+    def update_flags(self, state):
+        '''Sets the included flags of all occurrences of the given item to state.included. Yields the view index of each
+occurrence, in source order, right after its flag has been changed.'''
+        for block in sorted(state.blocks, key = lambda block: block.position):
+            block_start = self.block_weight_start(block)
+            for offset, other in enumerate(block.values):
+                if other is state and block.weights[offset] != state.included:
+                    self.set_weight(block, offset, state.included)
+                    yield block_start + sum(block.weights[:offset])
+    #
+    
+    
+    def _add_locations(self, states, block):
+        for state in states:
+            if state.blocks is None:
+                state.blocks = {}
+            state.blocks[block] = state.blocks.get(block, 0) + 1
+    #
+    
+    def _remove_locations(self, states, block):
+        for state in states:
+            count = state.blocks[block] - 1
+            if count:
+                state.blocks[block] = count
+            else:
+                del state.blocks[block]
+    #
+#
+
+
+class LiveView(INotifyCollectionChanged):
+    '''A read-only view of an ObservableList that only contains the items that pass the given filter function, sorted by
+the given key function, or in source order if no key is given. The view is updated incrementally when the source list
+changes, and raises Add, Remove and Move notifications for the affected items only.
+
+When an item (such as a ViewModel) raises PropertyChanged for one of the properties in depends_on, only that item is
+filtered and sorted again. If depends_on is None, any property change causes this. Items with equal keys keep the order
+in which they were added. Call detach when the view is no longer needed, to stop listening to the source and its items.'''
+    
+    CollectionChanged = event('CollectionChanged')
+    
+    # Adding or removing more than this number of items at once raises a Reset notification instead,
+    # because WPF's collection views do not support notifications for multiple items (see ObservableList.reset_threshold):
+    reset_threshold = None if is_headless else 1
+    
+    def __init__(self, source, filter = None, key = None, depends_on = None):
+        super(LiveView, self).__init__()
+        
+        self.source = source
+        self.filter = filter
+        self.key = key
+        self.depends_on = [depends_on] if isinstance(depends_on, str) else depends_on
+        
+        # The items of the view, and for sorted views, their keys, in the same order:
+        self._items = []
+        self._keys = []
+        # For unsorted views, which positions of the source list are included in the view:
+        self._positions = None
+        # Maps the ids of all distinct source items to their _ItemState:
+        self._states = {}
+        
+        self._rebuild()
+        self.source.CollectionChanged += self._on_source_changed
+    #
+    
+    def detach(self):
+        '''Stops listening to changes of the source list and its items.'''
+        self.source.CollectionChanged -= self._on_source_changed
+        for state in self._states.values():
+            self._unsubscribe(state.item)
+        self._states = {}
+    #
+    
+    def refresh(self):
+        '''Filters and sorts all items again, for example after the filter or key function has been replaced.'''
+        for state in self._states.values():
+            self._unsubscribe(state.item)
+        self._rebuild()
+        self.OnCollectionChanged(NotifyCollectionChangedAction.Reset)
+    #
+    
+    def add_CollectionChanged(self, value):
+        self.CollectionChanged += value
+    #
+    
+    def remove_CollectionChanged(self, value):
+        self.CollectionChanged -= value
+    #
+    
+    def OnCollectionChanged(self, action, added_index = None, added_items = None, removed_index = None, removed_items = None):
+        if action == NotifyCollectionChangedAction.Reset:
+            raise_event(self.CollectionChanged, self, NotifyCollectionChangedEventArgs(action))
+        elif action == NotifyCollectionChangedAction.Add:
+            raise_event(self.CollectionChanged, self, NotifyCollectionChangedEventArgs(action, added_items, added_index))
+        elif action == NotifyCollectionChangedAction.Remove:
+            raise_event(self.CollectionChanged, self, NotifyCollectionChangedEventArgs(action, removed_items, removed_index))
+        elif action == NotifyCollectionChangedAction.Move:
+            raise_event(self.CollectionChanged, self, NotifyCollectionChangedEventArgs(action, added_items, added_index, removed_index))
+    #
+    
+    
+    # Read-only list methods:
+    def __len__(self):
+        return len(self._items)
+    #
+    
+    def __getitem__(self, index):
+        return self._items[index]
+    #
+    
+    def __iter__(self):
+        return iter(self._items)
+    #
+    
+    def __contains__(self, item):
+        state = self._states.get(id(item))
+        return state is not None and state.included
+    #
+    
+    def index(self, item):
+        if self.key is not None:
+            state = self._states.get(id(item))
+            if state is not None and state.included:
+                return self._find(item, state.key)
+        return self._items.index(item)
+    #
+    
+    
+    def _rebuild(self):
+        self._items = []
+        self._keys = []
+        self._states = {}
+        
+        states = []
+        for item in self.source:
+            state = self._add_state(item)
+            states.append(state)
+            if state.included:
+                self._items.append(item)
+                if self.key is not None:
+                    self._keys.append(state.key)
+        
+        if self.key is None:
+            self._positions = _SourcePositions(states)
+        else:
+            # A stable sort keeps items with equal keys in source order:
+            order = sorted(range(len(self._items)), key = self._keys.__getitem__)
+            self._items = [self._items[index] for index in order]
+            self._keys = [self._keys[index] for index in order]
+    #
+    
+    def _on_source_changed(self, sender, args):
+        action = args.Action
+        if action == NotifyCollectionChangedAction.Add:
+            self._on_source_items_added(args.NewStartingIndex, list(args.NewItems))
+        elif action == NotifyCollectionChangedAction.Remove:
+            self._on_source_items_removed(args.OldStartingIndex, list(args.OldItems))
+        elif action == NotifyCollectionChangedAction.Replace:
+            self._on_source_items_removed(args.OldStartingIndex, list(args.OldItems))
+            self._on_source_items_added(args.NewStartingIndex, list(args.NewItems))
+        elif action == NotifyCollectionChangedAction.Move:
+            self._on_source_item_moved(args.OldStartingIndex, args.NewStartingIndex)
+        else:
+            self.refresh()
+    #
+    
+    def _on_source_items_added(self, index, items):
+        states = [self._add_state(item) for item in items]
+        if self.key is not None:
+            for state in states:
+                if state.included:
+                    self._insert_sorted(state.item, state.key)
+            return
+        
+        # In an unsorted view, items that are added together are also adjacent in the view:
+        view_index = self._positions.insert(index, states)
+        added_items = [state.item for state in states if state.included]
+        if added_items:
+            self._items[view_index:view_index] = added_items
+            self._on_range_changed(NotifyCollectionChangedAction.Add, view_index, added_items)
+    #
+    
+    def _on_source_items_removed(self, index, items):
+        states = [self._remove_state(item) for item in items]
+        if self.key is not None:
+            for state in states:
+                if state.included:
+                    self._remove_sorted(state.item, state.key)
+            return
+        
+        view_index, removed_flags = self._positions.remove(index, len(items))
+        removed_count = sum(removed_flags)
+        if removed_count:
+            removed_items = self._items[view_index:view_index + removed_count]
+            del self._items[view_index:view_index + removed_count]
+            self._on_range_changed(NotifyCollectionChangedAction.Remove, view_index, removed_items)
+    #
+    
+    def _on_source_item_moved(self, old_index, new_index):
+        # The order of the source list does not matter for sorted views:
+        if self.key is not None:
+            return
+        
+        old_view_index, (included,) = self._positions.remove(old_index, 1)
+        new_view_index = self._positions.insert(new_index, [self._states[id(self.source[new_index])]])
+        if included:
+            if old_view_index != new_view_index:
+                item = self._items.pop(old_view_index)
+                self._items.insert(new_view_index, item)
+                self.OnCollectionChanged(NotifyCollectionChangedAction.Move, added_index = new_view_index, added_items = [item], removed_index = old_view_index)
+    #
+    
+    def _on_item_property_changed(self, sender, args):
+        # An empty property name means that all properties have changed:
+        if self.depends_on is not None and args.PropertyName and args.PropertyName not in self.depends_on:
+            return
+        
+        state = self._states.get(id(sender))
+        if state is None or state.item is not sender:
+            return
+        
+        was_included, old_key = state.included, state.key
+        state.included = self._passes_filter(sender)
+        state.key = self.key(sender) if self.key is not None and state.included else None
+        
+        if self.key is not None:
+            self._update_sorted(state, was_included, old_key)
+        elif was_included != state.included:
+            self._update_unsorted(state)
+    #
+    
+    def _update_sorted(self, state, was_included, old_key):
+        item = state.item
+        for _ in range(state.count):
+            if was_included and state.included:
+                if old_key == state.key:
+                    return
+                old_index = self._find(item, old_key)
+                del self._items[old_index]
+                del self._keys[old_index]
+                new_index = bisect.bisect_right(self._keys, state.key)
+                self._items.insert(new_index, item)
+                self._keys.insert(new_index, state.key)
+                if old_index != new_index:
+                    self.OnCollectionChanged(NotifyCollectionChangedAction.Move, added_index = new_index, added_items = [item], removed_index = old_index)
+            elif was_included:
+                self._remove_sorted(item, old_key)
+            elif state.included:
+                self._insert_sorted(item, state.key)
+    #
+    
+    def _update_unsorted(self, state):
+        # Every occurrence of the item in the source list is added to or removed from the view:
+        item = state.item
+        for view_index in self._positions.update_flags(state):
+            if state.included:
+                self._items.insert(view_index, item)
+                self.OnCollectionChanged(NotifyCollectionChangedAction.Add, added_index = view_index, added_items = [item])
+            else:
+                del self._items[view_index]
+                self.OnCollectionChanged(NotifyCollectionChangedAction.Remove, removed_index = view_index, removed_items = [item])
+    #
+    
+    
+    def _insert_sorted(self, item, key):
+        index = bisect.bisect_right(self._keys, key)
+        self._items.insert(index, item)
+        self._keys.insert(index, key)
+        self.OnCollectionChanged(NotifyCollectionChangedAction.Add, added_index = index, added_items = [item])
+    #
+    
+    def _remove_sorted(self, item, key):
+        index = self._find(item, key)
+        del self._items[index]
+        del self._keys[index]
+        self.OnCollectionChanged(NotifyCollectionChangedAction.Remove, removed_index = index, removed_items = [item])
+    #
+    
+    def _find(self, item, key):
+        '''Returns the index of the given item in a sorted view, by searching the items with the given key.'''
+        index = bisect.bisect_left(self._keys, key)
+        while self._items[index] is not item:
+            index += 1
+        return index
+    #
+    
+    def _on_range_changed(self, action, index, items):
+        if self.reset_threshold is not None and len(items) > self.reset_threshold:
+            self.OnCollectionChanged(NotifyCollectionChangedAction.Reset)
+        elif action == NotifyCollectionChangedAction.Add:
+            self.OnCollectionChanged(action, added_index = index, added_items = items)
+        else:
+            self.OnCollectionChanged(action, removed_index = index, removed_items = items)
+    #
+    
+    def _passes_filter(self, item):
+        return self.filter is None or bool(self.filter(item))
+    #
+    
+    def _add_state(self, item):
+        state = self._states.get(id(item))
+        if state is None:
+            included = self._passes_filter(item)
+            state = self._states[id(item)] = _ItemState(item, included, self.key(item) if self.key is not None and included else None)
+            self._subscribe(item)
+        state.count += 1
+        return state
+    #
+    
+    def _remove_state(self, item):
+        state = self._states[id(item)]
+        state.count -= 1
+        if state.count == 0:
+            del self._states[id(item)]
+            self._unsubscribe(item)
+        return state
+    #
+    
+    def _subscribe(self, item):
+        if isinstance(getattr(item, 'PropertyChanged', None), Event):
+            item.PropertyChanged += self._on_item_property_changed
+    #
+    
+    def _unsubscribe(self, item):
+        if isinstance(getattr(item, 'PropertyChanged', None), Event):
+            item.PropertyChanged -= self._on_item_property_changed
+    #
+#
@@ -0,0 +1,115 @@
+from .backend import EventArgs
+from .collection_list_view import CollectionListView
+from .dispatcher import raise_event
+from .event import *
+
+
+class CollectionDeltaEventArgs(EventArgs):
+    '''Describes a change of an ObservableDict or ObservableSet. For dictionaries, added and removed map keys to values,
+and replaced maps keys to (old value, new value) tuples. For sets, added and removed are frozensets of items,
+and replaced is empty.'''
+    
+    def __init__(self, added = None, removed = None, replaced = None):
+        super(CollectionDeltaEventArgs, self).__init__()
+        
+        self.added = added if added is not None else {}
+        self.removed = removed if removed is not None else {}
+        self.replaced = replaced if replaced is not None else {}
+    #
+    
+    def __repr__(self):
+        return 'CollectionDeltaEventArgs(added = {0!r}, removed = {1!r}, replaced = {2!r})'.format(self.added, self.removed, self.replaced)
+    #
+#
+
+
+# Marks the absence of a value:
+_missing = object()
+
+
+class ObservableDict(dict):
+    '''This is a standard dictionary that supports change notifications. Every change raises a single Changed event,
+with CollectionDeltaEventArgs that describe which items were added, removed or replaced. Bulk operations such as
+update and clear also raise a single event. Assigning a value to a key that already refers to that same value
+does not raise an event. Use as_list to present the values as a list, for binding.'''
+    
+    Changed = event('Changed')
+    
+    def OnChanged(self, added = None, removed = None, replaced = None):
+        raise_event(self.Changed, self, CollectionDeltaEventArgs(added, removed, replaced))
+    #
+    
+    def as_list(self):
+        '''Returns a read-only list of the values of this dictionary, that raises CollectionChanged notifications.'''
+        return CollectionListView(self)
+    #
+    
+    
+    # ObservableDict methods that alter the ObservableDict:
+    def __setitem__(self, key, value):
+        old_value = self.get(key, _missing)
+        super(ObservableDict, self).__setitem__(key, value)
+        if old_value is _missing:
+            self.OnChanged(added = {key: value})
+        elif old_value is not value:
+            self.OnChanged(replaced = {key: (old_value, value)})
+    #
+    
+    def __delitem__(self, key):
+        # If the key doesn't exist, an exception is raised and no notification is raised:
+        value = self[key]
+        super(ObservableDict, self).__delitem__(key)
+        self.OnChanged(removed = {key: value})
+    #
+    
+    def pop(self, key, *default):
+        if key not in self:
+            return super(ObservableDict, self).pop(key, *default)
+        
+        value = super(ObservableDict, self).pop(key)
+        self.OnChanged(removed = {key: value})
+        return value
+    #
+    
+    def popitem(self):
+        key, value = super(ObservableDict, self).popitem()
+        self.OnChanged(removed = {key: value})
+        return key, value
+    #
+    
+    def setdefault(self, key, default = None):
+        if key in self:
+            return self[key]
+        
+        self[key] = default
+        return default
+    #
+    
+    def update(self, *args, **kwargs):
+        items = dict(*args, **kwargs)
+        added = {}
+        replaced = {}
+        for key, value in items.items():
+            old_value = self.get(key, _missing)
+            if old_value is _missing:
+                added[key] = value
+            elif old_value is not value:
+                replaced[key] = (old_value, value)
+        
+        super(ObservableDict, self).update(items)
+        if added or replaced:
+            self.OnChanged(added = added, replaced = replaced)
+    #
+    
+    def __ior__(self, other):
+        self.update(other)
+        return self
+    #
+    
+    def clear(self):
+        removed = dict(self)
+        super(ObservableDict, self).clear()
+        if removed:
+            self.OnChanged(removed = removed)
+    #
+#
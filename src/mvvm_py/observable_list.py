@@ -1,6 +1,117 @@
-from event import *
+import bisect
+from ._blocks import BlockList, FenwickTree
+from .backend import INotifyCollectionChanged, NotifyCollectionChangedAction, NotifyCollectionChangedEventArgs, is_headless
+from .compat import cmp_key
+from .dispatcher import raise_event
+from .event import *
 
-from System.Collections.Specialized import *
+
+def _longest_increasing_subsequence(sequence):
+    '''Returns the set of values that form a longest strictly increasing subsequence of the given sequence.'''
+    tail_values = []
+    tail_indexes = []
+    predecessors = [None] * len(sequence)
+    for index, value in enumerate(sequence):
+        length = bisect.bisect_left(tail_values, value)
+        predecessors[index] = tail_indexes[length - 1] if length > 0 else None
+        if length == len(tail_values):
+            tail_values.append(value)
+            tail_indexes.append(index)
+        else:
+            tail_values[length] = value
+            tail_indexes[length] = index
+    
+    result = set()
+    index = tail_indexes[-1] if tail_indexes else None
+    while index is not None:
+        result.add(sequence[index])
+        index = predecessors[index]
+    return result
+#
+
+def _is_hashable(item):
+    try:
+        hash(item)
+        return True
+    except TypeError:
+        return False
+#
+
+class _ItemIndex(BlockList):
+    '''Keeps track of how often each hashable item occurs in a list, and in which blocks it occurs. Items only know which
+blocks they are in, so the index of an item is found by searching only the first block that contains it.
+Unhashable items are counted in the block sizes only, and are looked up linearly.'''
+    
+    def __init__(self, items):
+        self.reset(items)
+    #
+    
+    def reset(self, items):
+        self.counts = {}
+        self._locations = {}
+        super(_ItemIndex, self).reset(items)
+    #
+    
+    def first_index(self, item):
+        '''Returns the index of the first occurrence of the given hashable item, which must be part of the list.'''
+        blocks = self._locations[item]
+        if len(blocks) == 1:
+            block = next(iter(blocks))
+        else:
+            block = min(blocks, key = lambda block: block.position)
+        return self.block_start(block) + block.values.index(item)
+    #
+    
+    def update(self, items, action, added_index, added_items, removed_index, removed_items):
+        if action == NotifyCollectionChangedAction.Reset:
+            self.reset(items)
+            return
+        
+        if action == NotifyCollectionChangedAction.Move:
+            self.remove(removed_index, len(added_items))
+            self.insert(added_index, added_items)
+            return
+        
+        if removed_items:
+            self.remove(removed_index, len(removed_items))
+        if added_items:
+            self.insert(added_index, added_items)
+    #
+    
+    
+    def _add_locations(self, items, block):
+        counts, locations = self.counts, self._locations
+        for item in items:
+            try:
+                blocks = locations.get(item)
+            except TypeError:
+                continue
+            if blocks is None:
+                blocks = locations[item] = {}
+            blocks[block] = blocks.get(block, 0) + 1
+            counts[item] = counts.get(item, 0) + 1
+    #
+    
+    def _remove_locations(self, items, block):
+        counts, locations = self.counts, self._locations
+        for item in items:
+            try:
+                blocks = locations.get(item)
+            except TypeError:
+                continue
+            count = blocks[block] - 1
+            if count:
+                blocks[block] = count
+            else:
+                del blocks[block]
+            count = counts[item] - 1
+            if count:
+                counts[item] = count
+            else:
+                del counts[item]
+                del locations[item]
+    #
+#
 
 
 class ObservableList(list, INotifyCollectionChanged):
@@ -8,11 +119,36 @@ class ObservableList(list, INotifyCollectionChanged):
     
     CollectionChanged = event('CollectionChanged')
     
-    def __init__(self, iterable = None):
+    # Adding, removing or replacing more than this number of items at once raises a single Reset notification instead of
+    # a notification with all the affected items. None means that there is no such limit. WPF's collection views do not
+    # support notifications for multiple items, so there any change to multiple items raises a Reset:
+    reset_threshold = None if is_headless else 1
+    
+    # A single notification makes a view do far more work than re-reading one item after a Reset, so reconcile raises a Reset
+    # when it would take more edits than this fraction of the new number of items. Up to reconcile_min_edits edits are always
+    # applied, because a Reset also discards view state such as the selection:
+    reconcile_edit_ratio = 0.125
+    reconcile_min_edits = 16
+    
+    # Only indexed lists have an item index:
+    _item_index = None
+    
+    # The ChangeJournal that records changes to this list, if any:
+    _journal = None
+    
+    def __init__(self, iterable = None, indexed = False, reset_threshold = 'default'):
+        '''Indexed lists maintain an index of their hashable items, which makes index, count, remove and the in operator
+roughly constant-time, at the cost of some memory. Unhashable items are allowed, but are looked up linearly.
+reset_threshold overrides the class-wide reset_threshold for this list.'''
         if iterable is not None:
             super(ObservableList, self).__init__(iterable)
         else:
             super(ObservableList, self).__init__()
+        
+        if reset_threshold != 'default':
+            self.reset_threshold = reset_threshold
+        if indexed:
+            self._item_index = _ItemIndex(self)
     #
     
     def add_CollectionChanged(self, value):
@@ -24,15 +160,55 @@ class ObservableList(list, INotifyCollectionChanged):
     #
     
     def OnCollectionChanged(self, action, added_index = None, added_items = None, removed_index = None, removed_items = None):
+        # Every change is reported here, so this is also where the item index is kept up to date:
+        if self._item_index is not None:
+            self._item_index.update(self, action, added_index, added_items, removed_index, removed_items)
+        if self._journal is not None:
+            self._record_change(action, added_index, added_items, removed_index, removed_items)
+        
         if action == NotifyCollectionChangedAction.Reset:
-            self.CollectionChanged(self, NotifyCollectionChangedEventArgs(action))
+            raise_event(self.CollectionChanged, self, NotifyCollectionChangedEventArgs(action))
         elif action == NotifyCollectionChangedAction.Add:
-            self.CollectionChanged(self, NotifyCollectionChangedEventArgs(action, added_items, added_index))
+            raise_event(self.CollectionChanged, self, NotifyCollectionChangedEventArgs(action, added_items, added_index))
         elif action == NotifyCollectionChangedAction.Remove:
-            self.CollectionChanged(self, NotifyCollectionChangedEventArgs(action, removed_items, removed_index))
+            raise_event(self.CollectionChanged, self, NotifyCollectionChangedEventArgs(action, removed_items, removed_index))
         elif action == NotifyCollectionChangedAction.Replace:
-            self.CollectionChanged(self, NotifyCollectionChangedEventArgs(action, removed_items, added_items, added_index))
-        # Move action is not used
+            raise_event(self.CollectionChanged, self, NotifyCollectionChangedEventArgs(action, added_items, removed_items, added_index))
+        elif action == NotifyCollectionChangedAction.Move:
+            raise_event(self.CollectionChanged, self, NotifyCollectionChangedEventArgs(action, added_items, added_index, removed_index))
+    #
+    
+    
+    # Lookups, which use the item index if available:
+    def index(self, item, start = 0, stop = None):
+        if self._item_index is not None and _is_hashable(item):
+            start, stop, _ = slice(start, stop).indices(len(self))
+            if item not in self._item_index.counts:
+                raise ValueError('{!r} is not in list'.format(item))
+            
+            index = self._item_index.first_index(item)
+            if index >= stop:
+                raise ValueError('{!r} is not in list'.format(item))
+            elif index >= start:
+                return index
+            # Later occurrences are not indexed:
+            return super(ObservableList, self).index(item, start, stop)
+        
+        if stop is None:
+            return super(ObservableList, self).index(item, start)
+        return super(ObservableList, self).index(item, start, stop)
+    #
+    
+    def count(self, item):
+        if self._item_index is not None and _is_hashable(item):
+            return self._item_index.counts.get(item, 0)
+        return super(ObservableList, self).count(item)
+    #
+    
+    def __contains__(self, item):
+        if self._item_index is not None and _is_hashable(item):
+            return item in self._item_index.counts
+        return super(ObservableList, self).__contains__(item)
     #
     
     
@@ -45,84 +221,356 @@ class ObservableList(list, INotifyCollectionChanged):
     #
     
     def extend(self, iterable):
-        index = len(self)
-        result = super(ObservableList, self).extend(iterable)
-        self.OnCollectionChanged(NotifyCollectionChangedAction.Add, added_index = index, added_items = iterable)
-        return result
+        self.add_range(iterable)
     #
     
     def insert(self, index, obj):
+        index = self._clamp_index(index)
         result = super(ObservableList, self).insert(index, obj)
         self.OnCollectionChanged(NotifyCollectionChangedAction.Add, added_index = index, added_items = [obj])
         return result
     #
     
-    def pop(self, index = None):
+    def pop(self, index = -1):
+        if index < 0:
+            index += len(self)
         result = super(ObservableList, self).pop(index)
-        self.OnCollectionChanged(NotifyCollectionChangedAction.Remove, removed_index = index if index is not None else 0, removed_items = [item])
+        self.OnCollectionChanged(NotifyCollectionChangedAction.Remove, removed_index = index, removed_items = [result])
         return result
     #
     
     def remove(self, item):
         # If the list doesn't contain the value, an exception is raised and the collection change notification is never called.
         index = self.index(item)
-        result = super(ObservableList, self).remove(item)
-        self.OnCollectionChanged(NotifyCollectionChangedAction.Remove, removed_index = index, removed_items = [item])
-        return result
+        removed_item = self[index]
+        super(ObservableList, self).__delitem__(index)
+        self.OnCollectionChanged(NotifyCollectionChangedAction.Remove, removed_index = index, removed_items = [removed_item])
     #
     
     def reverse(self):
+        old_items = self._get_journal_snapshot()
         result = super(ObservableList, self).reverse()
+        self._record_reset(old_items)
         self.OnCollectionChanged(NotifyCollectionChangedAction.Reset)
         return result
     #
     
-    def sort(self, comp = None, key = None, reverse = False):
-        result = super(ObservableList, self).sort(cmp = comp, key = key, reverse = reverse)
+    def sort(self, comp = None, key = None, reverse = False, reconcile = False):
+        '''Sorts the list in-place. By default, this raises a Reset notification. With reconcile set to True,
+Move notifications are raised instead (see reconcile), so views can keep their item containers.'''
+        if reconcile:
+            self.reconcile(sorted(self, key = cmp_key(comp, key), reverse = reverse), key = id)
+            return
+        
+        old_items = self._get_journal_snapshot()
+        result = super(ObservableList, self).sort(key = cmp_key(comp, key), reverse = reverse)
+        self._record_reset(old_items)
         self.OnCollectionChanged(NotifyCollectionChangedAction.Reset)
         return result
     #
     
     def __iadd__(self, iterable):
-        index = len(self)
-        result = super(ObservableList, self).__iadd__(iterable)
-        self.OnCollectionChanged(NotifyCollectionChangedAction.Add, added_index = index, added_items = iterable)
-        return result
+        self.add_range(iterable)
+        return self
     #
     
     def __imul__(self, y):
+        if y <= 0:
+            self.clear()
+            return self
+        
         index = len(self)
         added_items = self * (y - 1)
         result = super(ObservableList, self).__imul__(y)
-        self.OnCollectionChanged(NotifyCollectionChangedAction.Add, added_index = index, added_items = added_items)
+        if added_items:
+            self._on_range_changed(NotifyCollectionChangedAction.Add, index, [], added_items)
         return result
     #
     
+    def clear(self):
+        '''Removes all items. Python 2 lists do not have this method, but ObservableList does.'''
+        self.replace_all([])
+    #
+    
     def __delitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return self._delete_slice(start, max(start, stop))
+            # Extended slices do not remove a contiguous range of items:
+            old_items = self._get_journal_snapshot()
+            result = super(ObservableList, self).__delitem__(index)
+            self._record_reset(old_items)
+            self.OnCollectionChanged(NotifyCollectionChangedAction.Reset)
+            return result
+        
         removed_item = self[index]
+        if index < 0:
+            index += len(self)
         result = super(ObservableList, self).__delitem__(index)
         self.OnCollectionChanged(NotifyCollectionChangedAction.Remove, removed_index = index, removed_items = [removed_item])
         return result
     #
     
     def __delslice__(self, i, j):
-        removed_items = self[i:j]
-        result = super(ObservableList, self).__delslice__(i, j)
-        self.OnCollectionChanged(NotifyCollectionChangedAction.Remove, removed_index = i, removed_items = removed_items)
-        return result
+        # Only called by Python 2, with negative indexes already adjusted:
+        i = max(0, min(i, len(self)))
+        return self._delete_slice(i, max(i, min(j, len(self))))
     #
     
     def __setitem__(self, index, item):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return self._set_slice(start, max(start, stop), item)
+            old_items = self._get_journal_snapshot()
+            result = super(ObservableList, self).__setitem__(index, item)
+            self._record_reset(old_items)
+            self.OnCollectionChanged(NotifyCollectionChangedAction.Reset)
+            return result
+        
         replaced_item = self[index]
+        if index < 0:
+            index += len(self)
         result = super(ObservableList, self).__setitem__(index, item)
         self.OnCollectionChanged(NotifyCollectionChangedAction.Replace, added_index = index, added_items = [item], removed_index = index, removed_items = [replaced_item])
         return result
     #
     
     def __setslice__(self, i, j, iterable):
-        old_items = self[i:j]
-        result = super(ObservableList, self).__setslice__(i, j, iterable)
-        self.OnCollectionChanged(NotifyCollectionChangedAction.Replace, added_index = i, added_items = iterable, removed_index = i, removed_items = [old_items])
+        # Only called by Python 2, with negative indexes already adjusted:
+        i = max(0, min(i, len(self)))
+        return self._set_slice(i, max(i, min(j, len(self))), iterable)
+    #
+    
+    def _delete_slice(self, start, stop):
+        removed_items = self[start:stop]
+        result = super(ObservableList, self).__delitem__(slice(start, stop))
+        self._on_range_changed(NotifyCollectionChangedAction.Remove, start, removed_items, [])
+        return result
+    #
+    
+    def _set_slice(self, start, stop, iterable):
+        old_items = self[start:stop]
+        new_items = list(iterable)
+        result = super(ObservableList, self).__setitem__(slice(start, stop), new_items)
+        self._on_range_changed(NotifyCollectionChangedAction.Replace, start, old_items, new_items)
         return result
     #
+    
+    
+    # Range operations, that raise a single notification for multiple items:
+    def add_range(self, iterable):
+        '''Adds all items to the end of the list.'''
+        self.insert_range(len(self), iterable)
+    #
+    
+    def insert_range(self, index, iterable):
+        '''Inserts all items at the given index.'''
+        items = list(iterable)
+        index = self._clamp_index(index)
+        if not items:
+            return
+        
+        super(ObservableList, self).__setitem__(slice(index, index), items)
+        self._on_range_changed(NotifyCollectionChangedAction.Add, index, [], items)
+    #
+    
+    def remove_range(self, start, count):
+        '''Removes count items, starting at the given index.'''
+        if start < 0 or count < 0 or start + count > len(self):
+            raise IndexError('Range [{0}, {1}) is out of bounds'.format(start, start + count))
+        if count == 0:
+            return
+        
+        removed_items = self[start:start + count]
+        super(ObservableList, self).__delitem__(slice(start, start + count))
+        self._on_range_changed(NotifyCollectionChangedAction.Remove, start, removed_items, [])
+    #
+    
+    def remove_all(self, predicate):
+        '''Removes all items for which the given predicate returns True. Returns the number of removed items.
+If the removed items were not adjacent, a Reset notification is raised.'''
+        removed_indexes = [index for index, item in enumerate(self) if predicate(item)]
+        if not removed_indexes:
+            return 0
+        
+        first, last = removed_indexes[0], removed_indexes[-1]
+        if last - first + 1 == len(removed_indexes):
+            self.remove_range(first, len(removed_indexes))
+        else:
+            removed = set(removed_indexes)
+            old_items = self._get_journal_snapshot()
+            super(ObservableList, self).__setitem__(slice(None), [item for index, item in enumerate(self) if index not in removed])
+            self._record_reset(old_items)
+            self.OnCollectionChanged(NotifyCollectionChangedAction.Reset)
+        return len(removed_indexes)
+    #
+    
+    def replace_all(self, iterable):
+        '''Replaces the contents of the list with the given items.'''
+        items = list(iterable)
+        old_items = self._get_journal_snapshot()
+        super(ObservableList, self).__setitem__(slice(None), items)
+        self._record_reset(old_items)
+        self.OnCollectionChanged(NotifyCollectionChangedAction.Reset)
+    #
+    
+    
+    def move(self, old_index, new_index):
+        '''Moves the item at old_index to new_index.'''
+        if old_index < 0:
+            old_index += len(self)
+        if new_index < 0:
+            new_index += len(self)
+        if not (0 <= old_index < len(self) and 0 <= new_index < len(self)):
+            raise IndexError('list index out of range')
+        if old_index == new_index:
+            return
+        
+        item = super(ObservableList, self).pop(old_index)
+        super(ObservableList, self).insert(new_index, item)
+        self.OnCollectionChanged(NotifyCollectionChangedAction.Move, added_index = new_index, added_items = [item], removed_index = old_index)
+    #
+    
+    
+    def reconcile(self, new_items, key = None):
+        '''Updates the list so that it contains the given items, raising a minimal sequence of Remove, Move, Add and Replace
+notifications. Items are matched by the given key function (or by the items themselves): removed items are removed first,
+then items that are not part of the longest sequence of items whose relative order is unchanged are moved, then new
+items are added, and finally matched items that are not the same object are replaced.
+A single Reset notification is raised instead if that sequence would be too long (see reconcile_edit_ratio),
+or if keys are not unique or not hashable.'''
+        new_items = list(new_items)
+        try:
+            old_keys = [key(item) for item in self] if key is not None else list(self)
+            new_keys = [key(item) for item in new_items] if key is not None else new_items
+            new_positions = dict((item_key, position) for position, item_key in enumerate(new_keys))
+            old_key_set = set(old_keys)
+        except TypeError:
+            self.replace_all(new_items)
+            return
+        if len(new_positions) != len(new_keys) or len(old_key_set) != len(old_keys):
+            self.replace_all(new_items)
+            return
+        
+        removed_indexes = [index for index, item_key in enumerate(old_keys) if item_key not in new_positions]
+        # For every remaining item, in their current order, the position that they should end up at:
+        targets = [new_positions[item_key] for item_key in old_keys if item_key in new_positions]
+        stationary_targets = _longest_increasing_subsequence(targets)
+        added_targets = [position for position, item_key in enumerate(new_keys) if item_key not in old_key_set]
+        replaced_count = sum(1 for index, item_key in enumerate(old_keys) if item_key in new_positions and self[index] is not new_items[new_positions[item_key]])
+        
+        edit_count = len(removed_indexes) + (len(targets) - len(stationary_targets)) + len(added_targets) + replaced_count
+        if edit_count == 0:
+            return
+        elif edit_count > max(self.reconcile_min_edits, len(new_items) * self.reconcile_edit_ratio):
+            self.replace_all(new_items)
+            return
+        
+        if self._journal is not None:
+            # The whole edit sequence is a single undo step:
+            with self._journal.transaction():
+                self._apply_reconcile(new_items, removed_indexes, targets, stationary_targets, added_targets, replaced_count)
+        else:
+            self._apply_reconcile(new_items, removed_indexes, targets, stationary_targets, added_targets, replaced_count)
+    #
+    
+    
+    def _apply_reconcile(self, new_items, removed_indexes, targets, stationary_targets, added_targets, replaced_count):
+        for index in reversed(removed_indexes):
+            item = super(ObservableList, self).pop(index)
+            self.OnCollectionChanged(NotifyCollectionChangedAction.Remove, removed_index = index, removed_items = [item])
+        
+        self._reconcile_moves(targets, stationary_targets)
+        
+        for position in added_targets:
+            super(ObservableList, self).insert(position, new_items[position])
+            self.OnCollectionChanged(NotifyCollectionChangedAction.Add, added_index = position, added_items = [new_items[position]])
+        
+        if replaced_count:
+            for position, new_item in enumerate(new_items):
+                old_item = self[position]
+                if old_item is not new_item:
+                    super(ObservableList, self).__setitem__(position, new_item)
+                    self.OnCollectionChanged(NotifyCollectionChangedAction.Replace, added_index = position, added_items = [new_item], removed_index = position, removed_items = [old_item])
+    #
+    
+    def _reconcile_moves(self, targets, stationary_targets):
+        '''Moves the items that are not part of stationary_targets, in order of their target position, to just after the
+item that precedes them in the target order. Stationary items divide the list into gaps. Within a gap, moved items
+come before items that have not been moved yet, so every item has a sort key for both its original and its moved
+position, and a Fenwick tree over those keys gives the current index of every item in O(log n).'''
+        original_keys = []
+        gap = 0
+        for index, target in enumerate(targets):
+            if target in stationary_targets:
+                original_keys.append((gap, 2, 0))
+                gap += 1
+            else:
+                original_keys.append((gap, 1, index))
+        
+        stationary_sorted = sorted(stationary_targets)
+        moved = sorted((target, index) for index, target in enumerate(targets) if target not in stationary_targets)
+        moved_keys = [(bisect.bisect_left(stationary_sorted, target), 0, target) for target, index in moved]
+        
+        keys = sorted(original_keys + moved_keys)
+        ranks = dict((sort_key, rank) for rank, sort_key in enumerate(keys))
+        present = FenwickTree([1 if sort_key[1] else 0 for sort_key in keys])
+        
+        for (target, index), moved_key in zip(moved, moved_keys):
+            old_rank, new_rank = ranks[original_keys[index]], ranks[moved_key]
+            old_index = present.prefix_sum(old_rank)
+            present.add(old_rank, -1)
+            new_index = present.prefix_sum(new_rank)
+            present.add(new_rank, 1)
+            
+            if old_index != new_index:
+                item = super(ObservableList, self).pop(old_index)
+                super(ObservableList, self).insert(new_index, item)
+                self.OnCollectionChanged(NotifyCollectionChangedAction.Move, added_index = new_index, added_items = [item], removed_index = old_index)
+    #
+    
+    def _clamp_index(self, index):
+        '''Normalizes an insertion index the same way list.insert does.'''
+        if index < 0:
+            index = max(0, index + len(self))
+        return min(index, len(self))
+    #
+    
+    def _on_range_changed(self, action, index, removed_items, added_items):
+        '''Raises an Add, Remove or Replace notification for the given items, or a Reset if too many items are affected.'''
+        if self.reset_threshold is not None and max(len(removed_items), len(added_items)) > self.reset_threshold:
+            # A Reset notification does not tell the journal what changed, so the change is recorded here:
+            if self._journal is not None:
+                self._journal.record_list_change(self, index, removed_items, added_items)
+            self.OnCollectionChanged(NotifyCollectionChangedAction.Reset)
+        elif action == NotifyCollectionChangedAction.Add:
+            self.OnCollectionChanged(action, added_index = index, added_items = added_items)
+        elif action == NotifyCollectionChangedAction.Remove:
+            self.OnCollectionChanged(action, removed_index = index, removed_items = removed_items)
+        else:
+            self.OnCollectionChanged(action, added_index = index, added_items = added_items, removed_index = index, removed_items = removed_items)
+    #
+    
+    def _record_change(self, action, added_index, added_items, removed_index, removed_items):
+        if action == NotifyCollectionChangedAction.Add:
+            self._journal.record_list_change(self, added_index, [], added_items)
+        elif action == NotifyCollectionChangedAction.Remove:
+            self._journal.record_list_change(self, removed_index, removed_items, [])
+        elif action == NotifyCollectionChangedAction.Replace:
+            self._journal.record_list_change(self, added_index, removed_items, added_items)
+        elif action == NotifyCollectionChangedAction.Move:
+            self._journal.record_list_move(self, removed_index, added_index)
+    #
+    
+    def _get_journal_snapshot(self):
+        '''Returns a copy of the items if changes are being recorded, because Reset notifications do not include the old items.'''
+        return list(self) if self._journal is not None else None
+    #
+    
+    def _record_reset(self, old_items):
+        if old_items is not None:
+            self._journal.record_list_change(self, 0, old_items, list(self))
+    #
 #
@@ -0,0 +1,117 @@
+from .collection_list_view import CollectionListView
+from .dispatcher import raise_event
+from .event import *
+from .observable_dict import CollectionDeltaEventArgs
+
+
+class ObservableSet(set):
+    '''This is a standard set that supports change notifications. Every change raises a single Changed event,
+with CollectionDeltaEventArgs that contain the added and removed items. Bulk operations such as update,
+difference_update, clear and the in-place operators also raise a single event. Operations that do not change
+the set do not raise an event. Use as_list to present the items as a list, for binding.'''
+    
+    Changed = event('Changed')
+    
+    def OnChanged(self, added = (), removed = ()):
+        raise_event(self.Changed, self, CollectionDeltaEventArgs(frozenset(added), frozenset(removed)))
+    #
+    
+    def as_list(self):
+        '''Returns a read-only list of the items of this set, that raises CollectionChanged notifications.'''
+        return CollectionListView(self)
+    #
+    
+    
+    # ObservableSet methods that alter the ObservableSet:
+    def add(self, item):
+        if item not in self:
+            super(ObservableSet, self).add(item)
+            self.OnChanged(added = (item,))
+    #
+    
+    def discard(self, item):
+        if item in self:
+            super(ObservableSet, self).discard(item)
+            self.OnChanged(removed = (item,))
+    #
+    
+    def remove(self, item):
+        # If the set doesn't contain the item, an exception is raised and no notification is raised:
+        super(ObservableSet, self).remove(item)
+        self.OnChanged(removed = (item,))
+    #
+    
+    def pop(self):
+        item = super(ObservableSet, self).pop()
+        self.OnChanged(removed = (item,))
+        return item
+    #
+    
+    def clear(self):
+        removed = frozenset(self)
+        super(ObservableSet, self).clear()
+        if removed:
+            self.OnChanged(removed = removed)
+    #
+    
+    def update(self, *iterables):
+        added = set().union(*iterables)
+        added.difference_update(self)
+        if added:
+            super(ObservableSet, self).update(added)
+            self.OnChanged(added = added)
+    #
+    
+    def difference_update(self, *iterables):
+        removed = self.intersection(set().union(*iterables))
+        if removed:
+            super(ObservableSet, self).difference_update(removed)
+            self.OnChanged(removed = removed)
+    #
+    
+    def intersection_update(self, *iterables):
+        removed = self.difference(self.intersection(*iterables))
+        if removed:
+            super(ObservableSet, self).difference_update(removed)
+            self.OnChanged(removed = removed)
+    #
+    
+    def symmetric_difference_update(self, iterable):
+        other = set(iterable)
+        removed = self.intersection(other)
+        added = other.difference(self)
+        if removed or added:
+            super(ObservableSet, self).difference_update(removed)
+            super(ObservableSet, self).update(added)
+            self.OnChanged(added = added, removed = removed)
+    #
+    
+    # Like those of set, the in-place operators only accept sets:
+    def __ior__(self, other):
+        if not isinstance(other, (set, frozenset)):
+            return NotImplemented
+        self.update(other)
+        return self
+    #
+    
+    def __isub__(self, other):
+        if not isinstance(other, (set, frozenset)):
+            return NotImplemented
+        self.difference_update(other)
+        return self
+    #
+    
+    def __iand__(self, other):
+        if not isinstance(other, (set, frozenset)):
+            return NotImplemented
+        self.intersection_update(other)
+        return self
+    #
+    
+    def __ixor__(self, other):
+        if not isinstance(other, (set, frozenset)):
+            return NotImplemented
+        self.symmetric_difference_update(other)
+        return self
+    #
+#
@@ -1,16 +1,26 @@
 import inspect
-import types
-from event import *
+from .backend import EventArgs, ICommand
+from .compat import get_argument_names
+from .dispatcher import raise_event
+from .event import *
 
-from System.Windows.Input import ICommand
-from System import EventArgs
+
+def takes_argument(function, ignored_arguments = (), unbound_method = False):
+    '''Returns True if the given function or (bound) method takes a parameter, apart from the given ignored arguments.
+With unbound_method set to True, a plain function is treated as a method, so its self argument is not counted.'''
+    # Decorated methods (see defer_notifications) expose the original method through __wrapped__:
+    arguments = [argument for argument in get_argument_names(getattr(function, '__wrapped__', function)) if argument not in ignored_arguments]
+    isMethod = inspect.ismethod(function) or unbound_method
+    return (isMethod and len(arguments) == 2) or (not isMethod and len(arguments) == 1)
+#
 
 
 class relay_command(property):
     '''Creates a property that 'holds' a RelayCommand.
-The actual RelayCommand is created on demand.'''
+The actual RelayCommand is created on demand. With cache_can_execute set to True, the command remembers the
+result of its can-execute method until CanExecuteChanged is raised, for example because a property in depends_on changed.'''
     
-    def __init__(self, execute, can_execute = None, depends_on = None):
+    def __init__(self, execute, can_execute = None, depends_on = None, cache_can_execute = False):
         # The name and backing field are determined by ViewModelMetaClass:
         self.name = ''
         self.backing_field = '_'
@@ -21,40 +31,69 @@ The actual RelayCommand is created on demand.'''
         if isinstance(self._depends_on, str):
             self._depends_on = [self._depends_on]
         
+        self._execute = execute
+        self._can_execute = can_execute
+        self.cache_can_execute = cache_can_execute
+        
+        # Whether the execute method takes a parameter only needs to be determined once, not for every view model:
+        self._takes_argument = takes_argument(execute, unbound_method = True)
+        
         # Commands are read-only, and only create a RelayCommand if an instance doesn't have that command yet:
         def getter(slf):
             try:
                 return getattr(slf, self.backing_field)
             except:
-                setattr(slf, self.backing_field, RelayCommand(types.MethodType(execute, slf, type(slf)), types.MethodType(can_execute, slf, type(slf)) if can_execute is not None else None))
+                setattr(slf, self.backing_field, self._create_command(slf))
                 return getattr(slf, self.backing_field)
         
         super(relay_command, self).__init__(getter)
     #
+    
+    def _create_command(self, slf):
+        return _ViewModelRelayCommand(slf, self._execute, self._can_execute, self._takes_argument, self.cache_can_execute, self.name)
+    #
 #
 
+# Marks the absence of a cached CanExecute result:
+_no_result = object()
+
+
 class RelayCommand(ICommand):
+    '''A command that calls the given execute and can-execute functions. With cacheCanExecute set to True,
+the result of CanExecute is remembered (for the last parameter) until CanExecuteChanged is raised.
+The optional name is used by instrumentation.'''
+    
+    __slots__ = ('name', '_execute', '_canExecute', '_takesArgument', '_cacheCanExecute', '_cachedParameter', '_cachedResult',
+                 '_CanExecuteChanged', '__weakref__')
     
     CanExecuteChanged = event('CanExecuteChanged')
     
-    def __init__(self, execute, canExecute = None):
+    def __init__(self, execute, canExecute = None, cacheCanExecute = False, takesArgument = None, name = None):
         super(RelayCommand, self).__init__()
         
+        self.name = name
         self._execute = execute
         self._canExecute = canExecute
         
-        argumentsCount = len(inspect.getargspec(self._execute).args)
-        isBoundMethod = inspect.ismethod(self._execute)
-        self._takesArgument = (isBoundMethod and argumentsCount == 2) or (not isBoundMethod and argumentsCount == 1)
+        self._takesArgument = takes_argument(self._execute) if takesArgument is None else takesArgument
+        
+        self._cacheCanExecute = cacheCanExecute
+        self._cachedParameter = None
+        self._cachedResult = _no_result
     #
     
     def CanExecute(self, parameter):
         if self._canExecute is None:
             return True
-        elif self._takesArgument:
-            return self._canExecute(parameter)
-        else:
-            return self._canExecute()
+        elif not self._cacheCanExecute:
+            return self._call_can_execute(parameter)
+        elif self._cachedResult is not _no_result and self._cachedParameter is parameter:
+            return self._cachedResult
+        
+        result = self._call_can_execute(parameter)
+        self._cachedParameter = parameter
+        self._cachedResult = result
+        return result
     #
     
     def Execute(self, parameter):
@@ -74,6 +113,45 @@ class RelayCommand(ICommand):
     #
     
     def OnCanExecuteChanged(self):
-        self.CanExecuteChanged(self, EventArgs.Empty)
+        # Whatever CanExecute depends on has changed, so a cached result can no longer be used:
+        self._cachedParameter = None
+        self._cachedResult = _no_result
+        raise_event(self.CanExecuteChanged, self, EventArgs.Empty, (id(self), 'CanExecuteChanged'))
     #
-#
\ No newline at end of file
+    
+    
+    def _call_can_execute(self, parameter):
+        if self._takesArgument:
+            return self._canExecute(parameter)
+        else:
+            return self._canExecute()
+    #
+#
+
+class _ViewModelRelayCommand(RelayCommand):
+    '''The command of a relay_command property. Instead of creating bound methods for every view model,
+it calls the functions of the relay_command with the view model that owns the command.'''
+    
+    __slots__ = ('_owner',)
+    
+    def __init__(self, owner, execute, canExecute, takesArgument, cacheCanExecute, name):
+        super(_ViewModelRelayCommand, self).__init__(execute, canExecute, cacheCanExecute, takesArgument, name)
+        
+        self._owner = owner
+    #
+    
+    def Execute(self, parameter):
+        if self._takesArgument:
+            self._execute(self._owner, parameter)
+        else:
+            self._execute(self._owner)
+    #
+    
+    
+    def _call_can_execute(self, parameter):
+        if self._takesArgument:
+            return self._canExecute(self._owner, parameter)
+        else:
+            return self._canExecute(self._owner)
+    #
+#
@@ -0,0 +1,153 @@
+'''Timer sources schedule the notifications of throttled and debounced bindable properties. A timer source is any object
+with these members:
+
+- now(): returns the current time, in seconds
+- call_later(delay, function): calls the function after delay seconds, and returns a timer with a cancel method
+- requires_target_thread (optional): True if functions are called on another thread. Such a timer source can only
+  be used with a dispatcher that has a target thread (such as QueuedDispatcher), which it must call back through.'''
+import heapq
+import itertools
+import logging
+import threading
+from .compat import perf_counter
+from .dispatcher import get_dispatcher
+
+_logger = logging.getLogger(__name__)
+
+
+class _Timer(object):
+    __slots__ = ('function', 'cancelled')
+    
+    def __init__(self, function):
+        self.function = function
+        self.cancelled = False
+    #
+    
+    def cancel(self):
+        self.cancelled = True
+    #
+#
+
+
+class ThreadingTimerSource(object):
+    '''Waits on a single background thread, which is started on first use, and calls scheduled functions through the
+current dispatcher's invoke method. This requires a dispatcher with a target thread, such as a QueuedDispatcher.'''
+    
+    requires_target_thread = True
+    
+    def __init__(self):
+        super(ThreadingTimerSource, self).__init__()
+        
+        # A heap of (due time, sequence number, timer) tuples. Cancelled timers are discarded when they are due:
+        self._timers = []
+        self._ids = itertools.count()
+        self._condition = threading.Condition(threading.Lock())
+        self._thread = None
+    #
+    
+    def now(self):
+        return perf_counter()
+    #
+    
+    def call_later(self, delay, function):
+        timer = _Timer(function)
+        with self._condition:
+            heapq.heappush(self._timers, (self.now() + delay, next(self._ids), timer))
+            if self._thread is None:
+                self._thread = threading.Thread(target = self._run, name = 'mvvm_py timers')
+                self._thread.daemon = True
+                self._thread.start()
+            self._condition.notify()
+        return timer
+    #
+    
+    
+    def _run(self):
+        while True:
+            timer = self._wait_for_timer()
+            if timer.cancelled:
+                continue
+            
+            try:
+                get_dispatcher().invoke(timer.function)
+            except Exception:
+                _logger.exception('Unhandled exception in a timer callback')
+    #
+    
+    def _wait_for_timer(self):
+        with self._condition:
+            while True:
+                if not self._timers:
+                    self._condition.wait()
+                    continue
+                
+                remaining_time = self._timers[0][0] - self.now()
+                if remaining_time <= 0:
+                    return heapq.heappop(self._timers)[2]
+                self._condition.wait(remaining_time)
+    #
+#
+
+class FakeTimerSource(object):
+    '''A timer source with a manually controlled clock, for tests. Scheduled functions are only called by advance,
+on the calling thread, in the order in which they are due.'''
+    
+    requires_target_thread = False
+    
+    def __init__(self, time = 0.0):
+        super(FakeTimerSource, self).__init__()
+        
+        self.time = time
+        
+        # A heap of (due time, sequence number, timer) tuples. The sequence number keeps timers with the same due time in order:
+        self._timers = []
+        self._ids = itertools.count()
+    #
+    
+    @property
+    def pending_count(self):
+        return sum(1 for _, _, timer in self._timers if not timer.cancelled)
+    #
+    
+    def now(self):
+        return self.time
+    #
+    
+    def call_later(self, delay, function):
+        timer = _Timer(function)
+        heapq.heappush(self._timers, (self.time + delay, next(self._ids), timer))
+        return timer
+    #
+    
+    def advance(self, seconds):
+        '''Moves the clock forward, calling all functions that become due, including functions that are scheduled by them.'''
+        end_time = self.time + seconds
+        while self._timers and self._timers[0][0] <= end_time:
+            due_time, _, timer = heapq.heappop(self._timers)
+            self.time = max(self.time, due_time)
+            if not timer.cancelled:
+                timer.function()
+        self.time = end_time
+    #
+#
+
+
+_timer_source = ThreadingTimerSource()
+
+def get_timer_source():
+    return _timer_source
+#
+
+def set_timer_source(timer_source):
+    '''Sets the timer source that is used by all throttled and debounced bindable properties.'''
+    global _timer_source
+    _timer_source = timer_source if timer_source is not None else ThreadingTimerSource()
+#
+
+def check_timer_source():
+    '''Raises a RuntimeError if the current timer source calls back on another thread, while the current dispatcher
+would call functions on that thread instead of passing them on to its target thread.'''
+    if getattr(_timer_source, 'requires_target_thread', False) and not getattr(get_dispatcher(), 'has_target_thread', False):
+        raise RuntimeError('{0} calls back on a background thread, which requires a dispatcher with a target thread, '
+                           'such as a QueuedDispatcher (see set_dispatcher).'.format(type(_timer_source).__name__))
+#
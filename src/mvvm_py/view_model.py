@@ -1,32 +1,180 @@
-from collections import defaultdict
-from relay_command import *
-from event import *
+from collections import defaultdict, namedtuple
+from contextlib import contextmanager
+import functools
+import inspect
+import operator
+import weakref
+from .backend import INotifyPropertyChanged, PropertyChangedEventArgs
+from .compat import mapping_proxy, with_metaclass
+from .dispatcher import raise_event
+from .event import *
+from .relay_command import *
+from .timers import check_timer_source, get_timer_source
 
-from System.ComponentModel import *
 
+def get_comparer(compare):
+    '''Returns a function that takes an old and a new value and returns True if they are considered equal.
+compare can be None (values are never equal), 'identity', 'equality' or such a function.'''
+    if compare is None or callable(compare):
+        return compare
+    elif compare == 'identity':
+        return operator.is_
+    elif compare == 'equality':
+        return operator.eq
+    else:
+        raise ValueError('Unknown value comparison: {!r}'.format(compare))
+#
 
-def getattribute(object, name, default = None):
-    '''Recursively gets an attribute. For example, 'name' can be 'item.subitem'.'''
-    try:
-        return reduce(lambda obj, name: getattr(obj, name), name.split('.'), object)
-    except:
-        if default is not None:
-            return default
+# bindable_property has a 'set' argument, which hides the built-in set type:
+_new_set = set
+
+# A precompiled list of notifications that must be raised after a property has been set:
+_NotificationPlan = namedtuple('_NotificationPlan', 'dependents commands all_commands')
+_NotificationStep = namedtuple('_NotificationStep', 'name sources commands')
+
+# The bindable properties and commands of a view model class, and how they depend on each other. Classes that do not add,
+# remove or replace any properties or commands share the metadata of their base class. Dependency maps contain tuples:
+_ViewModelMetadata = namedtuple('_ViewModelMetadata', 'properties commands related_properties related_commands property_order dependency_paths notification_plans')
+
+
+class _NotificationPlans(dict):
+    '''Maps property names to notification plans. A plan is created when its property is first set, which keeps
+class creation fast for classes with many properties.'''
+    
+    def __init__(self, related_properties, related_commands, dependencies):
+        super(_NotificationPlans, self).__init__()
+        
+        self._related_properties = related_properties
+        self._related_commands = related_commands
+        self._dependencies = dependencies
+    #
+    
+    def __missing__(self, property_name):
+        plan = self[property_name] = self._create_plan(property_name)
+        return plan
+    #
+    
+    def _create_plan(self, property_name):
+        '''Flattens all (indirect) dependents of the given property into a list that is ordered such that
+every dependent comes after the properties it depends on. Each step also lists the properties through which it
+is reached, so active setters can still suppress (parts of) the plan at runtime.'''
+        related_properties, related_commands = self._related_properties, self._related_commands
+        
+        # Depth-first post-order, reversed, gives a topological order:
+        post_order = []
+        visited = set([property_name])
+        stack = [(property_name, iter(related_properties.get(property_name, ())))]
+        while stack:
+            prop_name, dependents = stack[-1]
+            for dependent in dependents:
+                if dependent not in visited:
+                    visited.add(dependent)
+                    stack.append((dependent, iter(related_properties.get(dependent, ()))))
+                    break
+            else:
+                stack.pop()
+                post_order.append(prop_name)
+        post_order.pop()    # The property itself
+        post_order.reverse()
+        
+        dependents = []
+        all_commands = list(related_commands.get(property_name, ()))
+        for dependent in post_order:
+            sources = tuple(source for source in self._dependencies[dependent] if source in visited)
+            commands = related_commands.get(dependent, ())
+            dependents.append(_NotificationStep(dependent, sources, commands))
+            all_commands.extend(command for command in commands if command not in all_commands)
+        
+        return _NotificationPlan(tuple(dependents), related_commands.get(property_name, ()), tuple(all_commands))
+    #
 #
 
-def setattribute(object, name, value):
-    '''Recursively sets an attribute. For example, 'name' can be 'item.subitem'.'''
-    if '.' in name:
-        first, last = name.rsplit('.', 1)
-        setattr(getattribute(object, first), last, value)
-    else:
-        setattr(object, name, value)
+
+class _PathNode(object):
+    '''A node in the tree of dependency paths (such as 'selected_item.name') of a view model class. properties and
+commands depend on the path up to and including this node, all_properties and all_commands also include those that
+depend on longer paths through this node.'''
+    __slots__ = ('properties', 'commands', 'children', 'all_properties', 'all_commands')
+    
+    def __init__(self):
+        self.properties = []
+        self.commands = []
+        self.children = {}
+        self.all_properties = ()
+        self.all_commands = ()
+    #
+#
+
+class _PathSubscription(object):
+    '''Listens to the PropertyChanged event of an object on a dependency path, and (through child subscriptions) of the
+objects further along that path. Only changes of the properties on the path cause notifications. The view model is
+referenced weakly if possible, so objects on the path do not keep it alive.'''
+    __slots__ = ('view_model_reference', 'nodes', 'obj', 'children')
+    
+    def __init__(self, view_model_reference, nodes, obj):
+        self.view_model_reference = view_model_reference
+        self.nodes = nodes
+        self.obj = obj
+        self.children = {}
+        
+        if isinstance(obj, INotifyPropertyChanged):
+            obj.PropertyChanged += self
+        for name, node in nodes.items():
+            if node.children:
+                self.children[name] = _PathSubscription(view_model_reference, node.children, getattr(obj, name, None))
+    #
+    
+    def detach(self):
+        if isinstance(self.obj, INotifyPropertyChanged):
+            self.obj.PropertyChanged -= self
+        for child in self.children.values():
+            child.detach()
+    #
+    
+    def __call__(self, sender, args):
+        # An empty property name means that all properties have changed:
+        property_name = args.PropertyName
+        if property_name:
+            node = self.nodes.get(property_name)
+            if node is None:
+                return
+            changed_nodes = [(property_name, node)]
+        else:
+            changed_nodes = list(self.nodes.items())
+        
+        view_model = self.view_model_reference()
+        if view_model is None:
+            self.detach()
+            return
+        
+        for name, node in changed_nodes:
+            # The objects further along the path may have been replaced:
+            if node.children:
+                self.children[name].detach()
+                self.children[name] = _PathSubscription(self.view_model_reference, node.children, getattr(self.obj, name, None))
+            view_model._notify_path_dependents(node)
+    #
+#
+
+
+class _RateLimitState(object):
+    '''The pending notification of a throttled or debounced property of a view model.'''
+    __slots__ = ('timer', 'last_notification_time')
+    
+    def __init__(self):
+        self.timer = None
+        self.last_notification_time = None
+    #
 #
 
+
 class bindable_property(property):
-    '''Creates a property that fires PropertyChanged notifications when the setter is called.'''
+    '''Creates a property that fires PropertyChanged notifications when the setter is called.
+With throttle (in seconds), notifications are raised at most once per interval. With debounce, they are only raised
+once the property has not been set for the given interval. In both cases the value itself is written immediately.'''
     
-    def __init__(self, get = 'default', set = 'default', backing_field = None, depends_on = None, default = None):
+    def __init__(self, get = 'default', set = 'default', backing_field = None, depends_on = None, default = None, compare = 'default', cached = False,
+                 throttle = None, debounce = None):
         # If no getter and setter method have been given, then use a private field to store the property's value in.
         # The property name is determined by ViewModelMetaClass:
         self.name = None
@@ -38,118 +186,448 @@ class bindable_property(property):
         self._depends_on = [] if depends_on is None else depends_on
         if isinstance(self._depends_on, str):
             self._depends_on = [self._depends_on]
-        self._related_properties = []
-        self._related_commands = []
+        
+        # How the current and new value are compared, to see whether setting the property changes anything.
+        # By default, the compare_values setting of the view model class is used:
+        self.compare = compare
+        
+        # Rate-limited properties postpone their notifications (and those of their dependents), using the current timer source:
+        if throttle is not None and debounce is not None:
+            raise ValueError('A property cannot be both throttled and debounced.')
+        self.throttle = throttle
+        self.debounce = debounce
+        is_rate_limited = throttle is not None or debounce is not None
+        
+        # The default getter and setter use backing field accessors that are compiled by ViewModelMetaClass:
+        self._uses_backing_field = get == 'default' or set == 'default'
+        self._get_backing_field = None
+        self._set_backing_field = None
         
         # Determine the most appropriate getter and setter:
         if get == 'default':
             def getter(slf):
-                return getattribute(slf, self.backing_field, default)
+                try:
+                    return self._get_backing_field(slf)
+                except AttributeError:
+                    return default
             #
         else:
             getter = get
         
+        # Cached properties store their value per instance, until a property that they depend on changes:
+        self.cached = cached and getter is not None
+        self.cache_hits = 0
+        self.cache_misses = 0
+        if self.cached:
+            compute = getter
+            
+            def getter(slf):
+                cache = slf._property_cache
+                if cache is None:
+                    cache = slf._property_cache = {}
+                else:
+                    try:
+                        value = cache[self.name]
+                        self.cache_hits += 1
+                        return value
+                    except KeyError:
+                        pass
+                
+                self.cache_misses += 1
+                value = cache[self.name] = compute(slf)
+                return value
+            #
+        
         if set == 'default':
-            def setter(slf, value):
-                try:
-                    slf._active_setters.append(self.name)
-                    setattribute(slf, self.backing_field, value)
-                    
-                    slf.OnPropertyChanged(self.name)
-                    slf._handle_related_properties_and_commands(self)
-                finally:
-                    slf._active_setters.remove(self.name)
+            def write(slf, value):
+                self._set_backing_field(slf, value)
             #
-        elif set is not None:
+        else:
+            write = set
+        
+        if write is not None:
             def setter(slf, value):
+                # Setting a property to its current value does not need to raise any notifications:
+                comparer = type(slf)._property_comparers[self.name]
+                if comparer is not None and getter is not None and comparer(getter(slf), value):
+                    slf._suppress_notifications(self)
+                    return
+                
+                # Nothing is written if the notifications of a rate-limited property could not be raised on the right thread:
+                if is_rate_limited:
+                    check_timer_source()
+                
+                journal = slf._journal
+                if journal is not None and getter is not None:
+                    with journal.recording_property_change(slf, self.name, getter(slf), value):
+                        set_value(slf, value)
+                else:
+                    set_value(slf, value)
+            #
+            
+            def set_value(slf, value):
+                active_setters = slf._active_setters
+                if active_setters is None:
+                    active_setters = slf._active_setters = _new_set()
+                is_outer_setter = self.name not in active_setters
                 try:
-                    slf._active_setters.append(self.name)
-                    set(slf, value)
+                    active_setters.add(self.name)
+                    write(slf, value)
                     
-                    slf.OnPropertyChanged(self.name)
-                    slf._handle_related_properties_and_commands(self)
+                    if slf._property_cache:
+                        slf._invalidate_cached_properties(self)
+                    if is_rate_limited:
+                        slf._schedule_notifications(self)
+                    else:
+                        slf.OnPropertyChanged(self.name)
+                        slf._handle_related_properties_and_commands(self)
                 finally:
-                    slf._active_setters.remove(self.name)
+                    if is_outer_setter:
+                        active_setters.discard(self.name)
+                        # Most view models are idle most of the time, so they do not keep an empty set around:
+                        if not active_setters:
+                            slf._active_setters = None
             #
         else:
-            setter = set
+            setter = None
         
         super(bindable_property, self).__init__(getter, setter)
     #
+    
+    def _compile_accessors(self, owner):
+        '''Creates the functions that read and write the backing field. Plain fields are accessed directly, through their slot
+if the owner has one, and paths such as 'item.name' use a precompiled attribute chain.'''
+        if '.' in self.backing_field:
+            path, field = self.backing_field.rsplit('.', 1)
+            get_parent = operator.attrgetter(path)
+            
+            def set_backing_field(slf, value):
+                setattr(get_parent(slf), field, value)
+            #
+            self._get_backing_field = operator.attrgetter(self.backing_field)
+            self._set_backing_field = set_backing_field
+        else:
+            slot = owner.__dict__.get(self.backing_field)
+            if inspect.ismemberdescriptor(slot):
+                self._get_backing_field = slot.__get__
+                self._set_backing_field = slot.__set__
+            else:
+                field = self.backing_field
+                
+                def set_backing_field(slf, value):
+                    setattr(slf, field, value)
+                #
+                self._get_backing_field = operator.attrgetter(field)
+                self._set_backing_field = set_backing_field
+    #
+#
+
+
+@contextmanager
+def deferred_notifications(*view_models):
+    '''Collects all property change and command notifications of the given view models while the context is active.
+When the outermost context for a view model exits, each collected notification is raised exactly once, in dependency order.'''
+    for view_model in view_models:
+        if view_model._deferral_depth == 0:
+            view_model._deferred_properties = set()
+            view_model._deferred_commands = set()
+        view_model._deferral_depth += 1
+    try:
+        yield
+    finally:
+        for view_model in view_models:
+            view_model._deferral_depth -= 1
+        for view_model in view_models:
+            if view_model._deferral_depth == 0:
+                view_model._raise_deferred_notifications()
+#
+
+def defer_notifications(method):
+    '''Decorates a view model method (such as a custom setter or a command) so that it defers
+the notifications of its view model until the method returns.'''
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with deferred_notifications(self):
+            return method(self, *args, **kwargs)
+    #
+    # Allows RelayCommand to inspect the arguments of the original method:
+    wrapper.__wrapped__ = method
+    return wrapper
 #
 
 
 class ViewModelMetaClass(type):
     '''Creates ViewModel classes and post-processes them to ensure that bindable property dependencies work properly.'''
     
+    def __new__(mcs, name, bases, dct):
+        # Classes that enable generate_slots store their backing fields in slots instead of in a __dict__:
+        generate_slots = dct.get('generate_slots', any(getattr(base, 'generate_slots', False) for base in bases))
+        if generate_slots:
+            dct = dict(dct)
+            dct['__slots__'] = tuple(mcs._get_slot_names(bases, dct))
+        
+        return super(ViewModelMetaClass, mcs).__new__(mcs, name, bases, dct)
+    #
+    
+    @staticmethod
+    def _get_slot_names(bases, dct):
+        slot_names = dct.get('__slots__', ())
+        if isinstance(slot_names, str):
+            slot_names = [slot_names]
+        slot_names = list(slot_names)
+        
+        for attribute_name, attribute in sorted(dct.items()):
+            if isinstance(attribute, bindable_property) and attribute._uses_backing_field:
+                # Fields of other objects (such as 'item.name') are not stored in the view model itself:
+                backing_field = attribute.backing_field or '_{0}'.format(attribute_name)
+                if '.' not in backing_field:
+                    slot_names.append(backing_field)
+            elif isinstance(attribute, relay_command):
+                slot_names.append('_{0}'.format(attribute_name))
+            elif isinstance(attribute, event):
+                slot_names.append(attribute.backing_field)
+        
+        if not any(hasattr(base, '__weakref__') for base in bases):
+            slot_names.append('__weakref__')
+        return [slot_name for slot_name in slot_names if slot_name not in dct and not any(hasattr(base, slot_name) for base in bases)]
+    #
+    
     def __init__(cls, name, bases, dct):
         super(ViewModelMetaClass, cls).__init__(name, bases, dct)
         
-        # Find all bindable properties in the class and update their dependencies:
-        # TODO: Take care of circular dependencies!!!
-        bindable_properties = {}
-        all_related_properties = defaultdict(lambda: [])
-        all_related_commands = defaultdict(lambda: [])
-        for attribute_name in dir(cls):
-            attribute = getattr(cls, attribute_name)
-            
+        # Only the class dictionary needs to be scanned, because the properties and commands of base view model classes
+        # have already been processed, and are available through their metadata. Other base classes (mixins) are scanned:
+        base_metadata = [base._metadata for base in bases if isinstance(base, ViewModelMetaClass)]
+        base_members = []
+        declarations = []
+        for base in bases:
+            if isinstance(base, ViewModelMetaClass):
+                base_members.append((base._metadata.properties, base._metadata.commands))
+            else:
+                mixin_declarations = cls._get_mixin_declarations(base)
+                base_members.append(cls._split_declarations(mixin_declarations))
+                declarations.extend(mixin_declarations)
+        declarations.extend(cls._get_declarations(dct))
+        
+        overrides_members = any(attribute_name in properties or attribute_name in commands
+                                for properties, commands in base_members for attribute_name in dct)
+        if declarations or overrides_members or len(set(map(id, base_metadata))) != 1:
+            cls._metadata = cls._create_metadata(base_members, declarations, dct)
+            cls._bindable_properties = cls._metadata.properties
+            cls._notification_plans = cls._metadata.notification_plans
+            cls._property_order = cls._metadata.property_order
+            cls._dependency_paths = cls._metadata.dependency_paths
+        elif 'compare_values' not in dct:
+            # Nothing has changed, so the metadata, plans and comparers of the base class are inherited:
+            return
+        
+        # Value comparisons can be specified per property, or for a whole view model class:
+        cls._property_comparers = dict((name, get_comparer(cls.compare_values if prop.compare == 'default' else prop.compare))
+                                       for name, prop in cls._metadata.properties.items())
+    #
+    
+    @staticmethod
+    def _get_declarations(namespace):
+        return [(attribute_name, attribute) for attribute_name, attribute in sorted(namespace.items())
+                if isinstance(attribute, (bindable_property, relay_command))]
+    #
+    
+    @staticmethod
+    def _get_mixin_declarations(base):
+        declarations = {}
+        for klass in reversed(base.__mro__):
+            for attribute_name in vars(klass):
+                declarations.pop(attribute_name, None)
+            declarations.update(ViewModelMetaClass._get_declarations(vars(klass)))
+        return sorted(declarations.items())
+    #
+    
+    @staticmethod
+    def _split_declarations(declarations):
+        properties = dict((name, attribute) for name, attribute in declarations if isinstance(attribute, bindable_property))
+        commands = dict((name, attribute) for name, attribute in declarations if not isinstance(attribute, bindable_property))
+        return properties, commands
+    #
+    
+    def _create_metadata(self, base_members, declarations, dct):
+        properties = {}
+        commands = {}
+        for base_properties, base_commands in reversed(base_members):
+            for attribute_name in base_properties:
+                commands.pop(attribute_name, None)
+            for attribute_name in base_commands:
+                properties.pop(attribute_name, None)
+            properties.update(base_properties)
+            commands.update(base_commands)
+        
+        # Attributes in the class dictionary replace or hide those of the base classes:
+        for attribute_name in dct:
+            properties.pop(attribute_name, None)
+            commands.pop(attribute_name, None)
+        
+        for attribute_name, attribute in declarations:
+            attribute.name = attribute_name
             if isinstance(attribute, bindable_property):
-                attribute.name = attribute_name
                 if attribute.backing_field is None:
                     attribute.backing_field = '_{0}'.format(attribute_name)
-                
-                bindable_properties[attribute_name] = attribute
-                for dependency in attribute._depends_on:
-                    all_related_properties[dependency].append(attribute_name)
-            elif isinstance(attribute, relay_command):
-                attribute.name = attribute_name
+                if attribute._get_backing_field is None or attribute_name in dct:
+                    attribute._compile_accessors(self)
+                if attribute_name in dct:
+                    properties[attribute_name] = attribute
+            else:
                 attribute.backing_field = '_{0}'.format(attribute_name)
-                
-                for dependency in attribute._depends_on:
-                    all_related_commands[dependency].append(attribute_name)
+                if attribute_name in dct:
+                    commands[attribute_name] = attribute
+        
+        related_properties = defaultdict(list)
+        related_commands = defaultdict(list)
+        dependencies = {}
+        path_dependencies = []
+        for members, related, is_command in ((properties, related_properties, False), (commands, related_commands, True)):
+            for member_name in sorted(members):
+                roots = []
+                for dependency in members[member_name]._depends_on:
+                    root = dependency.split('.', 1)[0]
+                    if root not in properties:
+                        raise ValueError('{0!r} depends on {1!r}, which is not a bindable property of {2}'.format(member_name, dependency, self.__name__))
+                    
+                    # A path such as 'selected_item.name' is also a dependency on its first property,
+                    # because replacing the selected item changes its name as well:
+                    if root != dependency:
+                        path_dependencies.append((dependency.split('.'), member_name, is_command))
+                    if root not in roots:
+                        roots.append(root)
+                        related[root].append(member_name)
+                dependencies[member_name] = tuple(roots)
         
-        for name, related_properties in all_related_properties.items():
-            # Circular dependencies cause stack overflows (infinite loops), so they're not allowed:
-            assert not cls._has_circular_references(all_related_properties, name), 'bindable property {!r} has a circular dependency'.format(name)
-            bindable_prop = bindable_properties[name]
-            bindable_prop._related_properties = related_properties
+        related_properties = dict((name, tuple(dependents)) for name, dependents in related_properties.items())
+        related_commands = dict((name, tuple(dependents)) for name, dependents in related_commands.items())
         
-        for name, related_commands in all_related_commands.items():
-            bindable_prop = bindable_properties[name]
-            bindable_prop._related_commands = related_commands
+        # Deferred notifications are raised in dependency order. This also detects circular dependencies:
+        property_order = self._create_property_order(sorted(properties), related_properties)
+        
+        return _ViewModelMetadata(
+            properties = mapping_proxy(properties),
+            commands = mapping_proxy(commands),
+            related_properties = mapping_proxy(related_properties),
+            related_commands = mapping_proxy(related_commands),
+            property_order = property_order,
+            # Dependency paths are stored as a tree per root property, so view models can subscribe to the objects on those paths:
+            dependency_paths = self._create_dependency_paths(path_dependencies, property_order),
+            # Setters only need to walk a precompiled plan instead of the dependency graph:
+            notification_plans = _NotificationPlans(related_properties, related_commands, dependencies))
     #
     
-    def _has_circular_references(self, related_properties, property_name):
-        visited_properties = []
-        open_properties = [property_name]
-
-        while len(open_properties) > 0:
-            prop_name = open_properties.pop()
-            visited_properties.append(prop_name)
-
-            if prop_name in related_properties:
-                for related_property in related_properties[prop_name]:
-                    if related_property == property_name:
-                        return True
-                    elif related_property not in visited_properties and related_property not in open_properties:
-                        open_properties.append(related_property)
-
-        return False
+    def _create_dependency_paths(self, path_dependencies, property_order):
+        roots = {}
+        for segments, dependent, is_command in path_dependencies:
+            nodes = roots
+            for segment in segments:
+                node = nodes.get(segment)
+                if node is None:
+                    node = nodes[segment] = _PathNode()
+                nodes = node.children
+            (node.commands if is_command else node.properties).append(dependent)
+        
+        def finish(node):
+            all_properties, all_commands = set(node.properties), set(node.commands)
+            for child in node.children.values():
+                finish(child)
+                all_properties.update(child.all_properties)
+                all_commands.update(child.all_commands)
+            node.all_properties = tuple(sorted(all_properties, key = lambda name: (property_order[name], name)))
+            node.all_commands = tuple(sorted(all_commands))
+        #
+        for node in roots.values():
+            finish(node)
+        return roots
+    #
+    
+    def _create_property_order(self, property_names, related_properties):
+        '''Returns a dictionary that maps each property name to its position in a topological order of all properties.
+Raises a ValueError that describes the cycle if the properties have circular dependencies, because those would
+cause infinite notification loops.'''
+        post_order = []
+        # Properties that are on the current depth-first search path are 'open', finished properties are 'closed':
+        states = {}
+        for property_name in property_names:
+            if property_name in states:
+                continue
+            states[property_name] = 'open'
+            stack = [(property_name, iter(related_properties.get(property_name, ())))]
+            while stack:
+                prop_name, dependents = stack[-1]
+                for dependent in dependents:
+                    state = states.get(dependent)
+                    if state is None:
+                        states[dependent] = 'open'
+                        stack.append((dependent, iter(related_properties.get(dependent, ()))))
+                        break
+                    elif state == 'open':
+                        path = [entry[0] for entry in stack]
+                        cycle = path[path.index(dependent):] + [dependent]
+                        raise ValueError('bindable properties of {0} have a circular dependency: {1}'.format(self.__name__, ' -> '.join(cycle)))
+                else:
+                    stack.pop()
+                    states[prop_name] = 'closed'
+                    post_order.append(prop_name)
+        
+        return dict((prop_name, len(post_order) - index) for index, prop_name in enumerate(post_order))
     #
 #
 
 
-class ViewModel(INotifyPropertyChanged):
-    __metaclass__ = ViewModelMetaClass
+class ViewModel(with_metaclass(ViewModelMetaClass, INotifyPropertyChanged)):
+    # Subclasses can set generate_slots to True to store the backing fields of their bindable properties and commands in slots.
+    # This reduces the memory use of view models that are created in large numbers. Other attributes must then be listed in
+    # __slots__. Subclasses of such classes also generate slots, unless they set generate_slots to False:
+    generate_slots = False
+    __slots__ = ('_active_setters', '_deferral_depth', '_deferred_properties', '_deferred_commands', '_PropertyChanged',
+                 '_property_cache', '_journal', '_path_subscriptions', '_rate_limits', 'suppressed_notifications')
     
     PropertyChanged = event('PropertyChanged')
     
+    # Determines how bindable properties that do not specify their own comparison compare values. When a property is set
+    # to a value that is equal to its current value, nothing is written and no notifications are raised.
+    # Can be None (always notify), 'identity', 'equality' or a function that takes the old and new value:
+    compare_values = None
+    
+    # PropertyChangedEventArgs are immutable, so they can be shared by all view models:
+    _property_changed_event_args = {}
+    
     def __init__(self):
         super(ViewModel, self).__init__()
         
-        # A list of currently active setters is maintained, so duplicate
-        # property change notifications can be avoided.
-        self._active_setters = []
+        # A set of currently active setters is maintained, so duplicate property change notifications
+        # can be avoided. It only exists while a setter is active.
+        self._active_setters = None
+        
+        # Notifications are collected instead of raised while notifications are deferred:
+        self._deferral_depth = 0
+        self._deferred_properties = None
+        self._deferred_commands = None
+        
+        # The number of notifications that were skipped because a property was set to its current value:
+        self.suppressed_notifications = 0
+        
+        # Values of cached properties. Created on demand:
+        self._property_cache = None
+        
+        # The ChangeJournal that records changes to this view model, if any:
+        self._journal = None
+        
+        # Subscriptions to the objects on dependency paths, by root property name. Created on demand:
+        self._path_subscriptions = None
+        
+        # The pending notifications of throttled and debounced properties, by property name. Created on demand:
+        self._rate_limits = None
+    #
+    
+    @classmethod
+    def get_cache_statistics(cls):
+        '''Returns a dictionary that maps the names of cached properties to (hits, misses) tuples.
+Counts are shared by all instances.'''
+        return dict((name, (prop.cache_hits, prop.cache_misses)) for name, prop in cls._bindable_properties.items() if prop.cached)
     #
     
     def add_PropertyChanged(self, value):
@@ -160,17 +638,195 @@ class ViewModel(INotifyPropertyChanged):
         self.PropertyChanged -= value
     #
     
+    def deferred_notifications(self):
+        '''Returns a context manager that defers the notifications of this view model. See deferred_notifications.'''
+        return deferred_notifications(self)
+    #
+    
+    def flush_notifications(self):
+        '''Immediately raises the pending notifications of throttled and debounced properties.'''
+        if self._rate_limits:
+            for name, state in sorted(self._rate_limits.items()):
+                if state.timer is not None:
+                    state.timer.cancel()
+                    self._raise_scheduled_notifications(type(self)._bindable_properties[name], state.timer)
+    #
+    
     def OnPropertyChanged(self, propertyName):
-        self.PropertyChanged(self, PropertyChangedEventArgs(propertyName))
+        # A property that has changed must be recomputed:
+        if self._property_cache:
+            self._property_cache.pop(propertyName, None)
+        
+        # Properties that start a dependency path may now refer to other objects:
+        if propertyName in type(self)._dependency_paths:
+            self._update_path_subscription(propertyName)
+        
+        if self._deferral_depth:
+            self._deferred_properties.add(propertyName)
+            return
+        
+        # The event is only created when a handler subscribes, so view models without subscribers do not carry one:
+        property_changed = getattr(self, '_PropertyChanged', None)
+        if property_changed is None:
+            return
+        
+        try:
+            event_args = ViewModel._property_changed_event_args[propertyName]
+        except KeyError:
+            event_args = ViewModel._property_changed_event_args[propertyName] = PropertyChangedEventArgs(propertyName)
+        raise_event(property_changed, self, event_args, (id(self), propertyName))
     #
     
     def _handle_related_properties_and_commands(self, property):
-        for related_property in property._related_properties:
-            if related_property not in self._active_setters:
-                self.OnPropertyChanged(related_property)
-                self._handle_related_properties_and_commands(getattr(type(self), related_property))
+        plan = type(self)._notification_plans[property.name]
+        active_setters = self._active_setters
+        
+        if len(active_setters) == 1:
+            # Only the given property is being set, so nothing needs to be suppressed:
+            for step in plan.dependents:
+                self.OnPropertyChanged(step.name)
+            commands = plan.all_commands
+        else:
+            # Properties whose setter is active will raise their own notifications afterwards, and so will
+            # everything that can only be reached through them:
+            reached_properties = set([property.name])
+            commands = list(plan.commands)
+            for step in plan.dependents:
+                if step.name not in active_setters and not reached_properties.isdisjoint(step.sources):
+                    reached_properties.add(step.name)
+                    self.OnPropertyChanged(step.name)
+                    commands.extend(command for command in step.commands if command not in commands)
+        
+        self._notify_commands(commands)
+    #
+    
+    def _notify_commands(self, command_names):
+        if self._deferral_depth:
+            self._deferred_commands.update(command_names)
+        else:
+            for command_name in command_names:
+                getattr(self, command_name).OnCanExecuteChanged()
+    #
+    
+    def _update_path_subscription(self, property_name):
+        subscriptions = self._path_subscriptions
+        if subscriptions is None:
+            subscriptions = self._path_subscriptions = {}
         
-        for related_command in property._related_commands:
-            getattr(self, related_command).OnCanExecuteChanged()
+        subscription = subscriptions.get(property_name)
+        if subscription is not None:
+            subscription.detach()
+            view_model_reference = subscription.view_model_reference
+        else:
+            try:
+                view_model_reference = weakref.ref(self)
+            except TypeError:
+                view_model_reference = lambda: self
+        
+        subscriptions[property_name] = _PathSubscription(view_model_reference, type(self)._dependency_paths[property_name].children,
+                                                         getattr(self, property_name))
     #
-#
\ No newline at end of file
+    
+    def _notify_path_dependents(self, node):
+        '''Raises notifications for everything that depends on a dependency path that has changed.'''
+        plans = type(self)._notification_plans
+        property_names = set(node.all_properties)
+        commands = set(node.all_commands)
+        for property_name in node.all_properties:
+            plan = plans[property_name]
+            property_names.update(step.name for step in plan.dependents)
+            commands.update(plan.all_commands)
+        
+        property_order = type(self)._property_order
+        property_names = sorted(property_names, key = lambda name: (property_order[name], name))
+        
+        # As with setters, no handler should see outdated cached values:
+        if self._property_cache:
+            for property_name in property_names:
+                self._property_cache.pop(property_name, None)
+        
+        for property_name in property_names:
+            self.OnPropertyChanged(property_name)
+        self._notify_commands(sorted(commands))
+    #
+    
+    def _schedule_notifications(self, property):
+        '''Called by the setter of a throttled or debounced property, instead of raising notifications.'''
+        rate_limits = self._rate_limits
+        if rate_limits is None:
+            rate_limits = self._rate_limits = {}
+        state = rate_limits.get(property.name)
+        if state is None:
+            state = rate_limits[property.name] = _RateLimitState()
+        
+        timer_source = get_timer_source()
+        if property.debounce is not None:
+            # Every change restarts the interval:
+            if state.timer is not None:
+                state.timer.cancel()
+            delay = property.debounce
+        else:
+            # Changes within the interval are reported together, when the interval ends:
+            if state.timer is not None:
+                return
+            now = timer_source.now()
+            if state.last_notification_time is None or now - state.last_notification_time >= property.throttle:
+                state.last_notification_time = now
+                self.OnPropertyChanged(property.name)
+                self._handle_related_properties_and_commands(property)
+                return
+            delay = state.last_notification_time + property.throttle - now
+        
+        # The timer is looked up when it fires, so a timer that was cancelled just too late does nothing:
+        timer = state.timer = timer_source.call_later(delay, lambda: self._raise_scheduled_notifications(property, timer))
+    #
+    
+    def _raise_scheduled_notifications(self, property, timer):
+        state = self._rate_limits.get(property.name)
+        if state is None or state.timer is not timer:
+            return
+        
+        state.timer = None
+        state.last_notification_time = get_timer_source().now()
+        
+        # Dependents are notified as if the property was just set:
+        active_setters = self._active_setters
+        if active_setters is None:
+            active_setters = self._active_setters = _new_set()
+        is_outer_setter = property.name not in active_setters
+        try:
+            active_setters.add(property.name)
+            self.OnPropertyChanged(property.name)
+            self._handle_related_properties_and_commands(property)
+        finally:
+            if is_outer_setter:
+                active_setters.discard(property.name)
+                if not active_setters:
+                    self._active_setters = None
+    #
+    
+    def _invalidate_cached_properties(self, property):
+        # This is done before any notifications are raised, so handlers never see outdated values:
+        cache = self._property_cache
+        cache.pop(property.name, None)
+        for step in type(self)._notification_plans[property.name].dependents:
+            cache.pop(step.name, None)
+    #
+    
+    def _suppress_notifications(self, property):
+        plan = type(self)._notification_plans[property.name]
+        self.suppressed_notifications += 1 + len(plan.dependents) + len(plan.all_commands)
+    #
+    
+    def _raise_deferred_notifications(self):
+        property_order = type(self)._property_order
+        property_names = sorted(self._deferred_properties, key = lambda name: (property_order.get(name, len(property_order)), name))
+        command_names = sorted(self._deferred_commands)
+        self._deferred_properties = None
+        self._deferred_commands = None
+        
+        for property_name in property_names:
+            self.OnPropertyChanged(property_name)
+        self._notify_commands(command_names)
+    #
+#
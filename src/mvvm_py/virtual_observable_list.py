@@ -0,0 +1,260 @@
+from collections import OrderedDict
+from .backend import IList, INotifyCollectionChanged, NotifyCollectionChangedAction, NotifyCollectionChangedEventArgs
+from .compat import xrange
+from .dispatcher import raise_event
+from .event import *
+
+
+class VirtualObservableList(IList, INotifyCollectionChanged):
+    '''A read-only list with a known length, whose items are loaded on demand, one page at a time.
+This is useful for binding to large result sets, without having to create all items up front.
+
+load_page is called with a start index and a count, and must return a sequence of items.
+Only the max_pages most recently used pages are kept in memory. When a page is loaded, up to
+prefetch neighbouring pages on either side are loaded as well, as far as they fit within max_pages.
+
+The list implements IList, so WPF accesses items by index instead of enumerating (and loading) all of them.
+For the same reason, index and the in operator only search loaded pages. find_index, if given, is called with
+an item that is not on a loaded page, and should return its index (for example by querying the data source),
+or None.'''
+    
+    CollectionChanged = event('CollectionChanged')
+    
+    def __init__(self, count, load_page, page_size = 100, max_pages = 10, prefetch = 0, find_index = None):
+        super(VirtualObservableList, self).__init__()
+        
+        if page_size < 1 or max_pages < 1:
+            raise ValueError('page_size and max_pages must be at least 1')
+        
+        self._count = count
+        self._load_page = load_page
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.prefetch = prefetch
+        self.find_index = find_index
+        
+        # Page numbers map to lists of items. Recently used pages are moved to the end:
+        self._pages = OrderedDict()
+        
+        self.page_hits = 0
+        self.page_misses = 0
+        self.pages_loaded = 0
+        self.pages_evicted = 0
+    #
+    
+    def add_CollectionChanged(self, value):
+        self.CollectionChanged += value
+    #
+    
+    def remove_CollectionChanged(self, value):
+        self.CollectionChanged -= value
+    #
+    
+    def OnCollectionChanged(self, action, added_index = None, added_items = None, removed_index = None, removed_items = None):
+        if action == NotifyCollectionChangedAction.Reset:
+            raise_event(self.CollectionChanged, self, NotifyCollectionChangedEventArgs(action))
+        elif action == NotifyCollectionChangedAction.Replace:
+            raise_event(self.CollectionChanged, self, NotifyCollectionChangedEventArgs(action, added_items, removed_items, added_index))
+    #
+    
+    
+    @property
+    def statistics(self):
+        '''Returns a dictionary with page hit, miss, load and eviction counts.'''
+        return {
+            'page_hits': self.page_hits,
+            'page_misses': self.page_misses,
+            'pages_loaded': self.pages_loaded,
+            'pages_evicted': self.pages_evicted,
+            'pages_cached': len(self._pages),
+        }
+    #
+    
+    def refresh(self, count = None):
+        '''Discards all loaded pages, optionally changes the number of items, and raises a Reset notification.'''
+        if count is not None:
+            self._count = count
+        self._pages.clear()
+        self.OnCollectionChanged(NotifyCollectionChangedAction.Reset)
+    #
+    
+    def update_item(self, index, item):
+        '''Replaces a loaded item, for example after it has been modified in the underlying data source.
+Items on pages that are not loaded are simply loaded again later on.'''
+        index = self._normalize_index(index)
+        page = self._pages.get(index // self.page_size)
+        if page is not None:
+            old_item = page[index % self.page_size]
+            page[index % self.page_size] = item
+            self.OnCollectionChanged(NotifyCollectionChangedAction.Replace, added_index = index, added_items = [item], removed_index = index, removed_items = [old_item])
+    #
+    
+    
+    def __len__(self):
+        return self._count
+    #
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in xrange(*index.indices(self._count))]
+        
+        index = self._normalize_index(index)
+        return self._get_page(index // self.page_size)[index % self.page_size]
+    #
+    
+    def __iter__(self):
+        for page_number in xrange((self._count + self.page_size - 1) // self.page_size):
+            for item in self._get_page(page_number):
+                yield item
+    #
+    
+    def index(self, item):
+        for page_number, page in sorted(self._pages.items()):
+            for offset, other in enumerate(page):
+                if other == item:
+                    return page_number * self.page_size + offset
+        
+        if self.find_index is not None:
+            index = self.find_index(item)
+            if index is not None:
+                return index
+        raise ValueError('{!r} is not in list'.format(item))
+    #
+    
+    def __contains__(self, item):
+        try:
+            self.index(item)
+            return True
+        except ValueError:
+            return False
+    #
+    
+    
+    # IList members, for WPF. The list is read-only:
+    @property
+    def Count(self):
+        return self._count
+    #
+    
+    @property
+    def IsReadOnly(self):
+        return True
+    #
+    
+    @property
+    def IsFixedSize(self):
+        return True
+    #
+    
+    @property
+    def IsSynchronized(self):
+        return False
+    #
+    
+    @property
+    def SyncRoot(self):
+        return self
+    #
+    
+    def get_Item(self, index):
+        return self[index]
+    #
+    
+    def set_Item(self, index, value):
+        self._raise_read_only()
+    #
+    
+    def IndexOf(self, item):
+        try:
+            return self.index(item)
+        except ValueError:
+            return -1
+    #
+    
+    def Contains(self, item):
+        return item in self
+    #
+    
+    def CopyTo(self, array, index):
+        for offset, item in enumerate(self):
+            array[index + offset] = item
+    #
+    
+    def Add(self, item):
+        self._raise_read_only()
+    #
+    
+    def Insert(self, index, item):
+        self._raise_read_only()
+    #
+    
+    def Remove(self, item):
+        self._raise_read_only()
+    #
+    
+    def RemoveAt(self, index):
+        self._raise_read_only()
+    #
+    
+    def Clear(self):
+        self._raise_read_only()
+    #
+    
+    
+    def _raise_read_only(self):
+        raise TypeError('VirtualObservableList is read-only')
+    #
+    
+    def _normalize_index(self, index):
+        if index < 0:
+            index += self._count
+        if index < 0 or index >= self._count:
+            raise IndexError('list index out of range')
+        return index
+    #
+    
+    def _get_page(self, page_number):
+        page = self._pages.get(page_number)
+        if page is not None:
+            self.page_hits += 1
+            # Mark the page as most recently used:
+            del self._pages[page_number]
+            self._pages[page_number] = page
+            return page
+        
+        self.page_misses += 1
+        page = self._load(page_number)
+        
+        # Only as many neighbours as fit in memory next to the requested page are prefetched (or kept, if they are
+        # already loaded), nearest first. Any more would be evicted straight away:
+        last_page_number = (self._count - 1) // self.page_size
+        neighbours = [neighbour for offset in xrange(1, self.prefetch + 1) for neighbour in (page_number + offset, page_number - offset)
+                      if 0 <= neighbour <= last_page_number]
+        for neighbour in neighbours[:self.max_pages - 1]:
+            neighbour_page = self._pages.pop(neighbour, None)
+            if neighbour_page is not None:
+                self._pages[neighbour] = neighbour_page
+            else:
+                self._load(neighbour)
+        
+        # Prefetched pages must not evict the requested page:
+        del self._pages[page_number]
+        self._pages[page_number] = page
+        self._evict_pages()
+        return page
+    #
+    
+    def _load(self, page_number):
+        start = page_number * self.page_size
+        page = list(self._load_page(start, min(self.page_size, self._count - start)))
+        self._pages[page_number] = page
+        self.pages_loaded += 1
+        return page
+    #
+    
+    def _evict_pages(self):
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last = False)
+            self.pages_evicted += 1
+    #
+#
@@ -0,0 +1,18 @@
+'''The tests use the package from the source tree, on the headless backend.'''
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from mvvm_py import set_dispatcher, set_timer_source
+
+
+@pytest.fixture(autouse = True)
+def reset_globals():
+    '''Every test starts with the default dispatcher and timer source.'''
+    yield
+    set_dispatcher(None)
+    set_timer_source(None)
+#
@@ -0,0 +1,35 @@
+'''A list that applies the CollectionChanged notifications of a collection to a copy of its items, like a bound view
+does. Comparing the copy with the collection checks that the notifications describe every change correctly.'''
+from mvvm_py.backend import NotifyCollectionChangedAction
+
+
+class CollectionMirror(object):
+    def __init__(self, collection):
+        super(CollectionMirror, self).__init__()
+        
+        self.collection = collection
+        self.items = list(collection)
+        self.actions = []
+        collection.CollectionChanged += self.on_collection_changed
+    #
+    
+    def on_collection_changed(self, sender, args):
+        self.actions.append(args.Action)
+        if args.Action == NotifyCollectionChangedAction.Reset:
+            self.items = list(self.collection)
+            return
+        
+        if args.Action in (NotifyCollectionChangedAction.Remove, NotifyCollectionChangedAction.Replace, NotifyCollectionChangedAction.Move):
+            old_items = list(args.OldItems)
+            index = args.OldStartingIndex
+            assert self.items[index:index + len(old_items)] == old_items
+            del self.items[index:index + len(old_items)]
+        if args.Action in (NotifyCollectionChangedAction.Add, NotifyCollectionChangedAction.Replace, NotifyCollectionChangedAction.Move):
+            index = args.NewStartingIndex
+            self.items[index:index] = list(args.NewItems)
+    #
+    
+    def check(self):
+        assert self.items == list(self.collection)
+    #
+#
@@ -0,0 +1,125 @@
+import sys
+import threading
+
+import pytest
+
+from mvvm_py import AsyncRelayCommand, ViewModel, async_relay_command, bindable_property
+
+
+class Download(ViewModel):
+    def download(self, cancellation_token):
+        self.started.set()
+        if cancellation_token.wait(5):
+            return None
+        return 'done'
+    #
+    
+    result = bindable_property()
+    download_command = async_relay_command(download, result_property = 'result')
+    
+    def __init__(self):
+        super(Download, self).__init__()
+        
+        self.started = threading.Event()
+    #
+#
+
+def wait_until(condition):
+    for _ in range(500):
+        if condition():
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError('Timed out')
+#
+
+def wait_for_completion(command):
+    wait_until(lambda: not command.is_running)
+#
+
+
+def test_command_cannot_execute_while_running():
+    download = Download()
+    command = download.download_command
+    changes = []
+    command.CanExecuteChanged += lambda sender, args: changes.append(command.CanExecute(None))
+    
+    future = command.Execute(None)
+    download.started.wait(5)
+    
+    assert command.is_running
+    assert not command.CanExecute(None)
+    assert command.Execute(None) is None
+    
+    command.cancel()
+    wait_until(lambda: len(changes) == 2)
+    assert future.cancelled() or future.result() is None
+    assert command.CanExecute(None)
+    assert changes == [False, True]
+#
+
+def test_cancelled_execution_does_not_complete():
+    download = Download()
+    command = download.download_command
+    
+    command.Execute(None)
+    download.started.wait(5)
+    command.cancel()
+    wait_for_completion(command)
+    
+    assert download.result is None
+#
+
+def test_result_is_assigned_to_result_property():
+    class Calculation(ViewModel):
+        result = bindable_property()
+        calculate_command = async_relay_command(lambda self, value: value * 2, result_property = 'result')
+    #
+    calculation = Calculation()
+    
+    calculation.calculate_command.Execute(21)
+    wait_until(lambda: calculation.result is not None)
+    
+    assert calculation.result == 42
+#
+
+def test_errors_are_passed_to_on_error():
+    errors = []
+    
+    def fail():
+        raise KeyError('key')
+    #
+    command = AsyncRelayCommand(fail, on_error = errors.append)
+    
+    command.Execute(None)
+    wait_until(lambda: errors)
+    
+    assert len(errors) == 1
+    assert isinstance(errors[0], KeyError)
+#
+
+@pytest.mark.skipif(sys.version_info < (3, 5), reason = 'requires coroutine functions')
+def test_coroutine_command_requires_a_loop():
+    namespace = {}
+    exec('async def fetch():\n    return 1\n', namespace)
+    command = AsyncRelayCommand(namespace['fetch'])
+    
+    with pytest.raises(RuntimeError):
+        command.Execute(None)
+    assert not command.is_running
+#
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason = 'requires asyncio.run')
+def test_coroutine_command_runs_on_the_running_loop():
+    import asyncio
+    namespace = {}
+    exec('async def fetch():\n    return 1\n', namespace)
+    results = []
+    command = AsyncRelayCommand(namespace['fetch'], on_completed = results.append)
+    
+    async_namespace = {'asyncio': asyncio, 'command': command}
+    exec('async def main():\n    await asyncio.wrap_future(command.Execute(None))\n', async_namespace)
+    asyncio.run(async_namespace['main']())
+    wait_until(lambda: results)
+    
+    assert results == [1]
+#
@@ -0,0 +1,29 @@
+import pytest
+
+from mvvm_py import is_headless
+from mvvm_py.backend import NotifyCollectionChangedAction, NotifyCollectionChangedEventArgs, PropertyChangedEventArgs
+
+
+def test_headless_backend_is_used_without_clr():
+    assert is_headless
+#
+
+def test_property_changed_args():
+    assert PropertyChangedEventArgs('name').PropertyName == 'name'
+#
+
+def test_collection_changed_args_overloads():
+    args = NotifyCollectionChangedEventArgs(NotifyCollectionChangedAction.Add, [1], 3)
+    assert (args.NewItems, args.NewStartingIndex, args.OldItems) == ([1], 3, None)
+    
+    args = NotifyCollectionChangedEventArgs(NotifyCollectionChangedAction.Replace, [1], [2], 3)
+    assert (args.NewItems, args.OldItems, args.NewStartingIndex, args.OldStartingIndex) == ([1], [2], 3, 3)
+    
+    args = NotifyCollectionChangedEventArgs(NotifyCollectionChangedAction.Move, [1], 3, 0)
+    assert (args.OldItems, args.NewStartingIndex, args.OldStartingIndex) == ([1], 3, 0)
+#
+
+def test_reset_args_take_no_items():
+    with pytest.raises(ValueError):
+        NotifyCollectionChangedEventArgs(NotifyCollectionChangedAction.Reset, [1], 0)
+#
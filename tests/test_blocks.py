@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from mvvm_py._blocks import BlockList, FenwickTree
+
+
+class TrackedBlockList(BlockList):
+    '''Keeps track of the blocks that contain each value, like the subclasses of BlockList do.'''
+    block_size = 4
+    
+    def __init__(self, values, weights = None):
+        self.locations = {}
+        super(TrackedBlockList, self).__init__(values, weights)
+    #
+    
+    def _add_locations(self, values, block):
+        for value in values:
+            blocks = self.locations.setdefault(value, {})
+            blocks[block] = blocks.get(block, 0) + 1
+    #
+    
+    def _remove_locations(self, values, block):
+        for value in values:
+            blocks = self.locations[value]
+            blocks[block] -= 1
+            if not blocks[block]:
+                del blocks[block]
+    #
+#
+
+
+def test_fenwick_tree_prefix_sums_and_find():
+    tree = FenwickTree([3, 0, 2, 5])
+    tree.add(1, 1)
+    
+    assert [tree.prefix_sum(end) for end in range(5)] == [0, 3, 4, 6, 11]
+    assert tree.find(0) == (0, 0)
+    assert tree.find(3) == (1, 0)
+    assert tree.find(5) == (2, 1)
+    assert tree.find(11) == (4, 0)
+#
+
+@pytest.mark.parametrize('seed', range(20))
+def test_block_list_matches_list(seed):
+    random = _random(seed)
+    values = [random.randint(0, 9) for _ in range(random.randint(0, 20))]
+    weights = [random.randint(0, 1) for _ in values]
+    blocks = TrackedBlockList(list(values), list(weights))
+    
+    for _ in range(100):
+        if values and random.random() < 0.5:
+            position = random.randrange(len(values))
+            count = random.randint(1, min(12, len(values) - position))
+            assert blocks.remove(position, count) == weights[position:position + count]
+            del values[position:position + count]
+            del weights[position:position + count]
+        elif values and random.random() < 0.3:
+            block, offset = blocks.find(random.randrange(len(values)))
+            weight = 1 - block.weights[offset]
+            weights[blocks.block_start(block) + offset] = weight
+            blocks.set_weight(block, offset, weight)
+        else:
+            position = random.randint(0, len(values))
+            new_values = [random.randint(0, 9) for _ in range(random.randint(1, 12))]
+            new_weights = [random.randint(0, 1) for _ in new_values]
+            blocks.insert(position, new_values, new_weights)
+            values[position:position] = new_values
+            weights[position:position] = new_weights
+        
+        assert len(blocks) == len(values)
+        assert [value for block in blocks.blocks for value in block.values] == values
+        assert all(len(block.values) <= 2 * blocks.block_size for block in blocks.blocks)
+        for position in range(len(values) + 1):
+            assert blocks.weight_before(position) == sum(weights[:position])
+        for value in range(10):
+            assert sum(blocks.locations.get(value, {}).values()) == values.count(value)
+#
+
+
+def _random(seed):
+    return random.Random(seed)
+#
@@ -0,0 +1,161 @@
+import pytest
+
+from mvvm_py import ChangeJournal, ObservableList, ViewModel, bindable_property
+from mirror import CollectionMirror
+
+
+class Clock(object):
+    def __init__(self):
+        self.time = 0.0
+    #
+    
+    def __call__(self):
+        return self.time
+    #
+#
+
+class Person(ViewModel):
+    def set_full_name(self, full_name):
+        self.name, self.surname = full_name.split()
+    #
+    
+    name = bindable_property()
+    surname = bindable_property()
+    full_name = bindable_property(lambda self: '{0} {1}'.format(self.name, self.surname), set_full_name, depends_on = ['name', 'surname'])
+#
+
+@pytest.fixture
+def clock():
+    return Clock()
+#
+
+@pytest.fixture
+def journal(clock):
+    return ChangeJournal(merge_interval = 1.0, clock = clock)
+#
+
+
+def test_property_changes_can_be_undone_and_redone(journal, clock):
+    person = Person()
+    journal.track(person)
+    
+    person.name = 'John'
+    clock.time += 2
+    person.name = 'Jack'
+    
+    assert journal.undo()
+    assert person.name == 'John'
+    assert journal.redo()
+    assert person.name == 'Jack'
+    assert journal.undo() and journal.undo()
+    assert person.name is None
+    assert not journal.can_undo
+    assert not journal.undo()
+#
+
+def test_quick_changes_to_the_same_property_are_merged(journal, clock):
+    person = Person()
+    journal.track(person)
+    
+    for name in ('J', 'Jo', 'Joh', 'John'):
+        person.name = name
+        clock.time += 0.5
+    person.surname = 'Doe'
+    
+    journal.undo()
+    assert person.surname is None
+    journal.undo()
+    assert person.name is None
+#
+
+def test_changes_made_by_a_setter_are_undone_with_it(journal):
+    person = Person()
+    person.full_name = 'John Doe'
+    journal.track(person)
+    
+    person.full_name = 'Jack Smith'
+    journal.undo()
+    
+    assert (person.name, person.surname) == ('John', 'Doe')
+    assert not journal.can_undo
+#
+
+def test_transaction_is_a_single_undo_step(journal):
+    person = Person()
+    items = ObservableList()
+    journal.track(person, items)
+    
+    with journal.transaction():
+        person.name = 'John'
+        with journal.transaction():
+            items.append(1)
+        items.append(2)
+    journal.undo()
+    
+    assert person.name is None
+    assert list(items) == []
+#
+
+def test_list_changes_can_be_undone_and_redone(journal):
+    items = ObservableList(range(5))
+    journal.track(items)
+    history = []
+    
+    for change in (lambda: items.append(5), lambda: items.insert_range(1, ['a', 'b']), lambda: items.move(0, 3),
+                   lambda: items.remove_range(2, 2), lambda: items.__setitem__(0, 'c'), lambda: items.sort(key = str),
+                   lambda: items.replace_all([7, 8])):
+        history.append(list(items))
+        change()
+    final_items = list(items)
+    
+    for old_items in reversed(history):
+        journal.undo()
+        assert list(items) == old_items
+    while journal.redo():
+        pass
+    assert list(items) == final_items
+#
+
+def test_new_change_discards_redo_history(journal):
+    items = ObservableList()
+    journal.track(items)
+    
+    items.append(1)
+    journal.undo()
+    items.append(2)
+    
+    assert not journal.can_redo
+#
+
+def test_untracked_changes_are_not_recorded(journal):
+    items = ObservableList()
+    journal.track(items)
+    journal.untrack(items)
+    
+    items.append(1)
+    
+    assert not journal.can_undo
+#
+
+@pytest.mark.parametrize('reorder', [lambda items: items.sort(reconcile = True), lambda items: items.reconcile([0, 5, 4, 3, 2])])
+def test_reconcile_is_a_single_undo_step(reorder):
+    items = ObservableList([5, 4, 3, 2, 1, 0])
+    journal = ChangeJournal(max_history = 3)
+    journal.track(items)
+    items.append(6)
+    mirror = CollectionMirror(items)
+    
+    reorder(items)
+    journal.undo()
+    
+    assert list(items) == [5, 4, 3, 2, 1, 0, 6]
+    mirror.check()
+    journal.redo()
+    reordered_items = list(items)
+    journal.undo()
+    journal.undo()
+    assert list(items) == [5, 4, 3, 2, 1, 0]
+    journal.redo()
+    journal.redo()
+    assert list(items) == reordered_items
+#
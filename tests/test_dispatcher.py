@@ -0,0 +1,106 @@
+import threading
+
+import pytest
+
+from mvvm_py import Event, QueuedDispatcher, ViewModel, bindable_property, set_dispatcher
+
+
+def raise_on_other_thread(dispatcher, event, args):
+    thread = threading.Thread(target = dispatcher.raise_event, args = (event, None, args))
+    thread.start()
+    thread.join()
+#
+
+
+def test_events_from_other_threads_are_queued():
+    scheduled = []
+    dispatcher = QueuedDispatcher(schedule_flush = lambda: scheduled.append(True))
+    calls = []
+    event = Event()
+    event += lambda sender, args: calls.append(args)
+    
+    raise_on_other_thread(dispatcher, event, 1)
+    raise_on_other_thread(dispatcher, event, 2)
+    
+    assert calls == []
+    assert len(scheduled) == 1
+    dispatcher.flush_all()
+    assert calls == [1, 2]
+#
+
+def test_coalesced_events_are_merged():
+    dispatcher = QueuedDispatcher()
+    calls = []
+    event = Event()
+    event += lambda sender, args: calls.append(args)
+    
+    for args in (1, 2):
+        thread = threading.Thread(target = dispatcher.raise_event, args = (event, None, args, 'key'))
+        thread.start()
+        thread.join()
+    dispatcher.flush_all()
+    
+    assert calls == [2]
+    assert dispatcher.coalesced_count == 1
+#
+
+def test_raising_handler_keeps_the_rest_of_the_batch_and_reschedules():
+    scheduled = []
+    dispatcher = QueuedDispatcher(schedule_flush = lambda: scheduled.append(True))
+    calls = []
+    
+    def handler(sender, args):
+        calls.append(args)
+        if args == 'bad':
+            raise RuntimeError(args)
+    #
+    event = Event()
+    event += handler
+    
+    for args in ('first', 'bad', 'last'):
+        raise_on_other_thread(dispatcher, event, args)
+    with pytest.raises(RuntimeError):
+        dispatcher.flush()
+    
+    assert calls == ['first', 'bad']
+    assert len(scheduled) == 2
+    
+    # The queue is still flowing:
+    raise_on_other_thread(dispatcher, event, 'later')
+    dispatcher.flush_all()
+    assert calls == ['first', 'bad', 'last', 'later']
+#
+
+def test_flush_raises_at_most_one_batch():
+    dispatcher = QueuedDispatcher(batch_size = 2)
+    calls = []
+    
+    thread = threading.Thread(target = lambda: [dispatcher.invoke(calls.append, index) for index in range(5)])
+    thread.start()
+    thread.join()
+    
+    assert dispatcher.flush() is True
+    assert calls == [0, 1]
+    dispatcher.flush_all()
+    assert calls == [0, 1, 2, 3, 4]
+#
+
+def test_view_model_notifications_from_other_threads_are_coalesced():
+    class Progress(ViewModel):
+        value = bindable_property()
+    #
+    dispatcher = QueuedDispatcher()
+    set_dispatcher(dispatcher)
+    progress = Progress()
+    notifications = []
+    progress.PropertyChanged += lambda sender, args: notifications.append(progress.value)
+    
+    progress.value = 0
+    thread = threading.Thread(target = lambda: [setattr(progress, 'value', value) for value in range(1, 100)])
+    thread.start()
+    thread.join()
+    assert notifications == [0]
+    
+    dispatcher.flush_all()
+    assert notifications == [0, 99]
+#
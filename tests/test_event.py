@@ -0,0 +1,132 @@
+import gc
+
+import pytest
+
+from mvvm_py import Event, WeakEvent, event
+
+
+class Listener(object):
+    def __init__(self, calls, name = None):
+        self.calls = calls
+        self.name = name
+    #
+    
+    def on_event(self, sender, args):
+        self.calls.append((self.name, args))
+    #
+#
+
+class Source(object):
+    Changed = event('Changed')
+    WeakChanged = event('WeakChanged', weak = True)
+#
+
+
+def test_event_calls_handlers_in_order():
+    calls = []
+    changed = Event()
+    changed += lambda sender, args: calls.append(1)
+    changed += lambda sender, args: calls.append(2)
+    
+    changed(None, None)
+    
+    assert calls == [1, 2]
+#
+
+def test_event_rejects_non_callable_handlers():
+    with pytest.raises(TypeError):
+        Event().__iadd__(42)
+#
+
+def test_event_property_creates_events_on_demand():
+    source = Source()
+    
+    assert isinstance(source.Changed, Event)
+    assert source.Changed is source.Changed
+    assert isinstance(source.WeakChanged, WeakEvent)
+    with pytest.raises(ValueError):
+        source.Changed = Event()
+#
+
+def test_weak_event_does_not_keep_listeners_alive():
+    calls = []
+    changed = WeakEvent()
+    listener = Listener(calls)
+    changed += listener.on_event
+    
+    changed(None, 1)
+    del listener
+    gc.collect()
+    changed(None, 2)
+    
+    assert len(calls) == 1
+    assert len(changed) == 0
+    # Dead handlers are pruned when the event is raised:
+    assert len(changed._handlers) == 0
+#
+
+def test_weak_event_counts_duplicate_subscriptions():
+    calls = []
+    changed = WeakEvent()
+    listener = Listener(calls)
+    changed += listener.on_event
+    changed += listener.on_event
+    
+    changed(None, 1)
+    changed -= listener.on_event
+    changed(None, 2)
+    
+    assert [args for _, args in calls] == [1, 1, 2]
+#
+
+def test_weak_event_removes_handlers_by_key():
+    calls = []
+    changed = WeakEvent()
+    listeners = [Listener(calls, index) for index in range(1000)]
+    for listener in listeners:
+        changed += listener.on_event
+    
+    for listener in listeners[1:]:
+        changed -= listener.on_event
+    changed(None, 1)
+    
+    assert calls == [(0, 1)]
+    assert len(changed._handlers) == 1
+#
+
+def test_weak_event_references_functions_strongly():
+    calls = []
+    changed = WeakEvent()
+    changed += lambda sender, args: calls.append(args)
+    gc.collect()
+    
+    changed(None, 1)
+    
+    assert calls == [1]
+#
+
+def test_weak_event_dispatches_from_a_snapshot():
+    calls = []
+    changed = WeakEvent()
+    
+    def late_handler(sender, args):
+        calls.append('late')
+    #
+    def first_handler(sender, args):
+        calls.append('first')
+        changed.__iadd__(late_handler)
+        changed.__isub__(second_handler)
+    #
+    def second_handler(sender, args):
+        calls.append('second')
+    #
+    changed += first_handler
+    changed += second_handler
+    
+    changed(None, None)
+    assert calls == ['first', 'second']
+    
+    del calls[:]
+    changed(None, None)
+    assert calls == ['first', 'late']
+#
@@ -0,0 +1,90 @@
+import logging
+
+import pytest
+
+from mvvm_py import (Event, LoggingSink, MemorySink, ObservableList, RelayCommand, ViewModel, bindable_property, disable_instrumentation,
+                     enable_instrumentation, instrumented, is_instrumentation_enabled, relay_command)
+
+
+class Person(ViewModel):
+    name = bindable_property()
+    surname = bindable_property()
+    full_name = bindable_property(lambda self: '{0} {1}'.format(self.name, self.surname), None, depends_on = ['name', 'surname'])
+    save_command = relay_command(lambda self: None, depends_on = 'name')
+#
+
+
+@pytest.fixture(autouse = True)
+def disable_after_test():
+    yield
+    disable_instrumentation()
+#
+
+
+def test_notifications_are_counted_per_class_and_name():
+    person = Person()
+    person.PropertyChanged += lambda sender, args: None
+    
+    with instrumented() as sink:
+        person.name = 'John'
+        person.surname = 'Doe'
+    
+    assert sink.property_changed_counts == {('Person', 'name'): 1, ('Person', 'surname'): 1, ('Person', 'full_name'): 2}
+    assert sink.can_execute_changed_counts == {('Person', 'save_command'): 1}
+    assert sink.get_class_counts('PropertyChanged') == {'Person': 4}
+    assert sink.fan_out_histograms == {('Person', 'name'): {2: 1}, ('Person', 'surname'): {1: 1}}
+    assert sink.handler_times[('Person', 'PropertyChanged')][0] == 4
+    assert 'PropertyChanged Person.full_name: 2' in sink.report()
+#
+
+def test_commands_are_counted_where_they_raise_can_execute_changed():
+    command = RelayCommand(lambda: None, name = 'standalone')
+    person = Person()
+    
+    with instrumented() as sink:
+        command.OnCanExecuteChanged()
+        person.save_command.OnCanExecuteChanged()
+    
+    assert sink.can_execute_changed_counts == {('RelayCommand', 'standalone'): 1, ('Person', 'save_command'): 1}
+#
+
+def test_collection_changes_are_counted_per_action():
+    items = ObservableList()
+    
+    with instrumented() as sink:
+        items.append(1)
+        items.append(2)
+        items.reverse()
+    
+    assert sink.collection_changed_counts == {('ObservableList', 'Add'): 2, ('ObservableList', 'Reset'): 1}
+#
+
+def test_disabling_restores_original_methods():
+    original_methods = (ViewModel.__dict__['OnPropertyChanged'], Event.__dict__['__call__'], ObservableList.__dict__['OnCollectionChanged'])
+    
+    enable_instrumentation(MemorySink())
+    assert is_instrumentation_enabled()
+    assert ViewModel.__dict__['OnPropertyChanged'] is not original_methods[0]
+    # Enabling again only replaces the sink:
+    enable_instrumentation(MemorySink())
+    disable_instrumentation()
+    
+    assert not is_instrumentation_enabled()
+    assert (ViewModel.__dict__['OnPropertyChanged'], Event.__dict__['__call__'], ObservableList.__dict__['OnCollectionChanged']) == original_methods
+#
+
+def test_sinks_must_be_callable():
+    with pytest.raises(TypeError):
+        enable_instrumentation(42)
+    assert not is_instrumentation_enabled()
+#
+
+def test_logging_sink(caplog):
+    person = Person()
+    
+    with caplog.at_level(logging.DEBUG, logger = 'mvvm_py.instrumentation'):
+        with instrumented(LoggingSink()):
+            person.surname = 'Doe'
+    
+    assert 'PropertyChanged Person.surname: 1' in caplog.text
+#
@@ -0,0 +1,74 @@
+from mvvm_py import CollectionListView, ObservableDict, ObservableSet
+from mvvm_py.backend import NotifyCollectionChangedAction
+from mirror import CollectionMirror
+
+
+def record_changes(collection):
+    changes = []
+    collection.Changed += lambda sender, args: changes.append(args)
+    return changes
+#
+
+
+def test_dict_bulk_update_raises_one_event():
+    items = ObservableDict(a = 1)
+    changes = record_changes(items)
+    
+    items.update(a = 2, b = 3)
+    
+    assert len(changes) == 1
+    assert changes[0].added == {'b': 3}
+    assert changes[0].replaced == {'a': (1, 2)}
+#
+
+def test_set_bulk_operations_raise_one_event_each():
+    items = ObservableSet([1, 2, 3])
+    changes = record_changes(items)
+    
+    items |= set([4, 5])
+    items.difference_update([1, 2])
+    items.clear()
+    
+    assert [(sorted(change.added), sorted(change.removed)) for change in changes] == [([4, 5], []), ([], [1, 2]), ([], [3, 4, 5])]
+#
+
+def test_dict_list_view_replays_changes():
+    items = ObservableDict((key, key * 10) for key in range(20))
+    view = items.as_list()
+    mirror = CollectionMirror(view)
+    
+    del items[3]
+    items[5] = -5
+    items.update((key, key) for key in range(15, 25))
+    items.pop(0)
+    
+    mirror.check()
+    assert sorted(view) == sorted(items.values())
+    items.clear()
+    assert mirror.actions[-1] == NotifyCollectionChangedAction.Reset
+    mirror.check()
+#
+
+def test_set_list_view_index():
+    items = ObservableSet(range(10))
+    view = items.as_list()
+    
+    items.discard(4)
+    items.add(42)
+    
+    for item in items:
+        assert view[view.index(item)] == item
+#
+
+def test_list_view_resets_for_multiple_added_items_above_threshold(monkeypatch):
+    monkeypatch.setattr(CollectionListView, 'reset_threshold', 1)
+    items = ObservableSet([1])
+    view = items.as_list()
+    mirror = CollectionMirror(view)
+    
+    items.add(2)
+    items.update([3, 4])
+    
+    assert mirror.actions == [NotifyCollectionChangedAction.Add, NotifyCollectionChangedAction.Reset]
+    mirror.check()
+#
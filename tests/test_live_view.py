@@ -0,0 +1,109 @@
+import random
+
+import pytest
+
+from mvvm_py import LiveView, ObservableList, ViewModel, bindable_property
+from mvvm_py import live_view
+from mvvm_py.backend import NotifyCollectionChangedAction
+from mirror import CollectionMirror
+
+Add, Reset = NotifyCollectionChangedAction.Add, NotifyCollectionChangedAction.Reset
+
+
+class Item(ViewModel):
+    value = bindable_property()
+    
+    def __init__(self, value):
+        super(Item, self).__init__()
+        
+        self.value = value
+    #
+    
+    def __repr__(self):
+        return 'Item({0})'.format(self.value)
+    #
+#
+
+def is_even(item):
+    return item.value % 2 == 0
+#
+
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    monkeypatch.setattr(live_view._SourcePositions, 'block_size', 3)
+#
+
+
+@pytest.mark.parametrize('sort', [False, True])
+@pytest.mark.parametrize('seed', range(10))
+def test_view_follows_source_and_item_changes(small_blocks, sort, seed):
+    random = _random(seed)
+    pool = [Item(random.randint(0, 9)) for _ in range(12)]
+    source = ObservableList(random.choice(pool) for _ in range(random.randint(0, 25)))
+    view = LiveView(source, filter = is_even, key = (lambda item: item.value) if sort else None, depends_on = 'value')
+    mirror = CollectionMirror(view)
+    
+    for _ in range(60):
+        count = len(source)
+        operation = random.randint(0, 5)
+        if operation == 0:
+            source.insert(random.randint(0, count), random.choice(pool))
+        elif operation == 1 and count:
+            source.pop(random.randrange(count))
+        elif operation == 2:
+            source.insert_range(random.randint(0, count), [random.choice(pool) for _ in range(random.randint(1, 8))])
+        elif operation == 3 and count:
+            source.move(random.randrange(count), random.randrange(count))
+        elif operation == 4 and count:
+            source[random.randrange(count)] = random.choice(pool)
+        else:
+            random.choice(pool).value = random.randint(0, 9)
+        
+        expected = [item for item in source if is_even(item)]
+        if sort:
+            assert [item.value for item in view] == sorted(item.value for item in expected)
+            assert sorted(view, key = id) == sorted(expected, key = id)
+        else:
+            assert list(view) == expected
+        mirror.check()
+#
+
+def test_empty_property_name_refilters_items():
+    item = Item(2)
+    view = LiveView(ObservableList([item]), filter = is_even, depends_on = 'value')
+    
+    item._value = 3
+    item.OnPropertyChanged('')
+    
+    assert len(view) == 0
+#
+
+def test_detach_stops_updates():
+    source = ObservableList([Item(2)])
+    view = LiveView(source, filter = is_even)
+    
+    view.detach()
+    source.append(Item(4))
+    
+    assert len(view) == 1
+#
+
+
+def _random(seed):
+    return random.Random(seed)
+#
+
+def test_multiple_item_changes_above_threshold_raise_reset(monkeypatch):
+    monkeypatch.setattr(LiveView, 'reset_threshold', 1)
+    source = ObservableList([Item(1)], reset_threshold = None)
+    view = LiveView(source, filter = is_even)
+    mirror = CollectionMirror(view)
+    
+    source.insert_range(0, [Item(2), Item(3)])
+    source.insert_range(0, [Item(4), Item(6)])
+    source.remove_range(0, 3)
+    
+    assert mirror.actions == [Add, Reset, Reset]
+    mirror.check()
+#
@@ -0,0 +1,279 @@
+import random
+
+import pytest
+
+from mvvm_py import ChangeJournal, ObservableList
+from mvvm_py import observable_list
+from mvvm_py.backend import NotifyCollectionChangedAction
+from mirror import CollectionMirror
+
+Add, Remove, Replace, Move, Reset = (NotifyCollectionChangedAction.Add, NotifyCollectionChangedAction.Remove, NotifyCollectionChangedAction.Replace,
+                                     NotifyCollectionChangedAction.Move, NotifyCollectionChangedAction.Reset)
+
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    '''Makes the item index split its blocks early, so small lists have many blocks.'''
+    monkeypatch.setattr(observable_list._ItemIndex, 'block_size', 4)
+#
+
+
+def test_list_operations_raise_notifications():
+    items = ObservableList(range(5))
+    mirror = CollectionMirror(items)
+    
+    items.append(5)
+    items.insert(-1, 6)
+    items.pop(0)
+    items.remove(3)
+    items[0] = 7
+    del items[-1]
+    items.move(0, 2)
+    items.reverse()
+    
+    assert mirror.actions == [Add, Add, Remove, Remove, Replace, Remove, Move, Reset]
+    mirror.check()
+#
+
+def test_range_operations_raise_one_notification():
+    items = ObservableList(range(10))
+    mirror = CollectionMirror(items)
+    
+    items.add_range([10, 11])
+    items.insert_range(0, [-2, -1])
+    items.remove_range(3, 4)
+    items.extend([12, 13])
+    items += [14]
+    del items[0:2]
+    items[0:2] = ['a', 'b']
+    
+    assert mirror.actions == [Add, Add, Remove, Add, Add, Remove, Replace]
+    mirror.check()
+#
+
+def test_remove_all():
+    items = ObservableList(range(10))
+    mirror = CollectionMirror(items)
+    
+    assert items.remove_all(lambda item: 3 <= item < 6) == 3
+    assert items.remove_all(lambda item: item % 2 == 0) == 4
+    assert items.remove_all(lambda item: item > 100) == 0
+    
+    assert list(items) == [1, 7, 9]
+    assert mirror.actions == [Remove, Reset]
+    mirror.check()
+#
+
+def test_multiple_item_changes_above_threshold_raise_reset():
+    items = ObservableList(range(10), reset_threshold = 1)
+    mirror = CollectionMirror(items)
+    
+    items.add_range([10])
+    items.add_range([11, 12])
+    items.remove_range(0, 2)
+    del items[0:1]
+    items[0:2] = ['a', 'b']
+    
+    assert mirror.actions == [Add, Reset, Reset, Remove, Reset]
+    mirror.check()
+#
+
+def test_class_threshold_applies_to_new_lists(monkeypatch):
+    monkeypatch.setattr(ObservableList, 'reset_threshold', 1)
+    items = ObservableList(range(10))
+    unlimited_items = ObservableList(range(10), reset_threshold = None)
+    mirror, unlimited_mirror = CollectionMirror(items), CollectionMirror(unlimited_items)
+    
+    items.insert_range(0, [1, 2])
+    unlimited_items.insert_range(0, [1, 2])
+    
+    assert mirror.actions == [Reset]
+    assert unlimited_mirror.actions == [Add]
+#
+
+def test_reset_from_range_operation_can_be_undone():
+    items = ObservableList(range(5), reset_threshold = 1)
+    journal = ChangeJournal()
+    journal.track(items)
+    
+    items.insert_range(2, ['a', 'b'])
+    journal.undo()
+    
+    assert list(items) == [0, 1, 2, 3, 4]
+#
+
+@pytest.mark.parametrize('seed', range(20))
+def test_reconcile_notifications_replay_to_new_items(seed):
+    random = _random(seed)
+    items = ObservableList(random.sample(range(50), 30))
+    mirror = CollectionMirror(items)
+    
+    for _ in range(10):
+        new_items = random.sample(range(50), random.randint(0, 40))
+        items.reconcile(new_items)
+        assert list(items) == new_items
+        mirror.check()
+#
+
+def test_reconcile_moves_instead_of_resetting():
+    items = ObservableList(range(10))
+    mirror = CollectionMirror(items)
+    
+    items.reconcile([0, 1, 2, 9, 3, 4, 5, 6, 7, 8])
+    
+    assert mirror.actions == [Move]
+    mirror.check()
+#
+
+def test_reconcile_matches_items_by_key():
+    old_items = [{'id': index, 'name': str(index)} for index in range(5)]
+    new_items = [{'id': 4, 'name': 'four'}, old_items[0], old_items[1], old_items[2]]
+    items = ObservableList(old_items)
+    mirror = CollectionMirror(items)
+    
+    items.reconcile(new_items, key = lambda item: item['id'])
+    
+    assert list(items) == new_items
+    assert mirror.actions == [Remove, Move, Replace]
+    mirror.check()
+#
+
+def test_reconcile_resets_for_duplicate_or_unhashable_keys():
+    items = ObservableList([1, 2, 3])
+    mirror = CollectionMirror(items)
+    
+    items.reconcile([1, 1, 2])
+    items.reconcile([[1], 2])
+    
+    assert mirror.actions == [Reset, Reset]
+    mirror.check()
+#
+
+def test_reconcile_resets_when_most_items_move():
+    items = ObservableList(range(1000))
+    mirror = CollectionMirror(items)
+    
+    items.reconcile(list(reversed(items)))
+    
+    assert mirror.actions == [Reset]
+    mirror.check()
+#
+
+def test_reconcile_applies_small_edit_scripts_to_short_lists():
+    items = ObservableList(range(4))
+    mirror = CollectionMirror(items)
+    
+    items.reconcile([3, 2, 1, 0])
+    
+    assert Reset not in mirror.actions
+    mirror.check()
+#
+
+def test_sort_with_reconcile():
+    items = ObservableList([3, 1, 2])
+    mirror = CollectionMirror(items)
+    
+    items.sort(reconcile = True)
+    
+    assert list(items) == [1, 2, 3]
+    assert mirror.actions == [Move]
+    mirror.check()
+#
+
+def test_multiplying_list_adds_copies():
+    items = ObservableList([1, 2], indexed = True)
+    mirror = CollectionMirror(items)
+    
+    items *= 1
+    items *= 3
+    
+    assert list(items) == [1, 2] * 3
+    assert items.count(2) == 3
+    assert mirror.actions == [Add]
+    mirror.check()
+#
+
+@pytest.mark.parametrize('clear', [lambda items: items.clear(), lambda items: items.__imul__(0), lambda items: items.__imul__(-1)])
+def test_clearing_list_updates_index_views_and_journal(clear):
+    items = ObservableList([1, 2, 3], indexed = True)
+    mirror = CollectionMirror(items)
+    journal = ChangeJournal()
+    journal.track(items)
+    
+    clear(items)
+    
+    assert list(items) == []
+    assert 1 not in items
+    assert items.count(1) == 0
+    mirror.check()
+    journal.undo()
+    assert list(items) == [1, 2, 3]
+    assert items.index(3) == 2
+#
+
+@pytest.mark.parametrize('seed', range(20))
+def test_indexed_lookups_match_list(small_blocks, seed):
+    random = _random(seed)
+    items = ObservableList([random.randint(0, 20) for _ in range(random.randint(0, 30))], indexed = True)
+    mirror = CollectionMirror(items)
+    
+    for _ in range(50):
+        _mutate(items, random)
+        mirror.check()
+        plain = list(items)
+        for item in range(22):
+            assert (item in items) == (item in plain)
+            assert items.count(item) == plain.count(item)
+            if item in plain:
+                assert items.index(item) == plain.index(item)
+#
+
+def test_indexed_list_accepts_unhashable_items():
+    items = ObservableList([[1]], indexed = True)
+    mirror = CollectionMirror(items)
+    
+    items.append([3])
+    items.append(2)
+    
+    mirror.check()
+    assert items.index([3]) == 1
+    assert items.count([3]) == 1
+    assert [1] in items
+    assert items.index(2) == 2
+    items.remove([1])
+    assert items.index(2) == 1
+#
+
+
+def _random(seed):
+    return random.Random(seed)
+#
+
+def _mutate(items, random):
+    '''Applies a random change to the given list.'''
+    count = len(items)
+    operation = random.randint(0, 10)
+    if operation == 0:
+        items.append(random.randint(0, 20))
+    elif operation == 1:
+        items.insert(random.randint(0, count), random.randint(0, 20))
+    elif operation == 2 and count:
+        items.pop(random.randrange(count))
+    elif operation == 3:
+        items.insert_range(random.randint(0, count), [random.randint(0, 20) for _ in range(random.randint(1, 10))])
+    elif operation == 4 and count:
+        start = random.randint(0, count)
+        del items[start:random.randint(start, count)]
+    elif operation == 5 and count:
+        items[random.randrange(count)] = random.randint(0, 20)
+    elif operation == 6 and count:
+        items.move(random.randrange(count), random.randrange(count))
+    elif operation == 7:
+        items.reconcile(random.sample(range(21), random.randint(0, 15)))
+    elif operation == 8:
+        items.sort(reconcile = random.random() < 0.5)
+    elif operation == 9 and count < 20:
+        items *= random.randint(-1, 2)
+    elif operation == 10 and random.random() < 0.2:
+        items.clear()
+#
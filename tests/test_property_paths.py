@@ -0,0 +1,103 @@
+import gc
+import weakref
+
+from mvvm_py import ViewModel, bindable_property, relay_command
+
+
+class Customer(ViewModel):
+    name = bindable_property()
+    address = bindable_property()
+#
+
+class Address(ViewModel):
+    city = bindable_property()
+#
+
+class Order(ViewModel):
+    customer = bindable_property()
+    title = bindable_property(lambda self: self.customer.name if self.customer else None, None, depends_on = 'customer.name')
+    city = bindable_property(lambda self: self.customer.address.city, None, depends_on = 'customer.address.city', cached = True)
+    ship_command = relay_command(lambda self: None, lambda self: self.customer is not None and self.customer.name is not None,
+                                 depends_on = 'customer.name')
+#
+
+def record_notifications(view_model):
+    notifications = []
+    view_model.PropertyChanged += lambda sender, args: notifications.append(args.PropertyName)
+    view_model.ship_command.CanExecuteChanged += lambda sender, args: notifications.append('ship_command')
+    return notifications
+#
+
+
+def test_changes_along_a_path_notify_dependents():
+    customer = Customer()
+    order = Order()
+    order.customer = customer
+    notifications = record_notifications(order)
+    
+    customer.name = 'John'
+    
+    assert notifications == ['title', 'ship_command']
+    assert order.title == 'John'
+#
+
+def test_replacing_an_object_on_the_path_moves_the_subscription():
+    old_customer, new_customer = Customer(), Customer()
+    order = Order()
+    order.customer = old_customer
+    order.customer = new_customer
+    notifications = record_notifications(order)
+    
+    old_customer.name = 'Old'
+    assert notifications == []
+    
+    new_customer.name = 'New'
+    assert notifications == ['title', 'ship_command']
+#
+
+def test_nested_paths_invalidate_cached_values():
+    address = Address()
+    address.city = 'Paris'
+    customer = Customer()
+    customer.address = address
+    order = Order()
+    order.customer = customer
+    assert order.city == 'Paris'
+    notifications = record_notifications(order)
+    
+    address.city = 'Rome'
+    assert order.city == 'Rome'
+    
+    new_address = Address()
+    new_address.city = 'Oslo'
+    customer.address = new_address
+    address.city = 'Lima'
+    assert order.city == 'Oslo'
+    assert notifications == ['city', 'city']
+#
+
+def test_property_changed_with_empty_name_notifies_all_paths():
+    customer = Customer()
+    order = Order()
+    order.customer = customer
+    notifications = record_notifications(order)
+    
+    customer.OnPropertyChanged('')
+    
+    assert sorted(notifications) == ['city', 'ship_command', 'title']
+#
+
+def test_objects_on_the_path_do_not_keep_the_view_model_alive():
+    customer = Customer()
+    order = Order()
+    order.customer = customer
+    reference = weakref.ref(order)
+    
+    del order
+    gc.collect()
+    assert reference() is None
+    
+    # The subscription removes itself when it is notified after the view model has been collected:
+    customer.name = 'John'
+    assert len(customer.PropertyChanged._handlers) == 0
+#
@@ -0,0 +1,81 @@
+from mvvm_py import RelayCommand, ViewModel, bindable_property, defer_notifications, relay_command
+
+
+class Editor(ViewModel):
+    def can_save(self, path):
+        self.can_save_calls += 1
+        return bool(self.text)
+    #
+    
+    def save(self, path):
+        self.saved_paths.append(path)
+    #
+    
+    text = bindable_property()
+    save_command = relay_command(save, can_save, depends_on = 'text', cache_can_execute = True)
+    clear_command = relay_command(lambda self: setattr(self, 'text', ''))
+    deferred_save_command = relay_command(defer_notifications(save))
+    
+    def __init__(self):
+        super(Editor, self).__init__()
+        
+        self.can_save_calls = 0
+        self.saved_paths = []
+    #
+#
+
+
+def test_command_arity_is_detected():
+    calls = []
+    
+    RelayCommand(lambda: calls.append('none')).Execute('ignored')
+    RelayCommand(lambda parameter: calls.append(parameter)).Execute('parameter')
+    editor = Editor()
+    editor.save_command.Execute('a.txt')
+    editor.deferred_save_command.Execute('b.txt')
+    editor.clear_command.Execute(None)
+    
+    assert calls == ['none', 'parameter']
+    assert editor.saved_paths == ['a.txt', 'b.txt']
+    assert editor.text == ''
+#
+
+def test_can_execute_result_is_cached_until_can_execute_changed():
+    editor = Editor()
+    command = editor.save_command
+    
+    assert not command.CanExecute(None)
+    assert not command.CanExecute(None)
+    assert editor.can_save_calls == 1
+    
+    editor.text = 'hello'
+    assert command.CanExecute(None)
+    assert command.CanExecute(None)
+    assert editor.can_save_calls == 2
+#
+
+def test_cached_result_is_only_used_for_the_same_parameter():
+    calls = []
+    
+    def can_execute(parameter):
+        calls.append(parameter)
+        return parameter is not None
+    #
+    command = RelayCommand(lambda parameter: None, can_execute, cacheCanExecute = True)
+    parameter = object()
+    
+    assert command.CanExecute(parameter)
+    assert command.CanExecute(parameter)
+    assert not command.CanExecute(None)
+    assert calls == [parameter, None]
+#
+
+def test_can_execute_is_not_cached_by_default():
+    calls = []
+    command = RelayCommand(lambda: None, lambda: calls.append(1) or True)
+    
+    command.CanExecute(None)
+    command.CanExecute(None)
+    
+    assert len(calls) == 2
+#
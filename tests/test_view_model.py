@@ -0,0 +1,403 @@
+import pytest
+
+from mvvm_py import (FakeTimerSource, QueuedDispatcher, ViewModel, bindable_property, defer_notifications, deferred_notifications,
+                     relay_command, set_dispatcher, set_timer_source)
+
+
+class Person(ViewModel):
+    name = bindable_property()
+    surname = bindable_property(default = '')
+    full_name = bindable_property(lambda self: '{0} {1}'.format(self.name, self.surname), None, depends_on = ['name', 'surname'])
+    greeting = bindable_property(lambda self: 'Hello, ' + self.full_name, None, depends_on = 'full_name')
+    save_command = relay_command(lambda self: None, lambda self: bool(self.name), depends_on = 'name')
+    
+    def set_names(self, name, surname):
+        self.name = name
+        self.surname = surname
+    #
+    set_names_deferred = defer_notifications(set_names)
+#
+
+class Rectangle(ViewModel):
+    def get_size(self):
+        return (self.width, self.height)
+    #
+    
+    def set_size(self, size):
+        self.width, self.height = size
+    #
+    
+    width = bindable_property(default = 0)
+    height = bindable_property(default = 0)
+    size = bindable_property(get_size, set_size, depends_on = ['width', 'height'])
+    area = bindable_property(lambda self: self.width * self.height, None, depends_on = 'size')
+#
+
+def record_notifications(view_model, *command_names):
+    notifications = []
+    view_model.PropertyChanged += lambda sender, args: notifications.append(args.PropertyName)
+    for command_name in command_names:
+        getattr(view_model, command_name).CanExecuteChanged += lambda sender, args, command_name = command_name: notifications.append(command_name)
+    return notifications
+#
+
+
+def test_dependents_are_notified_in_dependency_order():
+    person = Person()
+    notifications = record_notifications(person, 'save_command')
+    
+    person.name = 'John'
+    
+    assert notifications == ['name', 'full_name', 'greeting', 'save_command']
+#
+
+def test_setter_that_sets_other_properties_notifies_each_property_once():
+    rectangle = Rectangle()
+    notifications = record_notifications(rectangle)
+    
+    rectangle.size = (2, 3)
+    
+    assert sorted(notifications) == ['area', 'height', 'size', 'width']
+    assert rectangle.area == 6
+#
+
+def test_deferred_notifications_are_raised_once_in_dependency_order():
+    person = Person()
+    notifications = record_notifications(person, 'save_command')
+    
+    with person.deferred_notifications():
+        person.set_names('John', 'Doe')
+        person.name = 'Jack'
+        assert notifications == []
+    
+    # Independent properties come first, in no particular order:
+    assert sorted(notifications[:2]) == ['name', 'surname']
+    assert notifications[2:] == ['full_name', 'greeting', 'save_command']
+#
+
+def test_nested_deferral_raises_when_outermost_context_exits():
+    first, second = Person(), Person()
+    first_notifications, second_notifications = record_notifications(first), record_notifications(second)
+    
+    with deferred_notifications(first, second):
+        with first.deferred_notifications():
+            first.name = 'John'
+        assert first_notifications == []
+        second.surname = 'Doe'
+    
+    assert first_notifications == ['name', 'full_name', 'greeting']
+    assert second_notifications == ['surname', 'full_name', 'greeting']
+#
+
+def test_defer_notifications_decorator():
+    person = Person()
+    notifications = record_notifications(person)
+    
+    person.set_names_deferred('John', 'Doe')
+    
+    assert sorted(notifications[:2]) == ['name', 'surname']
+    assert notifications[2:] == ['full_name', 'greeting']
+#
+
+class Settings(ViewModel):
+    compare_values = 'equality'
+    
+    title = bindable_property()
+    heading = bindable_property(lambda self: (self.title or '').upper(), None, depends_on = 'title')
+    items = bindable_property(compare = 'identity')
+    count = bindable_property(compare = lambda old, new: int(old or 0) == int(new))
+    always = bindable_property(compare = None)
+#
+
+def test_setting_an_equal_value_is_skipped():
+    settings = Settings()
+    settings.title = 'a'
+    notifications = record_notifications(settings)
+    
+    settings.title = 'a'
+    
+    assert notifications == []
+    # The property itself and its dependent:
+    assert settings.suppressed_notifications == 2
+#
+
+def test_property_comparison_overrides_class_comparison():
+    settings = Settings()
+    settings.items = []
+    settings.count = 3
+    notifications = record_notifications(settings)
+    
+    settings.items = []
+    settings.count = '3'
+    settings.always = None
+    settings.always = None
+    
+    assert notifications == ['items', 'always', 'always']
+    assert settings.count == 3
+#
+
+def test_values_are_not_compared_by_default():
+    person = Person()
+    notifications = record_notifications(person)
+    
+    person.surname = ''
+    
+    assert notifications == ['surname', 'full_name', 'greeting']
+    assert person.suppressed_notifications == 0
+#
+
+class Wrapped(object):
+    def __init__(self):
+        self.name = None
+    #
+#
+
+class Row(ViewModel):
+    generate_slots = True
+    __slots__ = ('wrapped_object',)
+    
+    name = bindable_property()
+    size = bindable_property(backing_field = '_storage')
+    wrapped_name = bindable_property(backing_field = 'wrapped_object.name')
+    select_command = relay_command(lambda self: None)
+    
+    def __init__(self):
+        super(Row, self).__init__()
+        
+        self.wrapped_object = Wrapped()
+    #
+#
+
+class DerivedRow(Row):
+    description = bindable_property(default = '')
+#
+
+def test_generated_slots_store_backing_fields():
+    row = Row()
+    notifications = record_notifications(row)
+    
+    row.name = 'a'
+    row.size = 3
+    row.wrapped_name = 'b'
+    
+    assert not hasattr(row, '__dict__')
+    assert sorted(Row.__slots__) == ['__weakref__', '_name', '_select_command', '_storage', 'wrapped_object']
+    assert (row._name, row._storage, row.wrapped_object.name) == ('a', 3, 'b')
+    assert notifications == ['name', 'size', 'wrapped_name']
+    with pytest.raises(AttributeError):
+        row.other = 1
+#
+
+def test_generate_slots_is_inherited():
+    row = DerivedRow()
+    
+    row.description = 'c'
+    
+    assert not hasattr(row, '__dict__')
+    assert DerivedRow.__slots__ == ('_description',)
+    assert row.description == 'c'
+    assert row.name is None
+#
+
+def test_view_models_without_slots_have_a_dict():
+    person = Person()
+    
+    person.name = 'John'
+    
+    assert person.__dict__['_name'] == 'John'
+#
+
+class Order(ViewModel):
+    def compute_total(self):
+        self.computations += 1
+        return self.price * self.quantity
+    #
+    
+    price = bindable_property(default = 0)
+    quantity = bindable_property(default = 1)
+    total = bindable_property(compute_total, None, depends_on = ['price', 'quantity'], cached = True)
+    label = bindable_property(lambda self: 'Total: {0}'.format(self.total), None, depends_on = 'total', cached = True)
+    
+    def __init__(self):
+        super(Order, self).__init__()
+        
+        self.computations = 0
+    #
+#
+
+def test_cached_property_is_computed_once_until_a_dependency_changes():
+    order = Order()
+    order.price = 2
+    
+    assert order.total == 2
+    assert order.total == 2
+    assert order.computations == 1
+    
+    order.quantity = 3
+    assert order.label == 'Total: 6'
+    assert order.total == 6
+    assert order.computations == 2
+#
+
+def test_handlers_see_recomputed_values():
+    order = Order()
+    values = []
+    order.label
+    order.PropertyChanged += lambda sender, args: values.append((args.PropertyName, getattr(order, args.PropertyName)))
+    
+    order.price = 5
+    
+    assert values == [('price', 5), ('total', 5), ('label', 'Total: 5')]
+#
+
+def test_cache_statistics_count_hits_and_misses():
+    before = Order.get_cache_statistics()
+    order = Order()
+    
+    order.total
+    order.total
+    order.label
+    
+    after = Order.get_cache_statistics()
+    assert sorted(after) == ['label', 'total']
+    assert after['total'][0] - before['total'][0] == 2
+    assert after['total'][1] - before['total'][1] == 1
+    assert after['label'][1] - before['label'][1] == 1
+#
+
+def test_circular_dependencies_are_rejected():
+    with pytest.raises(ValueError) as error:
+        class Circular(ViewModel):
+            a = bindable_property(depends_on = 'c')
+            b = bindable_property(depends_on = 'a')
+            c = bindable_property(depends_on = 'b')
+        #
+    assert 'a -> b -> c -> a' in str(error.value)
+#
+
+def test_unknown_dependencies_are_rejected():
+    with pytest.raises(ValueError):
+        class Unknown(ViewModel):
+            a = bindable_property(depends_on = 'missing')
+        #
+#
+
+def test_subclasses_without_new_members_share_metadata():
+    class Employee(Person):
+        def greet(self):
+            return self.greeting
+        #
+    #
+    class Manager(Employee):
+        reports = bindable_property(default = ())
+    #
+    
+    assert Employee._metadata is Person._metadata
+    assert Manager._metadata is not Person._metadata
+    assert set(Manager._bindable_properties) == set(Person._bindable_properties) | set(['reports'])
+    
+    employee = Employee()
+    notifications = record_notifications(employee)
+    employee.name = 'John'
+    assert notifications == ['name', 'full_name', 'greeting']
+#
+
+def test_subclasses_can_override_and_hide_members():
+    class Nickname(Person):
+        full_name = bindable_property(lambda self: self.name, None, depends_on = 'name')
+        save_command = None
+    #
+    nickname = Nickname()
+    notifications = record_notifications(nickname)
+    
+    nickname.surname = 'Doe'
+    nickname.name = 'Johnny'
+    
+    assert notifications == ['surname', 'name', 'full_name', 'greeting']
+    assert 'save_command' not in Nickname._metadata.commands
+#
+
+def test_mixin_members_are_included():
+    class Named(object):
+        label = bindable_property(default = '')
+    #
+    class Labelled(Named, ViewModel):
+        upper_label = bindable_property(lambda self: self.label.upper(), None, depends_on = 'label')
+    #
+    labelled = Labelled()
+    notifications = record_notifications(labelled)
+    
+    labelled.label = 'a'
+    
+    assert notifications == ['label', 'upper_label']
+    assert labelled.upper_label == 'A'
+#
+
+class Search(ViewModel):
+    search_text = bindable_property(debounce = 0.5)
+    progress = bindable_property(throttle = 1.0)
+    search_result = bindable_property(lambda self: (self.search_text or '').upper(), None, depends_on = 'search_text', cached = True)
+    search_command = relay_command(lambda self: None, lambda self: bool(self.search_text), depends_on = 'search_text')
+#
+
+@pytest.fixture
+def timers():
+    timers = FakeTimerSource()
+    set_timer_source(timers)
+    return timers
+#
+
+def test_debounced_property_notifies_once_value_is_stable(timers):
+    search = Search()
+    notifications = record_notifications(search, 'search_command')
+    
+    search.search_text = 'a'
+    timers.advance(0.25)
+    search.search_text = 'ab'
+    
+    # The value and cached dependents are up to date immediately:
+    assert search.search_text == 'ab'
+    assert search.search_result == 'AB'
+    timers.advance(0.375)
+    assert notifications == []
+    
+    timers.advance(0.125)
+    assert notifications == ['search_text', 'search_result', 'search_command']
+    assert timers.pending_count == 0
+#
+
+def test_throttled_property_notifies_at_most_once_per_interval(timers):
+    search = Search()
+    notifications = record_notifications(search)
+    
+    for progress in range(10):
+        search.progress = progress
+        timers.advance(0.25)
+    timers.advance(2)
+    
+    # At 0 (leading edge), and then at the end of each interval:
+    assert notifications == ['progress'] * 4
+#
+
+def test_flush_notifications_raises_pending_notifications(timers):
+    search = Search()
+    notifications = record_notifications(search, 'search_command')
+    
+    search.search_text = 'a'
+    search.flush_notifications()
+    timers.advance(1)
+    
+    assert notifications == ['search_text', 'search_result', 'search_command']
+#
+
+def test_background_timers_require_a_dispatcher_with_target_thread():
+    search = Search()
+    
+    with pytest.raises(RuntimeError):
+        search.search_text = 'a'
+    assert search.search_text is None
+    
+    set_dispatcher(QueuedDispatcher())
+    search.search_text = 'a'
+    assert search.search_text == 'a'
+#
@@ -0,0 +1,132 @@
+import pytest
+
+from mvvm_py import VirtualObservableList
+from mvvm_py.backend import NotifyCollectionChangedAction
+
+
+class Loader(object):
+    '''Loads the numbers of the requested range, and keeps track of the requested pages.'''
+    
+    def __init__(self):
+        self.requests = []
+    #
+    
+    def __call__(self, start, count):
+        self.requests.append((start, count))
+        return list(range(start, start + count))
+    #
+#
+
+def create_list(count = 1000, **kwargs):
+    loader = Loader()
+    return VirtualObservableList(count, loader, **kwargs), loader
+#
+
+
+def test_items_are_loaded_one_page_at_a_time():
+    items, loader = create_list(95, page_size = 10)
+    
+    assert len(items) == 95
+    assert items[12] == 12
+    assert items[15] == 15
+    assert items[-1] == 94
+    assert loader.requests == [(10, 10), (90, 5)]
+    assert items.statistics['page_hits'] == 1
+    assert items.statistics['page_misses'] == 2
+    with pytest.raises(IndexError):
+        items[95]
+#
+
+def test_least_recently_used_pages_are_evicted():
+    items, loader = create_list(page_size = 10, max_pages = 2)
+    
+    items[0]
+    items[10]
+    items[0]
+    items[20]
+    items[0]
+    items[10]
+    
+    assert loader.requests == [(0, 10), (10, 10), (20, 10), (10, 10)]
+    assert items.statistics['pages_evicted'] == 2
+    assert items.statistics['pages_cached'] == 2
+#
+
+def test_neighbouring_pages_are_prefetched():
+    items, loader = create_list(page_size = 10, prefetch = 1)
+    
+    items[50]
+    items[45]
+    items[75]
+    
+    assert loader.requests == [(50, 10), (60, 10), (40, 10), (70, 10), (80, 10)]
+    assert items.statistics['page_hits'] == 1
+#
+
+def test_prefetch_is_limited_to_max_pages():
+    items, loader = create_list(page_size = 10, max_pages = 2, prefetch = 2)
+    
+    items[500]
+    
+    assert loader.requests == [(500, 10), (510, 10)]
+    assert items.statistics['pages_evicted'] == 0
+#
+
+def test_prefetch_keeps_loaded_neighbours():
+    items, loader = create_list(page_size = 10, max_pages = 4, prefetch = 1)
+    
+    items[500]
+    items[200]
+    items[510]
+    
+    # Page 50 is kept as a neighbour of page 51, so older pages are evicted instead:
+    assert items[505] == 505
+    assert loader.requests == [(500, 10), (510, 10), (490, 10), (200, 10), (210, 10), (190, 10), (510, 10), (520, 10)]
+#
+
+def test_index_searches_loaded_pages_and_find_index():
+    items, loader = create_list(page_size = 10, find_index = lambda item: item if item < 1000 else None)
+    items[25]
+    
+    assert items.index(27) == 27
+    assert items.index(700) == 700
+    assert 999 in items
+    assert 1000 not in items
+    with pytest.raises(ValueError):
+        items.index(1000)
+    assert loader.requests == [(20, 10)]
+#
+
+def test_update_item_and_refresh_raise_notifications():
+    items, loader = create_list(page_size = 10)
+    actions = []
+    items.CollectionChanged += lambda sender, args: actions.append(args.Action)
+    items[0]
+    
+    items.update_item(1, 'one')
+    items.update_item(500, 'not loaded')
+    assert items[1] == 'one'
+    
+    items.refresh(count = 5)
+    assert len(items) == 5
+    assert list(items) == [0, 1, 2, 3, 4]
+    assert actions == [NotifyCollectionChangedAction.Replace, NotifyCollectionChangedAction.Reset]
+#
+
+def test_ilist_members():
+    items, loader = create_list(20, page_size = 10)
+    array = [None] * 22
+    
+    assert items.Count == 20
+    assert items.IsReadOnly and items.IsFixedSize
+    assert items.get_Item(3) == 3
+    assert items.IndexOf(3) == 3
+    assert items.IndexOf(15) == -1
+    assert items.Contains(3)
+    items.CopyTo(array, 2)
+    assert array == [None, None] + list(range(20))
+    for mutate in (lambda: items.Add(1), lambda: items.set_Item(0, 1), lambda: items.Insert(0, 1), lambda: items.Remove(1),
+                   lambda: items.RemoveAt(0), lambda: items.Clear()):
+        with pytest.raises(TypeError):
+            mutate()
+#